@@ -0,0 +1,55 @@
+"""
+Measures the time it takes to import metabase in a fresh interpreter.
+
+    python benchmarks/import_time.py [--runs 20]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+STATEMENTS = [
+    "pass",
+    "import metabase",
+    "from metabase import Metabase",
+    "from metabase import User, PermissionGroup",
+    "from metabase import Query, Count",
+    "from metabase import Dataset",
+    "from metabase import Dataset; Dataset(_using=None, data={}).to_pandas",
+    "import pandas",
+]
+
+SOURCE = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "src")
+
+
+def measure(statement: str, runs: int) -> list:
+    code = (
+        "import time; start = time.perf_counter(); "
+        f"{statement}; "
+        "print(time.perf_counter() - start)"
+    )
+    env = {**os.environ, "PYTHONPATH": SOURCE}
+    return [
+        float(subprocess.check_output([sys.executable, "-c", code], env=env))
+        for _ in range(runs)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'statement':<70} {'median':>10} {'min':>10}")
+    for statement in STATEMENTS:
+        timings = measure(statement, args.runs)
+        print(
+            f"{statement:<70} "
+            f"{statistics.median(timings) * 1000:>8.1f}ms "
+            f"{min(timings) * 1000:>8.1f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Compares the JSON codecs available to Metabase on representative payloads: the
+response of a query (/api/dataset), a list of Fields (/api/database/:id/fields)
+and a Card with its dataset_query.
+
+    python benchmarks/json_codecs.py [--rows 100000] [--runs 5]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "src")
+)
+
+from metabase.codec import OrjsonCodec, StdlibCodec, orjson  # noqa: E402
+
+
+def dataset(rows: int) -> dict:
+    return {
+        "data": {
+            "rows": [
+                [i, f"name {i}", i * 1.5, "2022-01-01T00:00:00Z", i % 2 == 0, None]
+                for i in range(rows)
+            ],
+            "cols": [
+                {"name": name, "display_name": name, "base_type": base_type}
+                for name, base_type in [
+                    ("ID", "type/BigInteger"),
+                    ("NAME", "type/Text"),
+                    ("PRICE", "type/Float"),
+                    ("CREATED_AT", "type/DateTime"),
+                    ("ACTIVE", "type/Boolean"),
+                    ("NOTE", "type/Text"),
+                ]
+            ],
+        },
+        "row_count": rows,
+        "status": "completed",
+    }
+
+
+def fields(count: int) -> list:
+    return [
+        {
+            "id": i,
+            "name": f"FIELD_{i}",
+            "display_name": f"Field {i}",
+            "table_id": i // 20,
+            "base_type": "type/Text",
+            "semantic_type": None,
+            "fingerprint": {"global": {"distinct-count": i, "nil%": 0.0}},
+            "has_field_values": "list",
+            "visibility_type": "normal",
+        }
+        for i in range(count)
+    ]
+
+
+def card() -> dict:
+    return {
+        "name": "Orders by month",
+        "display": "line",
+        "visualization_settings": {"graph.dimensions": ["CREATED_AT"]},
+        "dataset_query": {
+            "database": 1,
+            "type": "query",
+            "query": {
+                "source-table": 2,
+                "aggregation": [["count"], ["sum", ["field", 5, None]]],
+                "breakout": [["field", 3, {"temporal-unit": "month"}]],
+                "filter": ["and", [">", ["field", 4, None], 10]],
+            },
+        },
+    }
+
+
+def measure(func, runs: int) -> float:
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    codecs = [StdlibCodec()] + ([OrjsonCodec()] if orjson is not None else [])
+    payloads = {
+        f"dataset ({args.rows} rows)": dataset(args.rows),
+        f"fields ({args.rows // 10})": fields(args.rows // 10),
+        "card (x1000)": [card() for _ in range(1000)],
+    }
+
+    print(f"{'payload':<28}{'codec':<10}{'dumps (ms)':>12}{'loads (ms)':>12}")
+    for name, payload in payloads.items():
+        for codec in codecs:
+            data = codec.dumps(payload)
+            dumps = measure(lambda: codec.dumps(payload), args.runs)
+            loads = measure(lambda: codec.loads(data), args.runs)
+            print(
+                f"{name:<28}{codec.name:<10}{dumps * 1000:>12.1f}{loads * 1000:>12.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,38 +1,130 @@
-from metabase.mbql.aggregations import (
-    Average,
-    Count,
-    CumulativeCount,
-    CumulativeSum,
-    Distinct,
-    Max,
-    Min,
-    StandardDeviation,
-    Sum,
-)
-from metabase.mbql.filter import (
-    Between,
-    CaseOption,
-    EndsWith,
-    Equal,
-    Greater,
-    GreaterEqual,
-    IsNotNull,
-    IsNull,
-    Less,
-    LessEqual,
-    NotEqual,
-    StartsWith,
-)
-from metabase.mbql.groupby import BinOption, GroupBy, TemporalOption
-from metabase.mbql.query import Query
-from metabase.metabase import Metabase
-from metabase.resources.card import Card
-from metabase.resources.database import Database
-from metabase.resources.dataset import Dataset
-from metabase.resources.field import Field
-from metabase.resources.metric import Metric
-from metabase.resources.permission_group import PermissionGroup
-from metabase.resources.permission_membership import PermissionMembership
-from metabase.resources.segment import Segment
-from metabase.resources.table import Table
-from metabase.resources.user import User
+import importlib
+from typing import TYPE_CHECKING
+
+# names exported by the package, imported from their module on first access so that
+# `import metabase` stays cheap (e.g. pandas is only loaded when Dataset is used)
+_EXPORTS = {
+    "AsyncMetabase": "metabase.async_metabase",
+    "DiskCacheBackend": "metabase.cache",
+    "MemoryCacheBackend": "metabase.cache",
+    "ResponseCache": "metabase.cache",
+    "Catalog": "metabase.catalog",
+    "JSONCodec": "metabase.codec",
+    "OrjsonCodec": "metabase.codec",
+    "StdlibCodec": "metabase.codec",
+    "AdaptiveConcurrency": "metabase.concurrency",
+    "SchemaDiff": "metabase.drift",
+    "SchemaSnapshot": "metabase.drift",
+    "IdentityMap": "metabase.identity",
+    "Limit": "metabase.limits",
+    "RateLimiter": "metabase.limits",
+    "Average": "metabase.mbql.aggregations",
+    "Count": "metabase.mbql.aggregations",
+    "CumulativeCount": "metabase.mbql.aggregations",
+    "CumulativeSum": "metabase.mbql.aggregations",
+    "Distinct": "metabase.mbql.aggregations",
+    "Max": "metabase.mbql.aggregations",
+    "Min": "metabase.mbql.aggregations",
+    "StandardDeviation": "metabase.mbql.aggregations",
+    "Sum": "metabase.mbql.aggregations",
+    "Between": "metabase.mbql.filter",
+    "CaseOption": "metabase.mbql.filter",
+    "EndsWith": "metabase.mbql.filter",
+    "Equal": "metabase.mbql.filter",
+    "Greater": "metabase.mbql.filter",
+    "GreaterEqual": "metabase.mbql.filter",
+    "IsNotNull": "metabase.mbql.filter",
+    "IsNull": "metabase.mbql.filter",
+    "Less": "metabase.mbql.filter",
+    "LessEqual": "metabase.mbql.filter",
+    "NotEqual": "metabase.mbql.filter",
+    "StartsWith": "metabase.mbql.filter",
+    "BinOption": "metabase.mbql.groupby",
+    "GroupBy": "metabase.mbql.groupby",
+    "TemporalOption": "metabase.mbql.groupby",
+    "Query": "metabase.mbql.query",
+    "split_range": "metabase.mbql.query",
+    "Metabase": "metabase.metabase",
+    "MetricsRegistry": "metabase.metrics",
+    "Card": "metabase.resources.card",
+    "Database": "metabase.resources.database",
+    "Dataset": "metabase.resources.dataset",
+    "Field": "metabase.resources.field",
+    "Metric": "metabase.resources.metric",
+    "PermissionGroup": "metabase.resources.permission_group",
+    "PermissionMembership": "metabase.resources.permission_membership",
+    "Segment": "metabase.resources.segment",
+    "Table": "metabase.resources.table",
+    "User": "metabase.resources.user",
+    "CircuitBreaker": "metabase.retry",
+    "Retry": "metabase.retry",
+    "FileTokenStore": "metabase.token_store",
+    "MemoryTokenStore": "metabase.token_store",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(_EXPORTS[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
+
+if TYPE_CHECKING:
+    from metabase.async_metabase import AsyncMetabase
+    from metabase.cache import DiskCacheBackend, MemoryCacheBackend, ResponseCache
+    from metabase.catalog import Catalog
+    from metabase.codec import JSONCodec, OrjsonCodec, StdlibCodec
+    from metabase.concurrency import AdaptiveConcurrency
+    from metabase.drift import SchemaDiff, SchemaSnapshot
+    from metabase.identity import IdentityMap
+    from metabase.limits import Limit, RateLimiter
+    from metabase.mbql.aggregations import (
+        Average,
+        Count,
+        CumulativeCount,
+        CumulativeSum,
+        Distinct,
+        Max,
+        Min,
+        StandardDeviation,
+        Sum,
+    )
+    from metabase.mbql.filter import (
+        Between,
+        CaseOption,
+        EndsWith,
+        Equal,
+        Greater,
+        GreaterEqual,
+        IsNotNull,
+        IsNull,
+        Less,
+        LessEqual,
+        NotEqual,
+        StartsWith,
+    )
+    from metabase.mbql.groupby import BinOption, GroupBy, TemporalOption
+    from metabase.mbql.query import Query, split_range
+    from metabase.metabase import Metabase
+    from metabase.metrics import MetricsRegistry
+    from metabase.resources.card import Card
+    from metabase.resources.database import Database
+    from metabase.resources.dataset import Dataset
+    from metabase.resources.field import Field
+    from metabase.resources.metric import Metric
+    from metabase.resources.permission_group import PermissionGroup
+    from metabase.resources.permission_membership import PermissionMembership
+    from metabase.resources.segment import Segment
+    from metabase.resources.table import Table
+    from metabase.resources.user import User
+    from metabase.retry import CircuitBreaker, Retry
+    from metabase.token_store import FileTokenStore, MemoryTokenStore
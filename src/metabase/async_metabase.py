@@ -0,0 +1,88 @@
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+import requests
+
+from metabase.metabase import Metabase
+
+
+class AsyncMetabase(Metabase):
+    """
+    Metabase client for asyncio applications.
+
+    Requests are sent through the same pooled session as Metabase, from a pool of
+    `max_concurrency` worker threads, so that a single event loop can keep many
+    requests in flight while never exceeding `max_concurrency` at once.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        user: str,
+        password: str,
+        token: str = None,
+        max_concurrency: int = 10,
+        **kwargs,
+    ):
+        kwargs.setdefault("pool_maxsize", max_concurrency)
+        super(AsyncMetabase, self).__init__(
+            host=host, user=user, password=password, token=token, **kwargs
+        )
+        self.max_concurrency = max_concurrency
+        self._executor = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        self.close()
+
+    def __getstate__(self):
+        state = super(AsyncMetabase, self).__getstate__()
+        state["_executor"] = None
+        return state
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_concurrency,
+                        thread_name_prefix="metabase",
+                    )
+
+        return self._executor
+
+    def close(self) -> None:
+        """Close all pooled connections and stop the worker threads."""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+
+        super(AsyncMetabase, self).close()
+
+    async def run(self, func: Callable, *args, **kwargs) -> Any:
+        """Run a blocking function, such as a resource method, in a worker thread."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.executor, functools.partial(func, *args, **kwargs)
+        )
+
+    async def arequest(self, method: str, endpoint: str, **kwargs) -> requests.Response:
+        return await self.run(self.request, method, endpoint, **kwargs)
+
+    async def aget(self, endpoint: str, **kwargs) -> requests.Response:
+        return await self.run(self.get, endpoint, **kwargs)
+
+    async def apost(self, endpoint: str, **kwargs) -> requests.Response:
+        return await self.run(self.post, endpoint, **kwargs)
+
+    async def aput(self, endpoint: str, **kwargs) -> requests.Response:
+        return await self.run(self.put, endpoint, **kwargs)
+
+    async def adelete(self, endpoint: str, **kwargs) -> requests.Response:
+        return await self.run(self.delete, endpoint, **kwargs)
@@ -0,0 +1,336 @@
+import base64
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, replace
+from fnmatch import fnmatch
+from typing import Dict, List, Optional
+from urllib.parse import urlencode
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+
+@dataclass
+class CacheEntry:
+    status_code: int
+    headers: dict
+    content: bytes
+    url: str
+    encoding: Optional[str]
+    expires_at: float
+
+    @classmethod
+    def from_response(cls, response: requests.Response, ttl: float) -> "CacheEntry":
+        return cls(
+            status_code=response.status_code,
+            headers=dict(response.headers),
+            content=response.content,
+            url=response.url,
+            encoding=response.encoding,
+            expires_at=time.monotonic() + ttl,
+        )
+
+    @property
+    def size(self) -> int:
+        return len(self.content)
+
+    @property
+    def fresh(self) -> bool:
+        return time.monotonic() < self.expires_at
+
+    @property
+    def validators(self) -> Dict[str, str]:
+        """Headers used to revalidate this entry with a conditional request."""
+        validators = {}
+        if "ETag" in self.headers:
+            validators["If-None-Match"] = self.headers["ETag"]
+        if "Last-Modified" in self.headers:
+            validators["If-Modified-Since"] = self.headers["Last-Modified"]
+        return validators
+
+    def to_response(self) -> requests.Response:
+        response = requests.Response()
+        response.status_code = self.status_code
+        response.headers = CaseInsensitiveDict(self.headers)
+        response.url = self.url
+        response.encoding = self.encoding
+        response._content = self.content
+        return response
+
+
+class MemoryCacheBackend:
+    """In-memory cache, evicting the least recently used entries above max_bytes."""
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        # expiry times are monotonic, which is not shared across processes
+        return {"max_bytes": self.max_bytes}
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+    def get(self, namespace: str, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            entry = self._entries.get((namespace, key))
+            if entry is not None:
+                self._entries.move_to_end((namespace, key))
+            return entry
+
+    def set(self, namespace: str, key: str, entry: CacheEntry) -> None:
+        if entry.size > self.max_bytes:
+            return
+
+        with self._lock:
+            previous = self._entries.pop((namespace, key), None)
+            if previous is not None:
+                self._size -= previous.size
+
+            self._entries[(namespace, key)] = entry
+            self._size += entry.size
+
+            while self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= evicted.size
+
+    def clear(self, namespace: str = None) -> None:
+        with self._lock:
+            for k in list(self._entries):
+                if namespace is None or k[0] == namespace:
+                    self._size -= self._entries.pop(k).size
+
+
+class DiskCacheBackend:
+    """
+    On-disk cache, shared by processes using the same directory. Entries are
+    evicted by least recent access once the directory exceeds max_bytes.
+    """
+
+    def __init__(self, directory: str = None, max_bytes: int = 256 * 1024 * 1024):
+        self.directory = os.path.expanduser(
+            directory or os.path.join("~", ".metabase-python", "cache")
+        )
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(self.directory, exist_ok=True)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_lock"] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _hash(value: str) -> str:
+        return hashlib.sha256(value.encode()).hexdigest()[:32]
+
+    def _path(self, namespace: str, key: str) -> str:
+        return os.path.join(
+            self.directory, self._hash(namespace) + "-" + self._hash(key)
+        )
+
+    def get(self, namespace: str, key: str) -> Optional[CacheEntry]:
+        path = self._path(namespace, key)
+        try:
+            with open(path, "rb") as f:
+                data = json.load(f)
+            entry = CacheEntry(**{**data, "content": base64.b64decode(data["content"])})
+            os.utime(path)
+        except (OSError, ValueError, TypeError, KeyError):
+            return None
+
+        # monotonic clocks are not shared across processes; store wall-clock expiry
+        return replace(
+            entry, expires_at=entry.expires_at - time.time() + time.monotonic()
+        )
+
+    def set(self, namespace: str, key: str, entry: CacheEntry) -> None:
+        # stored as JSON rather than pickled, so that reading an entry written by
+        # someone else cannot execute code
+        data = asdict(entry)
+        data["content"] = base64.b64encode(entry.content).decode()
+        data["expires_at"] = entry.expires_at - time.monotonic() + time.time()
+
+        fd, tmp = tempfile.mkstemp(dir=self.directory, prefix=".tmp-")
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp, self._path(namespace, key))
+
+        self._evict()
+
+    def _evict(self) -> None:
+        with self._lock:
+            files = []
+            for f in os.scandir(self.directory):
+                if f.name.startswith("."):
+                    continue
+                # other processes may remove files at the same time
+                try:
+                    stat = f.stat()
+                except FileNotFoundError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, f.path))
+
+            size = sum(file_size for _, file_size, _ in files)
+            for _, file_size, path in sorted(files):
+                if size <= self.max_bytes:
+                    break
+                size -= file_size
+                self._remove(path)
+
+    def clear(self, namespace: str = None) -> None:
+        prefix = "" if namespace is None else self._hash(namespace) + "-"
+        for f in os.scandir(self.directory):
+            if f.name.startswith(prefix) and not f.name.startswith("."):
+                self._remove(f.path)
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+class ResponseCache:
+    """
+    Cache for responses of GET requests.
+
+    Responses are kept for `ttl` seconds, or for the TTL of the first pattern in
+    `ttls` matching the endpoint (e.g. {"/api/table/*/query_metadata": 3600}). A TTL
+    of 0 disables caching. Expired responses with an ETag or Last-Modified header
+    are revalidated with a conditional request rather than fetched again.
+
+    Writes (POST, PUT, DELETE) to an endpoint invalidate every cached response of
+    the same resource type, e.g. updating a Table invalidates all /api/table/...
+    responses, and of the resource types embedding it, e.g. updating a Field also
+    invalidates /api/table/:id/query_metadata. POST requests running queries, such
+    as /api/dataset, are not writes.
+
+    Responses are cached per host and user, so that a cache shared by several
+    clients never returns a response to a user it was not returned to.
+    """
+
+    # POST endpoints that run queries rather than write
+    READ_ONLY_ENDPOINTS = ("/api/dataset*", "/api/card/*/query*")
+
+    # resource types whose responses embed other resource types, e.g. the metadata
+    # of Tables and Databases include their Fields, Metrics and Segments
+    EMBEDDED_IN = {
+        "/api/field": ("/api/table", "/api/database"),
+        "/api/metric": ("/api/table", "/api/database"),
+        "/api/segment": ("/api/table", "/api/database"),
+        "/api/table": ("/api/database",),
+    }
+
+    def __init__(
+        self,
+        ttl: float = 60,
+        ttls: Dict[str, float] = None,
+        backend=None,
+    ):
+        self.ttl = ttl
+        self.ttls = ttls or {}
+        self.backend = backend if backend is not None else MemoryCacheBackend()
+
+    def ttl_for(self, endpoint: str) -> float:
+        for pattern, ttl in self.ttls.items():
+            if fnmatch(endpoint, pattern):
+                return ttl
+        return self.ttl
+
+    @classmethod
+    def is_write(cls, method: str, endpoint: str) -> bool:
+        """Whether a request may change the responses of GET requests."""
+        path = endpoint.split("?")[0]
+        return method != "GET" and not any(
+            fnmatch(path, pattern) for pattern in cls.READ_ONLY_ENDPOINTS
+        )
+
+    @classmethod
+    def invalidated_by(cls, endpoint: str) -> List[str]:
+        """Resource types whose responses a write to the endpoint may change."""
+        namespace = cls.namespace(endpoint)
+        return [namespace, *cls.EMBEDDED_IN.get(namespace, ())]
+
+    @staticmethod
+    def namespace(endpoint: str, host: str = None, user: str = None) -> str:
+        """
+        Resource type of an endpoint, e.g. /api/table for /api/table/1/fks, scoped to
+        the host and user the responses were returned to, as cached responses
+        depend on the permissions of the user.
+        """
+        resource = "/".join(endpoint.split("?")[0].split("/")[:3])
+        if host is None and user is None:
+            return resource
+        return json.dumps([host, user, resource])
+
+    @staticmethod
+    def key(endpoint: str, params: dict = None) -> str:
+        params = {k: v for k, v in (params or {}).items() if v is not None}
+        if not params:
+            return endpoint
+        return endpoint + "?" + urlencode(sorted(params.items()), doseq=True)
+
+    def get(
+        self, endpoint: str, params: dict = None, host: str = None, user: str = None
+    ) -> Optional[CacheEntry]:
+        return self.backend.get(
+            self.namespace(endpoint, host, user), self.key(endpoint, params)
+        )
+
+    def set(
+        self,
+        endpoint: str,
+        params: dict,
+        response: requests.Response,
+        ttl: float,
+        host: str = None,
+        user: str = None,
+    ) -> None:
+        self.backend.set(
+            self.namespace(endpoint, host, user),
+            self.key(endpoint, params),
+            CacheEntry.from_response(response, ttl),
+        )
+
+    def refresh(
+        self,
+        endpoint: str,
+        params: dict,
+        entry: CacheEntry,
+        ttl: float,
+        host: str = None,
+        user: str = None,
+    ):
+        """Extend the lifetime of an entry after it was revalidated."""
+        self.backend.set(
+            self.namespace(endpoint, host, user),
+            self.key(endpoint, params),
+            replace(entry, expires_at=time.monotonic() + ttl),
+        )
+
+    def invalidate(
+        self, endpoint: str = None, host: str = None, user: str = None
+    ) -> None:
+        """
+        Drop all responses of the resource types a write to the endpoint may change,
+        or everything.
+        """
+        if endpoint is None:
+            return self.backend.clear()
+
+        for resource in self.invalidated_by(endpoint):
+            self.backend.clear(self.namespace(resource, host, user))
@@ -0,0 +1,272 @@
+from __future__ import annotations
+
+import os
+import sqlite3
+from contextlib import closing
+from typing import Dict, List, Optional, Tuple
+
+from metabase.codec import JSONCodec, default_codec
+from metabase.exceptions import NotFoundError
+from metabase.metabase import Metabase
+from metabase.resource import Resource
+from metabase.resources.database import Database
+from metabase.resources.field import Field
+from metabase.resources.metric import Metric
+from metabase.resources.segment import Segment
+from metabase.resources.table import Table
+
+
+class Catalog:
+    """
+    In-memory index of the metadata of a Database: its Tables, with their Fields,
+    Metrics and Segments, loaded from a single request to
+    /api/database/:id/metadata.
+
+    Everything is indexed by ID, and Tables and Fields by name, so that resolving
+    names to IDs (e.g. to build MBQL queries) does not require any request.
+
+    Catalogs can be saved to a SQLite snapshot, then reopened and refreshed
+    incrementally, only reloading the Tables that changed since.
+    """
+
+    SNAPSHOT_VERSION = 1
+
+    def __init__(self, database: Database):
+        self.database = database
+
+        self.tables: Dict[int, Table] = {}
+        self.fields: Dict[int, Field] = {}
+        self.metrics: Dict[int, Metric] = {}
+        self.segments: Dict[int, Segment] = {}
+
+        self._table_names: Dict[Tuple[Optional[str], str], Table] = {}
+        self._field_names: Dict[Tuple[Optional[str], str, str], Field] = {}
+        self._table_fields: Dict[int, List[Field]] = {}
+        self._table_metrics: Dict[int, List[Metric]] = {}
+        self._table_segments: Dict[int, List[Segment]] = {}
+
+    def __repr__(self):
+        return (
+            f"Catalog(database={self.database.id}, tables={len(self.tables)}, "
+            f"fields={len(self.fields)})"
+        )
+
+    @classmethod
+    def load(cls, using: Metabase, database_id: int) -> Catalog:
+        """Load the metadata of the Database with ID from Metabase."""
+        metadata = Database(_using=using, id=database_id).metadata()
+        return cls.from_metadata(using, metadata)
+
+    @classmethod
+    def from_metadata(cls, using: Metabase, metadata: dict) -> Catalog:
+        """Build a catalog from the response of /api/database/:id/metadata."""
+        tables = metadata.pop("tables", [])
+        catalog = cls(Database.from_payload(using, metadata))
+
+        for table in tables:
+            catalog.add_table(table)
+
+        return catalog
+
+    def add_table(self, payload: dict) -> Table:
+        """
+        Index a Table from its metadata, including its fields, metrics and segments,
+        replacing any Table with the same ID.
+        """
+        if payload["id"] in self.tables:
+            self.remove_table(payload["id"])
+
+        using = self.database._using
+        fields = [Field.from_payload(using, f) for f in payload.pop("fields", [])]
+        metrics = [Metric.from_payload(using, m) for m in payload.pop("metrics", [])]
+        segments = [Segment.from_payload(using, s) for s in payload.pop("segments", [])]
+        table = Table.from_payload(using, payload)
+
+        self.tables[table.id] = table
+        self._table_names[(table.schema, table.name)] = table
+        self._table_fields[table.id] = fields
+        self._table_metrics[table.id] = metrics
+        self._table_segments[table.id] = segments
+
+        for field in fields:
+            self.fields[field.id] = field
+            self._field_names[(table.schema, table.name, field.name)] = field
+        for metric in metrics:
+            self.metrics[metric.id] = metric
+        for segment in segments:
+            self.segments[segment.id] = segment
+
+        return table
+
+    def remove_table(self, id: int) -> None:
+        """Remove a Table, and its fields, metrics and segments, from the index."""
+        table = self.tables.pop(id)
+        self._table_names.pop((table.schema, table.name), None)
+
+        for field in self._table_fields.pop(id):
+            self.fields.pop(field.id, None)
+            self._field_names.pop((table.schema, table.name, field.name), None)
+        for metric in self._table_metrics.pop(id):
+            self.metrics.pop(metric.id, None)
+        for segment in self._table_segments.pop(id):
+            self.segments.pop(segment.id, None)
+
+    def table(self, schema: Optional[str], name: str) -> Table:
+        """Get a Table by schema and name."""
+        try:
+            return self._table_names[(schema, name)]
+        except KeyError:
+            raise NotFoundError(f"Table {schema}.{name} was not found.") from None
+
+    def field(self, schema: Optional[str], table: str, name: str) -> Field:
+        """Get a Field by schema, table and name."""
+        try:
+            return self._field_names[(schema, table, name)]
+        except KeyError:
+            raise NotFoundError(
+                f"Field {schema}.{table}.{name} was not found."
+            ) from None
+
+    def table_fields(self, table_id: int) -> List[Field]:
+        """Get all Fields of a Table."""
+        return list(self._table_fields[table_id])
+
+    def table_metrics(self, table_id: int) -> List[Metric]:
+        """Get all Metrics of a Table."""
+        return list(self._table_metrics[table_id])
+
+    def table_segments(self, table_id: int) -> List[Segment]:
+        """Get all Segments of a Table."""
+        return list(self._table_segments[table_id])
+
+    def foreign_keys(self) -> List[Tuple[Field, Field]]:
+        """Get all foreign keys, as pairs of (origin, destination) Fields."""
+        return [
+            (field, self.fields[field.fk_target_field_id])
+            for field in self.fields.values()
+            if getattr(field, "fk_target_field_id", None) in self.fields
+        ]
+
+    def save(self, path: str) -> None:
+        """
+        Save the catalog to a SQLite snapshot, which can be loaded with
+        Catalog.open() and updated with Catalog.refresh().
+        """
+        codec = self._codec()
+        tables = [
+            (
+                table.id,
+                getattr(table, "updated_at", None),
+                codec.dumps(self._table_payload(table.id)),
+            )
+            for table in self.tables.values()
+        ]
+
+        with closing(sqlite3.connect(path)) as connection, connection:
+            connection.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS metadata (key TEXT PRIMARY KEY, value BLOB);
+                CREATE TABLE IF NOT EXISTS tables (
+                    id INTEGER PRIMARY KEY, updated_at TEXT, payload BLOB
+                );
+                """
+            )
+            # replaced in a single transaction, committed on exit
+            connection.execute("DELETE FROM metadata")
+            connection.execute("DELETE FROM tables")
+            connection.executemany(
+                "INSERT INTO metadata VALUES (?, ?)",
+                [
+                    ("version", str(self.SNAPSHOT_VERSION)),
+                    ("database", codec.dumps(self._payload(self.database))),
+                ],
+            )
+            connection.executemany("INSERT INTO tables VALUES (?, ?, ?)", tables)
+
+    @classmethod
+    def open(cls, using: Metabase, path: str) -> Catalog:
+        """Load a catalog from a snapshot saved with Catalog.save()."""
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"{path} does not exist.")
+
+        codec = using.codec if using is not None else default_codec()
+
+        with closing(sqlite3.connect(path)) as connection:
+            metadata = dict(connection.execute("SELECT key, value FROM metadata"))
+            if metadata.get("version") != str(cls.SNAPSHOT_VERSION):
+                raise ValueError(f"{path} is not a supported catalog snapshot.")
+
+            catalog = cls(
+                Database.from_payload(using, codec.loads(metadata["database"]))
+            )
+            for (payload,) in connection.execute("SELECT payload FROM tables"):
+                catalog.add_table(codec.loads(payload))
+
+        return catalog
+
+    def refresh(self) -> List[int]:
+        """
+        Update the catalog with the changes made since it was loaded: Tables whose
+        updated_at changed, or that were added, are reloaded, and Tables that were
+        removed are dropped. Returns the IDs of the Tables that changed.
+
+        Changes are detected per Table, from its updated_at: Fields are reloaded
+        along with their Table, but changes made to Fields only (e.g. with
+        Field.update()) do not change the updated_at of their Table, and are not
+        detected.
+        """
+        using = self.database._using
+        response = using.get(
+            Database.ENDPOINT + f"/{self.database.id}",
+            params={"include": "tables"},
+        )
+        if response.status_code == 404:
+            raise NotFoundError(f"Database(id={self.database.id}) was not found.")
+
+        database = using.decode(response)
+        current = {table["id"]: table for table in database.pop("tables", [])}
+        self.database.__dict__.update(database)
+
+        removed = [id for id in self.tables if id not in current]
+        changed = [
+            id
+            for id, table in current.items()
+            if id not in self.tables
+            or table.get("updated_at") != getattr(self.tables[id], "updated_at", None)
+        ]
+
+        for id in removed:
+            self.remove_table(id)
+
+        def query_metadata(id):
+            # hidden and sensitive Fields are included, as in Database.metadata()
+            response = using.get(
+                Table.ENDPOINT + f"/{id}/query_metadata",
+                params={
+                    "include_hidden_fields": "true",
+                    "include_sensitive_fields": "true",
+                },
+            )
+            return using.decode(response)
+
+        for payload in using.map(query_metadata, changed, return_exceptions=False):
+            self.add_table(payload)
+
+        return removed + changed
+
+    def _codec(self) -> JSONCodec:
+        using = self.database._using
+        return using.codec if using is not None else default_codec()
+
+    @staticmethod
+    def _payload(resource: Resource) -> dict:
+        return {attr: getattr(resource, attr) for attr in resource._attributes}
+
+    def _table_payload(self, id: int) -> dict:
+        """The metadata of a Table, in the format accepted by Catalog.add_table()."""
+        return {
+            **self._payload(self.tables[id]),
+            "fields": [self._payload(f) for f in self._table_fields[id]],
+            "metrics": [self._payload(m) for m in self._table_metrics[id]],
+            "segments": [self._payload(s) for s in self._table_segments[id]],
+        }
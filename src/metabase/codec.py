@@ -0,0 +1,59 @@
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+class JSONCodec:
+    """Encodes the JSON bodies of requests and decodes the JSON bodies of responses."""
+
+    name: str
+
+    def dumps(self, obj: Any) -> bytes:
+        raise NotImplementedError
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        raise NotImplementedError
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}()"
+
+
+class StdlibCodec(JSONCodec):
+    """Codec using the json module of the standard library."""
+
+    name = "json"
+
+    def dumps(self, obj: Any) -> bytes:
+        # same output as requests, without the whitespace after separators
+        return json.dumps(obj, allow_nan=False, separators=(",", ":")).encode()
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return json.loads(data)
+
+
+class OrjsonCodec(JSONCodec):
+    """Codec using orjson, a JSON library implemented in Rust."""
+
+    name = "orjson"
+
+    def __init__(self):
+        if orjson is None:
+            raise ImportError("OrjsonCodec requires orjson: pip install orjson")
+
+    def dumps(self, obj: Any) -> bytes:
+        # dictionaries with non-string keys are accepted by the stdlib too
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return orjson.loads(data)
+
+
+def default_codec() -> JSONCodec:
+    """Returns the fastest codec available: orjson if installed, the stdlib otherwise."""
+    if orjson is not None:
+        return OrjsonCodec()
+    return StdlibCodec()
@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Optional, Sequence
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Metabase base types, grouped by the kind of column they are converted to
+INTEGER_TYPES = frozenset({"type/Integer", "type/BigInteger"})
+FLOAT_TYPES = frozenset({"type/Float", "type/Decimal", "type/Number"})
+BOOLEAN_TYPES = frozenset({"type/Boolean"})
+DATETIME_TYPES = frozenset(
+    {
+        "type/Temporal",
+        "type/Date",
+        "type/DateTime",
+        "type/DateTimeWithTZ",
+        "type/DateTimeWithLocalTZ",
+        "type/DateTimeWithZoneOffset",
+        "type/DateTimeWithZoneID",
+        "type/Instant",
+    }
+)
+TEXT_TYPES = frozenset({"type/Text", "type/TextLike", "type/UUID"})
+
+# semantic types of columns holding a limited set of values
+CATEGORY_SEMANTIC_TYPES = frozenset(
+    {
+        "type/Category",
+        "type/Enum",
+        "type/City",
+        "type/State",
+        "type/Country",
+        "type/Source",
+    }
+)
+
+INTEGER = "integer"
+FLOAT = "float"
+BOOLEAN = "boolean"
+DATETIME = "datetime"
+TEXT = "text"
+OTHER = "other"
+
+
+def column_type(col: dict) -> Optional[str]:
+    """The type of the values of a column: its effective type, or its base type."""
+    return col.get("effective_type") or col.get("base_type")
+
+
+def column_kind(col: dict) -> str:
+    """The kind of a result column (integer, float, boolean, datetime, text or other)."""
+    type = column_type(col)
+
+    if type in INTEGER_TYPES:
+        return INTEGER
+    if type in FLOAT_TYPES:
+        return FLOAT
+    if type in BOOLEAN_TYPES:
+        return BOOLEAN
+    if type in DATETIME_TYPES:
+        return DATETIME
+    if type in TEXT_TYPES:
+        return TEXT
+    return OTHER
+
+
+def is_categorical(col: dict) -> bool:
+    """
+    Whether a result column is likely to repeat a limited set of strings: text
+    columns that are breakouts, have a category semantic type or have a list of
+    values in Metabase.
+    """
+    return column_kind(col) == TEXT and (
+        col.get("source") == "breakout"
+        or col.get("semantic_type") in CATEGORY_SEMANTIC_TYPES
+        or col.get("has_field_values") in ("list", "auto-list")
+    )
+
+
+def to_pandas_array(
+    values: Sequence[Any],
+    col: dict,
+    timezone: str = None,
+    categorical_threshold: float = None,
+):
+    """
+    Convert the values of a result column to a typed pandas array: integers and
+    booleans to numpy arrays, or to nullable arrays if there are nulls, floats to
+    float64, and temporals to timezone-aware datetimes in `timezone` (UTC by
+    default). Other columns, and values that cannot be converted, are returned as
+    objects.
+
+    If `categorical_threshold` is given, categorical columns (see is_categorical)
+    are returned as pandas Categoricals if their number of distinct values is at
+    most this fraction of their number of values.
+    """
+    import numpy as np
+    import pandas as pd
+
+    kind = column_kind(col)
+
+    if categorical_threshold is not None and is_categorical(col):
+        categorical = pd.Categorical(values)
+        if len(categorical.categories) <= categorical_threshold * len(values):
+            return categorical
+
+    try:
+        if kind in (INTEGER, BOOLEAN):
+            # nullable arrays reject values that would be silently cast otherwise
+            dtype = "Int64" if kind == INTEGER else "boolean"
+            array = pd.array(values, dtype=dtype)
+            if array.isna().any():
+                return array
+            return array.to_numpy(dtype="int64" if kind == INTEGER else "bool")
+
+        if kind == FLOAT:
+            return np.array(values, dtype="float64")
+
+        if kind == DATETIME:
+            return _to_datetime(values, timezone).array
+    except (TypeError, ValueError, OverflowError):
+        pass
+
+    return np.array(values, dtype="object")
+
+
+def _to_datetime(values: Sequence[Any], timezone: str = None) -> pd.DatetimeIndex:
+    import pandas as pd
+
+    parsed = pd.to_datetime(values)
+
+    if getattr(parsed, "tz", None) is None:
+        if parsed.dtype == "object":
+            # values with different UTC offsets
+            parsed = pd.to_datetime(values, utc=True)
+        else:
+            return parsed.tz_localize(timezone or "UTC")
+
+    return parsed.tz_convert(timezone or "UTC")
+
+
+def arrow_type(col: dict, timezone: str = None):
+    """
+    The Arrow type of a result column converted by to_arrow_array(), if given by
+    its metadata: float64, bool, string, or timestamps in `timezone` (UTC by
+    default). The type of integer and other columns depends on their values, and
+    None is returned.
+    """
+    import pyarrow as pa
+
+    return {
+        FLOAT: pa.float64(),
+        BOOLEAN: pa.bool_(),
+        DATETIME: pa.timestamp("us", tz=timezone or "UTC"),
+        TEXT: pa.string(),
+    }.get(column_kind(col))
+
+
+def to_arrow_array(values: Sequence[Any], col: dict, timezone: str = None):
+    """
+    Convert the values of a result column to a typed Arrow array, as
+    to_pandas_array() does: integers to int64, floats to float64, booleans to bool
+    and temporals to timestamps in `timezone` (UTC by default), all nullable. The
+    type of other columns, and of values that cannot be converted, is inferred.
+    """
+    import pyarrow as pa
+
+    kind = column_kind(col)
+
+    try:
+        if kind == INTEGER:
+            # inferred first, since floats would be truncated to integers otherwise
+            array = pa.array(values)
+            if pa.types.is_integer(array.type) or pa.types.is_null(array.type):
+                return array.cast(pa.int64())
+            return array
+        if kind == DATETIME:
+            return _to_arrow_timestamp(values, timezone)
+        if kind in (FLOAT, BOOLEAN, TEXT):
+            return pa.array(values, type=arrow_type(col))
+    except (pa.ArrowException, TypeError, ValueError, OverflowError):
+        pass
+
+    try:
+        return pa.array(values)
+    except (pa.ArrowException, TypeError, ValueError, OverflowError):
+        # values of different types, e.g. in JSON columns
+        return pa.array([None if v is None else str(v) for v in values], pa.string())
+
+
+# a UTC offset at the end of a temporal string, following a time
+_UTC_OFFSET = r"(Z|\d:\d\d(:\d\d(\.\d*)?)?[+-]\d\d(:?\d\d)?)$"
+
+
+def _to_arrow_timestamp(values: Sequence[Any], timezone: str = None):
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    strings = pa.array(values, type=pa.string())
+    utc = pa.timestamp("us", tz="UTC")
+
+    # each value is parsed on its own, so that the type of a column does not depend
+    # on whether its values with and without offset are in the same batch
+    with_offset = pc.match_substring_regex(strings, _UTC_OFFSET)
+    aware = pc.cast(pc.if_else(with_offset, strings, None), utc)
+    # values without offset are in the timezone of the results
+    naive = pc.assume_timezone(
+        pc.cast(pc.if_else(with_offset, None, strings), pa.timestamp("us")),
+        timezone or "UTC",
+    ).cast(utc)
+
+    # timestamps are stored in UTC, only the timezone they are displayed in changes
+    return pc.if_else(with_offset, aware, naive).cast(
+        pa.timestamp("us", tz=timezone or "UTC")
+    )
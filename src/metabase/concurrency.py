@@ -0,0 +1,165 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Callable, Iterable, List
+
+import requests
+
+
+class AdaptiveConcurrency:
+    """
+    Additive-increase/multiplicative-decrease (AIMD) controller of the number of
+    concurrent operations.
+
+    The limit grows by about one slot per round-trip while request latency stays
+    within `latency_tolerance` times its baseline, and is multiplied by `backoff`
+    when Metabase times out, drops connections, or responds with 429 or 5xx. It is
+    decreased at most once per round-trip, so that a burst of failures caused by
+    the same overload only backs off once.
+    """
+
+    def __init__(
+        self,
+        initial: int = 4,
+        minimum: int = 1,
+        maximum: int = 64,
+        backoff: float = 0.5,
+        latency_tolerance: float = 2.0,
+    ):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.backoff = backoff
+        self.latency_tolerance = latency_tolerance
+
+        self.limit = float(min(max(initial, minimum), maximum))
+        self.in_flight = 0
+
+        self._baseline = None
+        self._latency = None
+        self._last_decrease = 0.0
+        self._condition = threading.Condition()
+        # whether the current thread runs a call of map(), holding a slot
+        self._local = threading.local()
+
+    def __getstate__(self):
+        # slots in flight belong to the threads of this process
+        state = self.__dict__.copy()
+        state["in_flight"] = 0
+        state["_condition"] = None
+        state["_local"] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._condition = threading.Condition()
+        self._local = threading.local()
+
+    @staticmethod
+    def is_overloaded(response: requests.Response = None, error: Exception = None):
+        if error is not None:
+            return isinstance(error, (requests.ConnectionError, requests.Timeout))
+        return response.status_code == 429 or response.status_code >= 500
+
+    def record(
+        self,
+        latency: float,
+        response: requests.Response = None,
+        error: Exception = None,
+    ) -> None:
+        """Adjust the limit from the outcome of a request."""
+        with self._condition:
+            if self.is_overloaded(response, error):
+                now = time.monotonic()
+                if now - self._last_decrease >= (self._latency or 0):
+                    self.limit = max(self.minimum, self.limit * self.backoff)
+                    self._last_decrease = now
+                return
+
+            # smoothed latency, compared to a baseline that slowly follows it upward
+            # so that a permanent change of server latency is eventually accepted
+            self._latency = (
+                latency
+                if self._latency is None
+                else 0.8 * self._latency + 0.2 * latency
+            )
+            if self._baseline is None or latency < self._baseline:
+                self._baseline = latency
+            else:
+                self._baseline += 0.01 * (latency - self._baseline)
+
+            if self._latency <= self._baseline * self.latency_tolerance:
+                self.limit = min(self.maximum, self.limit + 1 / self.limit)
+                self._condition.notify_all()
+
+    def acquire(self) -> None:
+        """Wait for a free slot."""
+        with self._condition:
+            while self.in_flight >= int(self.limit):
+                self._condition.wait()
+            self.in_flight += 1
+
+    def release(self) -> None:
+        with self._condition:
+            self.in_flight -= 1
+            self._condition.notify_all()
+
+    @contextmanager
+    def slot(self):
+        self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
+
+    def map(
+        self, func: Callable, items: Iterable, return_exceptions: bool = False
+    ) -> List[Any]:
+        """
+        Call `func` on every item concurrently, with as many calls in flight as the
+        current limit allows, and return the results in order. If any call fails,
+        the first exception is raised once all calls are done, or returned in place
+        of the result if `return_exceptions` is True.
+
+        Calls to `map` made from `func` (e.g. get_many() for every item) run their
+        items one after the other, in the slot of the outer call, as waiting for
+        slots held by outer calls could deadlock.
+        """
+        if getattr(self._local, "nested", False):
+            return self._map_inline(func, items, return_exceptions)
+
+        def call(item):
+            self._local.nested = True
+            try:
+                return func(item)
+            finally:
+                self._local.nested = False
+                self.release()
+
+        with ThreadPoolExecutor(
+            max_workers=self.maximum, thread_name_prefix="metabase"
+        ) as executor:
+            futures = []
+            for item in items:
+                self.acquire()
+                futures.append(executor.submit(call, item))
+
+        if not return_exceptions:
+            return [future.result() for future in futures]
+
+        return [future.exception() or future.result() for future in futures]
+
+    @staticmethod
+    def _map_inline(
+        func: Callable, items: Iterable, return_exceptions: bool
+    ) -> List[Any]:
+        if not return_exceptions:
+            return [func(item) for item in items]
+
+        results = []
+        for item in items:
+            try:
+                results.append(func(item))
+            except Exception as e:
+                results.append(e)
+        return results
@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from metabase.catalog import Catalog
+
+# attributes of a Field that make up its type; a change of any of them is a retype
+FIELD_TYPE_ATTRIBUTES = ("database_type", "base_type", "effective_type")
+
+FieldType = Tuple[Optional[str], ...]
+
+
+@dataclass(frozen=True)
+class TableSnapshot:
+    """The schema of a Table: the type of each of its Fields, by name."""
+
+    id: int
+    schema: Optional[str]
+    name: str
+    fields: Dict[str, FieldType]
+    hash: str
+
+    @classmethod
+    def create(
+        cls, id: int, schema: Optional[str], name: str, fields: Dict[str, FieldType]
+    ) -> TableSnapshot:
+        # the stdlib encoder is used so that hashes do not depend on the codec
+        content = json.dumps(
+            [schema, name, sorted(fields.items())], separators=(",", ":")
+        )
+        return cls(
+            id=id,
+            schema=schema,
+            name=name,
+            fields=fields,
+            hash=hashlib.sha256(content.encode()).hexdigest(),
+        )
+
+
+@dataclass(frozen=True)
+class FieldChange:
+    table: TableSnapshot
+    name: str
+    old_type: Optional[FieldType] = None
+    new_type: Optional[FieldType] = None
+
+
+@dataclass(frozen=True)
+class TableRename:
+    """A Table whose name or schema changed."""
+
+    old: TableSnapshot
+    new: TableSnapshot
+
+
+@dataclass
+class SchemaDiff:
+    """Changes between two snapshots of the schema of a Database."""
+
+    added_tables: List[TableSnapshot] = field(default_factory=list)
+    removed_tables: List[TableSnapshot] = field(default_factory=list)
+    renamed_tables: List[TableRename] = field(default_factory=list)
+    added_fields: List[FieldChange] = field(default_factory=list)
+    removed_fields: List[FieldChange] = field(default_factory=list)
+    retyped_fields: List[FieldChange] = field(default_factory=list)
+
+    def __bool__(self):
+        return any(
+            (
+                self.added_tables,
+                self.removed_tables,
+                self.renamed_tables,
+                self.added_fields,
+                self.removed_fields,
+                self.retyped_fields,
+            )
+        )
+
+    @property
+    def tables(self) -> List[int]:
+        """IDs of the Tables that changed, e.g. to re-sync them."""
+        changes = self.added_fields + self.removed_fields + self.retyped_fields
+        ids = [t.id for t in self.added_tables + self.removed_tables]
+        ids += [rename.new.id for rename in self.renamed_tables]
+        ids += [change.table.id for change in changes]
+        return sorted(set(ids))
+
+
+class SchemaSnapshot:
+    """
+    Fingerprint of the schema of a Database, made of a content hash per Table.
+
+    Two snapshots are compared by their hashes first, so that only the Tables
+    that changed are diffed Field by Field.
+    """
+
+    def __init__(self, tables: Dict[int, TableSnapshot]):
+        self.tables = tables
+        self.hash = hashlib.sha256(
+            "".join(tables[id].hash for id in sorted(tables)).encode()
+        ).hexdigest()
+
+    def __repr__(self):
+        return f"SchemaSnapshot(tables={len(self.tables)}, hash={self.hash[:12]})"
+
+    def __eq__(self, other):
+        return isinstance(other, SchemaSnapshot) and self.hash == other.hash
+
+    @classmethod
+    def from_catalog(cls, catalog: Catalog) -> SchemaSnapshot:
+        tables = {}
+        for table in catalog.tables.values():
+            fields = {
+                f.name: tuple(getattr(f, attr, None) for attr in FIELD_TYPE_ATTRIBUTES)
+                for f in catalog.table_fields(table.id)
+            }
+            tables[table.id] = TableSnapshot.create(
+                table.id, table.schema, table.name, fields
+            )
+        return cls(tables)
+
+    def to_dict(self) -> dict:
+        """A JSON-serializable representation of the snapshot."""
+        return {
+            "tables": [
+                {
+                    "id": t.id,
+                    "schema": t.schema,
+                    "name": t.name,
+                    "fields": {name: list(type) for name, type in t.fields.items()},
+                    "hash": t.hash,
+                }
+                for t in self.tables.values()
+            ]
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> SchemaSnapshot:
+        tables = {}
+        for t in data["tables"]:
+            fields = {name: tuple(type) for name, type in t["fields"].items()}
+            tables[t["id"]] = TableSnapshot(
+                t["id"], t["schema"], t["name"], fields, t["hash"]
+            )
+        return cls(tables)
+
+    def diff(self, other: SchemaSnapshot) -> SchemaDiff:
+        """Changes from this snapshot to a more recent one."""
+        diff = SchemaDiff()
+        if self.hash == other.hash:
+            return diff
+
+        for id, old in self.tables.items():
+            new = other.tables.get(id)
+            if new is None:
+                diff.removed_tables.append(old)
+            elif new.hash != old.hash:
+                if (new.schema, new.name) != (old.schema, old.name):
+                    diff.renamed_tables.append(TableRename(old, new))
+                self._diff_fields(old, new, diff)
+
+        diff.added_tables = [
+            t for id, t in other.tables.items() if id not in self.tables
+        ]
+        return diff
+
+    @staticmethod
+    def _diff_fields(old: TableSnapshot, new: TableSnapshot, diff: SchemaDiff):
+        for name, type in old.fields.items():
+            if name not in new.fields:
+                diff.removed_fields.append(FieldChange(new, name, old_type=type))
+            elif new.fields[name] != type:
+                diff.retyped_fields.append(
+                    FieldChange(new, name, old_type=type, new_type=new.fields[name])
+                )
+
+        for name, type in new.fields.items():
+            if name not in old.fields:
+                diff.added_fields.append(FieldChange(new, name, new_type=type))
@@ -4,3 +4,11 @@ class NotFoundError(Exception):
 
 class AuthenticationError(Exception):
     pass
+
+
+class CircuitOpenError(Exception):
+    pass
+
+
+class QueryError(Exception):
+    pass
@@ -0,0 +1,60 @@
+import threading
+import weakref
+from typing import Any, Callable, Hashable, Optional
+
+
+class IdentityMap:
+    """
+    Maps every resource loaded by a client, keyed by its class and primary key, to
+    a single instance. Loading a resource that is already mapped refreshes and
+    returns the existing instance, so that all references to it stay consistent.
+
+    Instances are held by weak references: they are forgotten once they are no
+    longer used elsewhere.
+    """
+
+    def __init__(self):
+        self._instances = weakref.WeakValueDictionary()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._instances)
+
+    def __getstate__(self):
+        # instances are not shared across processes
+        return {}
+
+    def __setstate__(self, state):
+        self.__init__()
+
+    def get(self, cls: type, key: Hashable) -> Optional[Any]:
+        """Returns the instance of `cls` with primary key `key`, if loaded."""
+        return self._instances.get((cls, key))
+
+    def load(self, cls: type, payload: dict, create: Callable[[], Any]) -> Any:
+        """
+        Returns the mapped instance of `cls` identified by the payload, updated with
+        the payload, or the instance returned by create() if there is none.
+        """
+        key = (cls, payload[cls.PRIMARY_KEY])
+
+        with self._lock:
+            instance = self._instances.get(key)
+            if instance is None:
+                instance = self._instances[key] = create()
+                return instance
+
+        instance.__dict__.update(payload)
+        return instance
+
+    def discard(self, instance: Any) -> None:
+        """Forget an instance, e.g. after it was deleted."""
+        key = (instance.__class__, getattr(instance, instance.PRIMARY_KEY, None))
+
+        with self._lock:
+            if self._instances.get(key) is instance:
+                del self._instances[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._instances.clear()
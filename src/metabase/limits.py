@@ -0,0 +1,132 @@
+import threading
+import time
+from contextlib import ExitStack, contextmanager
+from fnmatch import fnmatch
+from typing import Dict, List
+
+
+class TokenBucket:
+    """
+    Allows `rate` acquisitions per second on average, with bursts of up to `burst`.
+    Callers exceeding the rate reserve a future token and sleep until it is due,
+    so that waiting threads are served in order.
+    """
+
+    def __init__(self, rate: float, burst: int = None):
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1, int(rate))
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_lock"] = None
+        return state
+
+    def __setstate__(self, state):
+        # monotonic clocks are not shared across processes; start with a full bucket
+        self.__dict__.update(state)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0
+
+        if wait > 0:
+            time.sleep(wait)
+
+
+class Limit:
+    """
+    Limits the rate of requests (in requests per second) and/or the number of
+    requests in flight at the same time.
+    """
+
+    def __init__(
+        self, rate: float = None, burst: int = None, max_in_flight: int = None
+    ):
+        self.rate = rate
+        self.max_in_flight = max_in_flight
+        self._bucket = TokenBucket(rate, burst) if rate else None
+        self._semaphore = (
+            threading.BoundedSemaphore(max_in_flight) if max_in_flight else None
+        )
+
+    def __getstate__(self):
+        # requests in flight belong to the threads of this process
+        state = self.__dict__.copy()
+        state["_semaphore"] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._semaphore = (
+            threading.BoundedSemaphore(self.max_in_flight)
+            if self.max_in_flight
+            else None
+        )
+
+    @contextmanager
+    def acquire(self):
+        if self._semaphore is not None:
+            self._semaphore.acquire()
+        try:
+            if self._bucket is not None:
+                self._bucket.acquire()
+            yield
+        finally:
+            if self._semaphore is not None:
+                self._semaphore.release()
+
+
+class RateLimiter:
+    """
+    Applies a global Limit to all requests and, optionally, a Limit per group of
+    endpoints. Groups are keyed by glob patterns of endpoints, optionally prefixed
+    by a method, e.g. {"POST /api/dataset*": Limit(max_in_flight=2)} or
+    {"PUT /api/field/*": Limit(rate=5)}. Only the first matching group applies.
+
+    Limits are shared by every thread, and asyncio task, using the same instance.
+    """
+
+    def __init__(self, limit: Limit = None, groups: Dict[str, Limit] = None):
+        self.limit = limit
+        self.groups = groups or {}
+
+    @staticmethod
+    def matches(pattern: str, method: str, endpoint: str) -> bool:
+        if " " in pattern:
+            pattern_method, pattern = pattern.split(" ", 1)
+            if pattern_method.upper() != method.upper():
+                return False
+        return fnmatch(endpoint.split("?")[0], pattern)
+
+    def limits_for(self, method: str, endpoint: str) -> List[Limit]:
+        limits = []
+        for pattern, limit in self.groups.items():
+            if self.matches(pattern, method, endpoint):
+                limits.append(limit)
+                break
+
+        if self.limit is not None:
+            limits.append(self.limit)
+
+        return limits
+
+    @contextmanager
+    def acquire(self, method: str, endpoint: str):
+        """Wait until a request to the endpoint is allowed by all applicable limits."""
+        with ExitStack() as stack:
+            # always acquired in the same order (group, then global) to avoid deadlocks
+            for limit in self.limits_for(method, endpoint):
+                stack.enter_context(limit.acquire())
+            yield
@@ -1,8 +1,9 @@
-from dataclasses import dataclass, field
-from typing import List, Union
+from dataclasses import dataclass, field, replace
+from datetime import date
+from typing import Any, List, Sequence, Union
 
 from metabase.mbql.aggregations import Aggregation
-from metabase.mbql.filter import Filter
+from metabase.mbql.filter import Filter, GreaterEqual, IsNull, Less
 from metabase.mbql.groupby import GroupBy
 from metabase.resources.metric import Metric
 
@@ -22,6 +23,35 @@ class Query:
             "filter": self._filters,
         }
 
+    def partition(
+        self, id: int, bounds: Sequence[Any], include_nulls: bool = True
+    ) -> List["Query"]:
+        """
+        Split the query into disjoint queries on ranges of the Field with ID, e.g. a
+        date or a numeric key, delimited by `bounds` in ascending order: values
+        before the first bound, between each pair of consecutive bounds (the lower
+        one included), and from the last bound on. If `include_nulls` is True, a
+        last query returns the rows where the Field is null.
+
+        Together, the queries return the same rows as the query. Aggregations are
+        computed per partition, so only queries without aggregations, or grouped by
+        the Field, can be partitioned.
+        """
+        if not bounds:
+            return [replace(self)]
+
+        values = [b.isoformat() if isinstance(b, date) else b for b in bounds]
+        ranges = [[Less(id, values[0])]]
+        ranges += [
+            [GreaterEqual(id, lower), Less(id, upper)]
+            for lower, upper in zip(values, values[1:])
+        ]
+        ranges.append([GreaterEqual(id, values[-1])])
+        if include_nulls:
+            ranges.append([IsNull(id)])
+
+        return [replace(self, filters=self.filters + filters) for filters in ranges]
+
     @property
     def _aggregations(self):
         aggregations = []
@@ -46,3 +76,21 @@ class Query:
             return self.filters[0].compile()
 
         return ["and"] + [filt.compile() for filt in self.filters]
+
+
+def split_range(start: Any, end: Any, partitions: int) -> List[Any]:
+    """
+    Bounds splitting the range from `start` to `end` (numbers, dates or datetimes)
+    into `partitions` ranges of equal size, to be used with Query.partition().
+    """
+    if partitions < 1:
+        raise ValueError("partitions must be at least 1.")
+
+    steps = range(1, partitions)
+    if isinstance(start, int) and isinstance(end, int):
+        bounds = [start + (end - start) * i // partitions for i in steps]
+    else:
+        bounds = [start + (end - start) * i / partitions for i in steps]
+
+    # bounds are rounded for integers and dates, small ranges may repeat them
+    return [bound for bound in dict.fromkeys(bounds) if bound != start]
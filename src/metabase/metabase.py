@@ -1,15 +1,117 @@
+import os
+import threading
+import time
+from contextlib import nullcontext
+from http.cookiejar import DefaultCookiePolicy
+from typing import Any, Callable, Iterable, List
+
 import requests
+from requests.adapters import HTTPAdapter
 
+from metabase.cache import ResponseCache
+from metabase.codec import JSONCodec, default_codec
+from metabase.concurrency import AdaptiveConcurrency
 from metabase.exceptions import AuthenticationError
+from metabase.identity import IdentityMap
+from metabase.limits import RateLimiter
+from metabase.metrics import MetricsRegistry
+from metabase.retry import CircuitBreaker, Retry
+from metabase.singleflight import SingleFlight
+from metabase.token_store import TokenStore
 
 
 class Metabase:
-    def __init__(self, host: str, user: str, password: str, token: str = None):
+    def __init__(
+        self,
+        host: str,
+        user: str,
+        password: str,
+        token: str = None,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        pool_block: bool = False,
+        keep_alive: bool = True,
+        token_store: TokenStore = None,
+        cache: ResponseCache = None,
+        metrics: MetricsRegistry = None,
+        retry: Retry = None,
+        circuit_breaker: CircuitBreaker = None,
+        rate_limiter: RateLimiter = None,
+        concurrency: AdaptiveConcurrency = None,
+        coalesce: bool = True,
+        codec: JSONCodec = None,
+        identity_map: IdentityMap = None,
+    ):
         self._host = host
         self.user = user
         self.password = password
         self._token = token
 
+        # connection pool settings; pool_connections is the number of hosts to keep
+        # a pool for and pool_maxsize the number of connections kept per host
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.pool_block = pool_block
+        self.keep_alive = keep_alive
+
+        # optional store used to share session tokens across instances and processes
+        self.token_store = token_store
+
+        # optional cache for responses of GET requests
+        self.cache = cache
+
+        # optional registry recording the latency, size and outcome of requests
+        self.metrics = metrics
+
+        # optional retry policy and circuit breaker for failed requests
+        self.retry = retry
+        self.circuit_breaker = circuit_breaker
+
+        # optional limits on the rate and concurrency of requests
+        self.rate_limiter = rate_limiter
+
+        # adaptive limit of concurrent operations in bulk methods, adjusted from the
+        # latency and outcome of every request; by default, it never exceeds the
+        # connections kept in the pool, so that no connection is opened and dropped
+        self.concurrency = (
+            concurrency
+            if concurrency is not None
+            else AdaptiveConcurrency(maximum=pool_maxsize)
+        )
+
+        # whether identical GET requests in flight at the same time are coalesced
+        self.coalesce = coalesce
+        self._single_flight = SingleFlight()
+
+        # codec of JSON bodies, orjson if installed
+        self.codec = codec if codec is not None else default_codec()
+
+        # optional map of loaded resources, so that each one has a single instance
+        self.identity_map = identity_map
+
+        self._session = None
+        self._session_pid = None
+        self._lock = threading.RLock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_session"] = None
+        state["_session_pid"] = None
+        state["_lock"] = None
+        state["_single_flight"] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.RLock()
+        self._single_flight = SingleFlight()
+
     @property
     def host(self):
         host = self._host
@@ -23,18 +125,69 @@ class Metabase:
     def host(self, value):
         self._host = value
 
+    @property
+    def session(self) -> requests.Session:
+        """
+        A requests.Session shared by every call made through this instance, so that
+        connections are pooled and kept alive between requests. A new session is
+        created in forked child processes, as pooled sockets cannot be shared.
+        """
+        if self._session is None or self._session_pid != os.getpid():
+            with self._lock:
+                if self._session is None or self._session_pid != os.getpid():
+                    self._session = self._create_session()
+                    self._session_pid = os.getpid()
+
+        return self._session
+
+    def _create_session(self) -> requests.Session:
+        session = requests.Session()
+
+        adapter = HTTPAdapter(
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+            pool_block=self.pool_block,
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+
+        # authentication is done through the session header; ignore cookies set by
+        # Metabase so that requests never depend on state shared across threads
+        session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+
+        if not self.keep_alive:
+            session.headers["Connection"] = "close"
+
+        return session
+
+    def close(self) -> None:
+        """Close all pooled connections."""
+        with self._lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+    @property
+    def token_key(self) -> str:
+        """Key of the session token in the token store."""
+        return f"{self.user}@{self.host}"
+
     @property
     def token(self):
         if self._token is None:
-            response = requests.post(
-                self.host + "/api/session",
-                json={"username": self.user, "password": self.password},
-            )
+            # only one thread logs in, others wait for its token
+            with self._lock:
+                if self._token is None:
+                    token = None
+                    if self.token_store is not None:
+                        token = self.token_store.get(self.token_key)
 
-            if response.status_code != 200:
-                raise AuthenticationError(response.content.decode())
+                    if token is None:
+                        token = self._login()
+                        if self.token_store is not None:
+                            self.token_store.set(self.token_key, token)
 
-            self._token = response.json()["id"]
+                    self._token = token
 
         return self._token
 
@@ -42,18 +195,245 @@ class Metabase:
     def token(self, value):
         self._token = value
 
+    def _login(self) -> str:
+        response = self.session.post(
+            self.host + "/api/session",
+            data=self.codec.dumps({"username": self.user, "password": self.password}),
+            headers={"Content-Type": "application/json"},
+        )
+
+        if response.status_code != 200:
+            raise AuthenticationError(response.content.decode())
+
+        return self.decode(response)["id"]
+
+    def refresh_token(self, expired: str = None) -> str:
+        """
+        Discard the session token and log in again. If `expired` is provided, the
+        token is only discarded if it still is the current one, so that concurrent
+        threads seeing the same expired token only log in once.
+        """
+        with self._lock:
+            if expired is None or self._token == expired:
+                self._token = None
+
+                # keep tokens already refreshed by another process
+                if self.token_store is not None:
+                    stored = self.token_store.get(self.token_key)
+                    if expired is None or stored == expired:
+                        self.token_store.delete(self.token_key)
+
+            return self.token
+
     @property
     def headers(self):
         return {"X-Metabase-Session": self.token}
 
+    def request(self, method: str, endpoint: str, **kwargs) -> requests.Response:
+        """
+        Send a request to Metabase. If the session token expired, a new token is
+        obtained and the request is retried once.
+        """
+        headers = kwargs.pop("headers", None) or {}
+
+        if kwargs.get("json") is not None:
+            # encoded once, rather than on every attempt
+            kwargs["data"] = self.codec.dumps(kwargs.pop("json"))
+            headers = {"Content-Type": "application/json", **headers}
+
+        if method == "GET" and not kwargs.get("stream"):
+            # identical GET requests in flight at the same time share one response
+            if self.coalesce and not headers and set(kwargs) <= {"params", "timeout"}:
+                return self._single_flight.do(
+                    (
+                        ResponseCache.namespace(endpoint),
+                        ResponseCache.key(endpoint, kwargs.get("params")),
+                    ),
+                    lambda: self._get(endpoint, headers, **kwargs),
+                )
+            return self._get(endpoint, headers, **kwargs)
+
+        try:
+            return self._authenticated_request(method, endpoint, headers, **kwargs)
+        finally:
+            if ResponseCache.is_write(method, endpoint):
+                # GET requests of the resource types changed by the write that were
+                # sent before it may return stale data: later ones must not join them
+                namespaces = ResponseCache.invalidated_by(endpoint)
+                self._single_flight.forget(lambda key: key[0] in namespaces)
+
+                if self.cache is not None:
+                    self.cache.invalidate(endpoint, host=self.host, user=self.user)
+
+    def _get(self, endpoint: str, headers: dict, **kwargs) -> requests.Response:
+        if self.cache is not None:
+            return self._cached_request("GET", endpoint, headers, **kwargs)
+        return self._authenticated_request("GET", endpoint, headers, **kwargs)
+
+    def _cached_request(
+        self, method: str, endpoint: str, headers: dict, **kwargs
+    ) -> requests.Response:
+        ttl = self.cache.ttl_for(endpoint)
+        if ttl <= 0:
+            return self._authenticated_request(method, endpoint, headers, **kwargs)
+
+        params = kwargs.get("params")
+        # responses are only shared by clients of the same host and user
+        scope = {"host": self.host, "user": self.user}
+        entry = self.cache.get(endpoint, params, **scope)
+
+        if entry is not None:
+            if entry.fresh:
+                return entry.to_response()
+            headers = {**entry.validators, **headers}
+
+        response = self._authenticated_request(method, endpoint, headers, **kwargs)
+
+        if response.status_code == 304 and entry is not None:
+            self.cache.refresh(endpoint, params, entry, ttl, **scope)
+            return entry.to_response()
+
+        if response.status_code == 200:
+            self.cache.set(endpoint, params, response, ttl, **scope)
+
+        return response
+
+    def _authenticated_request(
+        self, method: str, endpoint: str, headers: dict, **kwargs
+    ) -> requests.Response:
+        start = time.perf_counter()
+        attempt = retries = 0
+        response = None
+
+        try:
+            while True:
+                if self.circuit_breaker is not None:
+                    self.circuit_breaker.before_request()
+
+                error = None
+                attempt_start = time.perf_counter()
+                try:
+                    token = self.token
+                    response = self._send(method, endpoint, token, headers, **kwargs)
+
+                    if response.status_code == 401 and self.user and self.password:
+                        retries += 1
+                        token = self.refresh_token(expired=token)
+                        response = self._send(
+                            method, endpoint, token, headers, **kwargs
+                        )
+                except (requests.ConnectionError, requests.Timeout) as e:
+                    response, error = None, e
+                except BaseException:
+                    # e.g. failing to log in, which must not leave the circuit half-open
+                    if self.circuit_breaker is not None:
+                        self.circuit_breaker.abort()
+                    raise
+
+                if self.circuit_breaker is not None:
+                    self.circuit_breaker.record(response, error)
+
+                self.concurrency.record(
+                    time.perf_counter() - attempt_start, response, error
+                )
+
+                if self.retry is None or not self.retry.should_retry(
+                    method, attempt, response, error
+                ):
+                    break
+
+                if response is not None:
+                    # release the connection of streamed responses before waiting
+                    response.close()
+                time.sleep(self.retry.backoff(attempt, response))
+                attempt += 1
+                retries += 1
+
+            if error is not None:
+                raise error
+        finally:
+            if self.metrics is not None:
+                self._observe(method, endpoint, response, start, retries)
+
+        return response
+
+    def _observe(
+        self,
+        method: str,
+        endpoint: str,
+        response: requests.Response,
+        start: float,
+        retries: int,
+    ) -> None:
+        request_bytes = response_bytes = 0
+
+        if response is not None:
+            body = response.request.body if response.request is not None else None
+            if isinstance(body, (bytes, str)):
+                request_bytes = len(body)
+
+            if response._content is not False:
+                response_bytes = len(response.content or b"")
+            else:
+                # streamed responses are not read yet
+                response_bytes = int(response.headers.get("Content-Length", 0))
+
+        self.metrics.observe(
+            method,
+            endpoint,
+            response.status_code if response is not None else None,
+            time.perf_counter() - start,
+            request_bytes=request_bytes,
+            response_bytes=response_bytes,
+            retries=retries,
+        )
+
+    def _send(
+        self, method: str, endpoint: str, token: str, headers: dict, **kwargs
+    ) -> requests.Response:
+        limit = (
+            self.rate_limiter.acquire(method, endpoint)
+            if self.rate_limiter is not None
+            else nullcontext()
+        )
+
+        with limit:
+            return self.session.request(
+                method,
+                self.host + endpoint,
+                headers={"X-Metabase-Session": token, **headers},
+                **kwargs,
+            )
+
+    def decode(self, response: requests.Response) -> Any:
+        """Decode the JSON body of a response with the codec of this instance."""
+        return self.codec.loads(response.content)
+
+    def map(
+        self, func: Callable, items: Iterable, return_exceptions: bool = True
+    ) -> List[Any]:
+        """
+        Call `func` on every item concurrently and return the results in input
+        order, e.g. metabase.map(metabase.get, endpoints). Concurrency adapts to how
+        fast Metabase responds, see Metabase.concurrency.
+
+        By default, an item that fails does not abort the batch: its exception is
+        returned in place of its result. Set `return_exceptions` to False to raise
+        the first exception instead.
+
+        Calls nested in `func`, including bulk methods such as get_many(), run their
+        items one after the other within the slot of the outer item.
+        """
+        return self.concurrency.map(func, items, return_exceptions=return_exceptions)
+
     def get(self, endpoint: str, **kwargs):
-        return requests.get(self.host + endpoint, headers=self.headers, **kwargs)
+        return self.request("GET", endpoint, **kwargs)
 
     def post(self, endpoint: str, **kwargs):
-        return requests.post(self.host + endpoint, headers=self.headers, **kwargs)
+        return self.request("POST", endpoint, **kwargs)
 
     def put(self, endpoint: str, **kwargs):
-        return requests.put(self.host + endpoint, headers=self.headers, **kwargs)
+        return self.request("PUT", endpoint, **kwargs)
 
     def delete(self, endpoint: str, **kwargs):
-        return requests.delete(self.host + endpoint, headers=self.headers, **kwargs)
+        return self.request("DELETE", endpoint, **kwargs)
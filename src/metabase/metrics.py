@@ -0,0 +1,198 @@
+import re
+import threading
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+# upper bounds of the latency histogram buckets, in seconds
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+_ID_SEGMENT = re.compile(
+    r"^(\d+|[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12})$",
+    re.IGNORECASE,
+)
+
+
+def normalize_endpoint(endpoint: str) -> str:
+    """
+    Replace IDs and UUIDs in an endpoint by a placeholder, so that all calls to
+    the same endpoint are grouped together, e.g. /api/card/1 -> /api/card/{id}.
+    """
+    path = endpoint.split("?")[0]
+    return "/".join(
+        "{id}" if _ID_SEGMENT.match(segment) else segment for segment in path.split("/")
+    )
+
+
+@dataclass
+class EndpointStats:
+    buckets: Tuple[float, ...] = DEFAULT_BUCKETS
+    count: int = 0
+    errors: int = 0
+    retries: int = 0
+    request_bytes: int = 0
+    response_bytes: int = 0
+    latency_sum: float = 0.0
+    latency_max: float = 0.0
+    bucket_counts: List[int] = field(default_factory=list)
+
+    def __post_init__(self):
+        if not self.bucket_counts:
+            self.bucket_counts = [0] * (len(self.buckets) + 1)
+
+    def observe(
+        self,
+        latency: float,
+        request_bytes: int,
+        response_bytes: int,
+        retries: int,
+        error: bool,
+    ) -> None:
+        self.count += 1
+        self.errors += int(error)
+        self.retries += retries
+        self.request_bytes += request_bytes
+        self.response_bytes += response_bytes
+        self.latency_sum += latency
+        self.latency_max = max(self.latency_max, latency)
+        self.bucket_counts[bisect_left(self.buckets, latency)] += 1
+
+    @property
+    def latency_mean(self) -> float:
+        return self.latency_sum / self.count if self.count else 0.0
+
+    def quantile(self, q: float) -> float:
+        """Estimate a latency quantile from the histogram, by linear interpolation."""
+        if self.count == 0:
+            return 0.0
+
+        rank = q * self.count
+        cumulative = 0
+        for i, n in enumerate(self.bucket_counts):
+            if n and cumulative + n >= rank:
+                lower = self.buckets[i - 1] if i > 0 else 0.0
+                upper = self.buckets[i] if i < len(self.buckets) else self.latency_max
+                return lower + (upper - lower) * (rank - cumulative) / n
+            cumulative += n
+
+        return self.latency_max
+
+
+class MetricsRegistry:
+    """
+    Records the latency, size and outcome of every request sent to Metabase,
+    grouped by method, normalized endpoint and status code.
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._stats: Dict[Tuple[str, str, str], EndpointStats] = {}
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_lock"] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def observe(
+        self,
+        method: str,
+        endpoint: str,
+        status: Optional[int],
+        latency: float,
+        request_bytes: int = 0,
+        response_bytes: int = 0,
+        retries: int = 0,
+    ) -> None:
+        """
+        Record a request. A status of None means that no response was received,
+        e.g. the connection failed or timed out.
+        """
+        key = (method, normalize_endpoint(endpoint), str(status or "error"))
+        error = status is None or status >= 400
+
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = self._stats[key] = EndpointStats(buckets=self.buckets)
+            stats.observe(latency, request_bytes, response_bytes, retries, error)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+    def summary(self) -> List[dict]:
+        """
+        Returns one summary per (method, endpoint, status), sorted by the total time
+        spent on them.
+        """
+        with self._lock:
+            items = list(self._stats.items())
+
+        return sorted(
+            [
+                {
+                    "method": method,
+                    "endpoint": endpoint,
+                    "status": status,
+                    "count": stats.count,
+                    "errors": stats.errors,
+                    "retries": stats.retries,
+                    "request_bytes": stats.request_bytes,
+                    "response_bytes": stats.response_bytes,
+                    "latency_sum": stats.latency_sum,
+                    "latency_mean": stats.latency_mean,
+                    "latency_p50": stats.quantile(0.5),
+                    "latency_p95": stats.quantile(0.95),
+                    "latency_p99": stats.quantile(0.99),
+                    "latency_max": stats.latency_max,
+                }
+                for (method, endpoint, status), stats in items
+            ],
+            key=lambda s: s["latency_sum"],
+            reverse=True,
+        )
+
+    def to_prometheus(self, prefix: str = "metabase_client") -> str:
+        """Returns all metrics in the Prometheus text exposition format."""
+        with self._lock:
+            items = sorted(self._stats.items())
+
+        def labels(method, endpoint, status, **extra) -> str:
+            pairs = {"method": method, "endpoint": endpoint, "status": status, **extra}
+            return ",".join(f'{k}="{v}"' for k, v in pairs.items())
+
+        counters = [
+            ("requests_total", "Requests sent to the Metabase API.", "count"),
+            ("errors_total", "Requests that failed or returned an error.", "errors"),
+            ("retries_total", "Retried attempts of requests.", "retries"),
+            ("request_bytes_total", "Bytes sent in request bodies.", "request_bytes"),
+            ("response_bytes_total", "Bytes received in responses.", "response_bytes"),
+        ]
+
+        lines = []
+        for name, description, attribute in counters:
+            lines.append(f"# HELP {prefix}_{name} {description}")
+            lines.append(f"# TYPE {prefix}_{name} counter")
+            for key, stats in items:
+                lines.append(
+                    f"{prefix}_{name}{{{labels(*key)}}} {getattr(stats, attribute)}"
+                )
+
+        name = f"{prefix}_request_duration_seconds"
+        lines.append(f"# HELP {name} Latency of requests sent to the Metabase API.")
+        lines.append(f"# TYPE {name} histogram")
+        for key, stats in items:
+            cumulative = 0
+            for bound, n in zip(stats.buckets + (float("inf"),), stats.bucket_counts):
+                cumulative += n
+                le = "+Inf" if bound == float("inf") else repr(float(bound))
+                lines.append(f"{name}_bucket{{{labels(*key, le=le)}}} {cumulative}")
+            lines.append(f"{name}_sum{{{labels(*key)}}} {stats.latency_sum}")
+            lines.append(f"{name}_count{{{labels(*key)}}} {stats.count}")
+
+        return "\n".join(lines) + "\n"
@@ -1,10 +1,17 @@
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Callable, Iterable, Iterator, List, Optional, Tuple
+
 from requests import HTTPError
 
 from metabase.exceptions import NotFoundError
 from metabase.metabase import Metabase
 from metabase.missing import MISSING
+from metabase.streaming import iter_response
+
+if TYPE_CHECKING:
+    from metabase.async_metabase import AsyncMetabase
 
 
 class Resource:
@@ -12,12 +19,38 @@ class Resource:
     PRIMARY_KEY: str = "id"
 
     def __init__(self, _using: Metabase, **kwargs):
-        self._attributes = []
-        self._using = _using
+        # attributes are stored in the keyword arguments dictionary, which is used
+        # as the instance dictionary rather than copied attribute by attribute
+        kwargs["_using"] = _using
+        self.__dict__ = kwargs
 
-        for k, v in kwargs.items():
-            self._attributes.append(k)
-            setattr(self, k, v)
+    @classmethod
+    def from_payload(cls, using: Metabase, payload: dict):
+        """
+        Instantiate from a payload returned by Metabase. The payload is used as the
+        instance dictionary without being copied, so it must not be reused.
+
+        If the client has an identity map, the instance already loaded with the same
+        primary key is updated with the payload and returned instead.
+        """
+        payload["_using"] = using
+
+        def create():
+            instance = cls.__new__(cls)
+            instance.__dict__ = payload
+            return instance
+
+        identity_map = getattr(using, "identity_map", None)
+        if identity_map is None or payload.get(cls.PRIMARY_KEY) is None:
+            return create()
+
+        return identity_map.load(cls, payload, create)
+
+    @property
+    def _attributes(self) -> List[str]:
+        # private attributes and overridden class constants (e.g. PRIMARY_KEY) are
+        # not attributes of the Metabase object
+        return [k for k in self.__dict__ if not k.startswith("_") and not k.isupper()]
 
     def __repr__(self):
         # move primary key to beginning of the list
@@ -34,13 +67,93 @@ class Resource:
 
 
 class ListResource(Resource):
+    # key of the list of records in responses of ENDPOINT, if not the response itself
+    LIST_KEY: str = None
+
     @classmethod
     def list(cls, using: Metabase):
         """List all instances."""
         response = using.get(cls.ENDPOINT)
-        records = [cls(_using=using, **record) for record in response.json()]
+        records = [
+            cls.from_payload(using, record)
+            for record in cls._records(using.decode(response))
+        ]
         return records
 
+    @classmethod
+    def iter(cls, using: Metabase) -> Iterator:
+        """
+        Iterate over all instances. The response is decoded incrementally, and
+        instances are created as they are consumed.
+        """
+        response = using.get(cls.ENDPOINT, stream=True)
+        path = () if cls.LIST_KEY is None else (cls.LIST_KEY,)
+        for record in iter_response(response, path=path):
+            yield cls.from_payload(using, record)
+
+    @classmethod
+    def _records(cls, payload) -> List[dict]:
+        """Extract the list of records from the response of ENDPOINT."""
+        if cls.LIST_KEY is None:
+            return payload
+        return payload.get(cls.LIST_KEY, [])
+
+    @staticmethod
+    def _paginate(
+        fetch_page: Callable[[int, int], Tuple[List[dict], Optional[int]]],
+        page_size: int,
+        prefetch: bool = True,
+    ) -> Iterator[dict]:
+        """
+        Yield records from pages returned by fetch_page(limit, offset), as a list of
+        records and the total number of records (or None if unknown). If prefetch is
+        True, the next page is fetched in the background while the current page is
+        consumed.
+        """
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            offset = 0
+            page = executor.submit(fetch_page, page_size, offset)
+
+            while page is not None:
+                records, total = page.result()
+                offset += len(records)
+                last = len(records) < page_size or (
+                    total is not None and offset >= total
+                )
+
+                page = None
+                if not last and prefetch:
+                    page = executor.submit(fetch_page, page_size, offset)
+
+                yield from records
+
+                if not last and not prefetch:
+                    page = executor.submit(fetch_page, page_size, offset)
+
+    @classmethod
+    async def alist(cls, using: AsyncMetabase, **kwargs):
+        """List all instances, without blocking the event loop."""
+        return await using.run(cls.list, using=using, **kwargs)
+
+    @classmethod
+    async def aiter(cls, using: AsyncMetabase, **kwargs):
+        """
+        Asynchronously iterate over all instances. Instances are pulled one at a time
+        from ListResource.iter() in a worker thread, so that they are yielded as the
+        response is decoded.
+        """
+        iterator = cls.iter(using=using, **kwargs)
+        done = object()
+        try:
+            while True:
+                # StopIteration cannot be raised through a future
+                record = await using.run(next, iterator, done)
+                if record is done:
+                    return
+                yield record
+        finally:
+            await using.run(iterator.close)
+
 
 class GetResource(Resource):
     @classmethod
@@ -51,7 +164,21 @@ class GetResource(Resource):
         if response.status_code == 404 or response.status_code == 204:
             raise NotFoundError(f"{cls.__name__}(id={id}) was not found.")
 
-        return cls(_using=using, **response.json())
+        return cls.from_payload(using, using.decode(response))
+
+    @classmethod
+    def get_many(cls, ids: Iterable[int], using: Metabase) -> List:
+        """
+        Get many instances by ID, concurrently. Results are returned in the order of
+        `ids`; instances that could not be fetched are replaced by the exception
+        raised, e.g. NotFoundError.
+        """
+        return using.map(lambda id: cls.get(id, using=using), ids)
+
+    @classmethod
+    async def aget(cls, id: int, using: AsyncMetabase):
+        """Get a single instance by ID, without blocking the event loop."""
+        return await using.run(cls.get, id, using=using)
 
 
 class CreateResource(Resource):
@@ -63,7 +190,12 @@ class CreateResource(Resource):
         if response.status_code not in (200, 202):
             raise HTTPError(response.content.decode())
 
-        return cls(_using=using, **response.json())
+        return cls.from_payload(using, using.decode(response))
+
+    @classmethod
+    async def acreate(cls, using: AsyncMetabase, **kwargs):
+        """Create an instance and save it, without blocking the event loop."""
+        return await using.run(cls.create, using=using, **kwargs)
 
 
 class UpdateResource(Resource):
@@ -79,11 +211,30 @@ class UpdateResource(Resource):
         )
 
         if response.status_code not in (200, 202):
-            raise HTTPError(response.json())
+            raise HTTPError(self._using.decode(response))
 
         for k, v in kwargs.items():
             setattr(self, k, v)
 
+    async def aupdate(self, **kwargs) -> None:
+        """Update an instance, without blocking the event loop."""
+        return await self._using.run(self.update, **kwargs)
+
+    @classmethod
+    def update_many(cls, instances: List[UpdateResource], **kwargs) -> None:
+        """
+        Update many instances with the same arguments, concurrently. Concurrency
+        adapts to how fast Metabase responds, see Metabase.map().
+        """
+        if not instances:
+            return
+
+        instances[0]._using.map(
+            lambda instance: instance.update(**kwargs),
+            instances,
+            return_exceptions=False,
+        )
+
 
 class DeleteResource(Resource):
     def delete(self) -> None:
@@ -94,3 +245,23 @@ class DeleteResource(Resource):
 
         if response.status_code not in (200, 204):
             raise HTTPError(response.content.decode())
+
+        if self._using.identity_map is not None:
+            self._using.identity_map.discard(self)
+
+    async def adelete(self) -> None:
+        """Delete an instance, without blocking the event loop."""
+        return await self._using.run(self.delete)
+
+    @classmethod
+    def delete_many(cls, instances: List[DeleteResource]) -> None:
+        """
+        Delete many instances, concurrently. Concurrency adapts to how fast
+        Metabase responds, see Metabase.map().
+        """
+        if not instances:
+            return
+
+        instances[0]._using.map(
+            lambda instance: instance.delete(), instances, return_exceptions=False
+        )
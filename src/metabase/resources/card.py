@@ -1,14 +1,19 @@
 from __future__ import annotations
 
-from typing import List
+from typing import IO, TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Union
 
 from metabase import Metabase
 from metabase.missing import MISSING
 from metabase.resource import CreateResource, GetResource, ListResource, UpdateResource
+from metabase.streaming import copy_response, iter_csv_frames
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 
 class Card(ListResource, CreateResource, GetResource, UpdateResource):
     ENDPOINT = "/api/card"
+    EXPORT_FORMATS = ("csv", "json", "xlsx")
 
     id: int
     table_id: int
@@ -61,6 +66,14 @@ class Card(ListResource, CreateResource, GetResource, UpdateResource):
         """
         return super(Card, cls).get(id, using)
 
+    @classmethod
+    def get_many(cls, ids: Iterable[int], using: Metabase) -> List[Card]:
+        """
+        Get Cards with IDs, concurrently. Cards that could not be fetched are
+        replaced by the exception raised.
+        """
+        return super(Card, cls).get_many(ids, using=using)
+
     @classmethod
     def create(
         cls,
@@ -136,3 +149,41 @@ class Card(ListResource, CreateResource, GetResource, UpdateResource):
         return self.update(
             archived=True, revision_message="Archived by metabase-python."
         )
+
+    def export(
+        self,
+        where: Union[str, IO[bytes]],
+        format: str = "csv",
+        parameters: List[Dict[str, Any]] = None,
+    ) -> int:
+        """
+        Run the query of the Card and write all of its results, without row limit,
+        to a path or a binary file-like object in the given export format (csv, json
+        or xlsx). The results are written chunk by chunk as they are received.
+        Returns the number of bytes written.
+        """
+        return copy_response(self._export(format, parameters), where)
+
+    def export_batches(
+        self,
+        batch_size: int = 10000,
+        parameters: List[Dict[str, Any]] = None,
+        **kwargs,
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Run the query of the Card and yield all of its results, without row limit,
+        as DataFrames of up to `batch_size` rows parsed from a CSV export as it is
+        received. Keyword arguments are passed to pandas.read_csv.
+        """
+        response = self._export("csv", parameters)
+        yield from iter_csv_frames(response, batch_size=batch_size, **kwargs)
+
+    def _export(self, format: str, parameters: List[Dict[str, Any]] = None):
+        if format not in self.EXPORT_FORMATS:
+            raise ValueError(f"Unsupported export format: {format}.")
+
+        return self._using.post(
+            self.ENDPOINT + f"/{getattr(self, self.PRIMARY_KEY)}/query/{format}",
+            data={"parameters": self._using.codec.dumps(parameters or []).decode()},
+            stream=True,
+        )
@@ -1,8 +1,9 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List
 
 from metabase import Metabase
+from metabase.exceptions import NotFoundError
 from metabase.missing import MISSING
 from metabase.resource import (
     CreateResource,
@@ -13,12 +14,17 @@ from metabase.resource import (
 )
 from metabase.resources.field import Field
 from metabase.resources.table import Table
+from metabase.streaming import iter_response
+
+if TYPE_CHECKING:
+    from metabase.catalog import Catalog
 
 
 class Database(
     ListResource, CreateResource, GetResource, UpdateResource, DeleteResource
 ):
     ENDPOINT = "/api/database"
+    LIST_KEY = "data"
 
     id: int
     name: str
@@ -49,9 +55,7 @@ class Database(
 
     @classmethod
     def list(cls, using: Metabase) -> List[Database]:
-        response = using.get(cls.ENDPOINT)
-        records = [cls(_using=using, **db) for db in response.json().get("data", [])]
-        return records
+        return super(Database, cls).list(using=using)
 
     @classmethod
     def get(cls, id: int, using: Metabase) -> Database:
@@ -131,33 +135,75 @@ class Database(
 
     def fields(self) -> List[Field]:
         """Get a list of all Fields in Database."""
-        fields = self._using.get(
+        response = self._using.get(
             self.ENDPOINT + f"/{getattr(self, self.PRIMARY_KEY)}" + "/fields"
-        ).json()
-        return [Field(_using=self._using, **payload) for payload in fields]
+        )
+        fields = self._using.decode(response)
+        return [Field.from_payload(self._using, payload) for payload in fields]
+
+    def iter_fields(self) -> Iterator[Field]:
+        """
+        Iterate over all Fields in Database. The response is decoded incrementally,
+        so that only the Fields being consumed are held in memory.
+        """
+        response = self._using.get(
+            self.ENDPOINT + f"/{getattr(self, self.PRIMARY_KEY)}" + "/fields",
+            stream=True,
+        )
+        for payload in iter_response(response):
+            yield Field.from_payload(self._using, payload)
 
     def idfields(self) -> List[Field]:
         """Get a list of all primary key Fields for Database."""
-        fields = self._using.get(
+        response = self._using.get(
             self.ENDPOINT + f"/{getattr(self, self.PRIMARY_KEY)}" + "/idfields"
-        ).json()
-        return [Field(_using=self._using, **payload) for payload in fields]
+        )
+        fields = self._using.decode(response)
+        return [Field.from_payload(self._using, payload) for payload in fields]
+
+    def metadata(self) -> Dict[str, Any]:
+        """
+        Get the metadata of the Database: its Tables, with their Fields, Metrics and
+        Segments, including hidden Tables.
+        """
+        response = self._using.get(
+            self.ENDPOINT + f"/{getattr(self, self.PRIMARY_KEY)}" + "/metadata",
+            params={"include_hidden": "true"},
+        )
+
+        if response.status_code == 404:
+            raise NotFoundError(
+                f"Database(id={getattr(self, self.PRIMARY_KEY)}) was not found."
+            )
+
+        return self._using.decode(response)
+
+    def catalog(self) -> Catalog:
+        """
+        Load the metadata of the Database in a Catalog, which indexes Tables and
+        Fields by ID and by name.
+        """
+        from metabase.catalog import Catalog
+
+        return Catalog.load(self._using, getattr(self, self.PRIMARY_KEY))
 
     def schemas(self) -> List[str]:
         """Returns a list of all the schemas found for the database id."""
-        return self._using.get(
+        response = self._using.get(
             self.ENDPOINT + f"/{getattr(self, self.PRIMARY_KEY)}" + "/schemas"
-        ).json()
+        )
+        return self._using.decode(response)
 
     def tables(self, schema: str) -> List[Table]:
         """Returns a list of Tables for the given Database id and schema."""
-        tables = self._using.get(
+        response = self._using.get(
             self.ENDPOINT
             + f"/{getattr(self, self.PRIMARY_KEY)}"
             + "/schema"
             + f"/{schema}"
-        ).json()
-        return [Table(_using=self._using, **payload) for payload in tables]
+        )
+        tables = self._using.decode(response)
+        return [Table.from_payload(self._using, payload) for payload in tables]
 
     def discard_values(self):
         """
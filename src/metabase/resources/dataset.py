@@ -1,11 +1,19 @@
 from __future__ import annotations
 
-from typing import Any, List
-
-import pandas as pd
+import threading
+from itertools import islice
+from typing import IO, TYPE_CHECKING, Any, Iterator, List, Sequence, Union
 
 from metabase import Metabase
+from metabase.column_types import arrow_type, to_arrow_array, to_pandas_array
+from metabase.exceptions import QueryError
+from metabase.mbql.query import Query
 from metabase.resource import CreateResource, Resource
+from metabase.streaming import copy_response, iter_csv_frames, iter_response
+
+if TYPE_CHECKING:
+    import pandas as pd
+    import pyarrow as pa
 
 
 class Data(Resource):
@@ -16,15 +24,115 @@ class Data(Resource):
     cols: dict
     native_form: dict
 
-    def to_pandas(self):
-        """Returns the query results as a Pandas DataFrame."""
+    def to_pandas(
+        self,
+        typed: bool = True,
+        categorical: bool = False,
+        categorical_threshold: float = 0.5,
+    ) -> pd.DataFrame:
+        """
+        Returns the query results as a Pandas DataFrame.
+
+        Columns are typed from their metadata in `cols`: numbers are numeric,
+        temporals are timezone-aware datetimes in the timezone of the results and
+        booleans are bools, with nullable dtypes where there are nulls. Set `typed`
+        to False to leave dtypes to the inference of pandas instead.
+
+        If `categorical` is True, text columns that are breakouts or categories are
+        converted to pandas categoricals when their number of distinct values is at
+        most `categorical_threshold` times the number of rows.
+        """
+        import pandas as pd
+
         columns = [col["display_name"] for col in self.cols]
-        return pd.DataFrame(data=self.rows, columns=columns)
+        if not typed:
+            return pd.DataFrame(data=self.rows, columns=columns)
+
+        # rows are transposed once, then each column is converted as a whole
+        values = list(zip(*self.rows)) if self.rows else [()] * len(self.cols)
+        timezone = getattr(self, "results_timezone", None)
+
+        df = pd.DataFrame(
+            {
+                i: to_pandas_array(
+                    column,
+                    col,
+                    timezone,
+                    categorical_threshold if categorical else None,
+                )
+                for i, (column, col) in enumerate(zip(values, self.cols))
+            }
+        )
+        df.columns = columns
+        return df
+
+    def to_arrow(self) -> pa.Table:
+        """
+        Returns the query results as an Arrow Table, built directly from the rows
+        and typed from their metadata, see Data.to_pandas().
+
+        Requires pyarrow: pip install metabase-python[pyarrow]
+        """
+        return self._arrow_table(self.rows)
+
+    def to_parquet(
+        self, where: Union[str, IO], row_group_size: int = 100000, **kwargs
+    ) -> None:
+        """
+        Write the query results to a Parquet file, given as a path or a file-like
+        object. Rows are converted and written one row group at a time, so that only
+        one row group is held in Arrow memory. Keyword arguments are passed to
+        pyarrow.parquet.ParquetWriter, e.g. compression.
+
+        The type of each column is given by its metadata where possible, and
+        inferred from all of its values otherwise, rather than from the first row
+        group.
+
+        Requires pyarrow: pip install metabase-python[pyarrow]
+        """
+        import pyarrow.parquet as pq
+
+        schema = self._arrow_schema()
+        with pq.ParquetWriter(where, schema, **kwargs) as writer:
+            for start in range(0, max(len(self.rows), 1), row_group_size):
+                table = self._arrow_table(self.rows[start : start + row_group_size])
+                # types inferred from a row group may be narrower, e.g. all nulls
+                writer.write_table(table.cast(schema), row_group_size=row_group_size)
+
+    def _arrow_schema(self) -> pa.Schema:
+        import pyarrow as pa
+
+        timezone = getattr(self, "results_timezone", None)
+
+        fields = []
+        for i, col in enumerate(self.cols):
+            type = arrow_type(col, timezone)
+            if type is None:
+                values = [row[i] for row in self.rows]
+                type = to_arrow_array(values, col, timezone).type
+            fields.append(pa.field(col["display_name"], type))
+
+        return pa.schema(fields)
+
+    def _arrow_table(self, rows: List[List[Any]]) -> pa.Table:
+        import pyarrow as pa
+
+        values = list(zip(*rows)) if rows else [()] * len(self.cols)
+        timezone = getattr(self, "results_timezone", None)
+
+        return pa.Table.from_arrays(
+            [
+                to_arrow_array(column, col, timezone)
+                for column, col in zip(values, self.cols)
+            ],
+            names=[col["display_name"] for col in self.cols],
+        )
 
 
 class Dataset(CreateResource):
     ENDPOINT = "/api/dataset"
     PRIMARY_KEY = None
+    EXPORT_FORMATS = ("csv", "json", "xlsx")
 
     context: str
     status: str
@@ -45,9 +153,166 @@ class Dataset(CreateResource):
         dataset = super(Dataset, cls).create(
             using=using, database=database, type=type, query=query
         )
-        dataset.data = Data(_using=using, **dataset.data)
+        dataset.data = Data.from_payload(using, dataset.data)
         return dataset
 
-    def to_pandas(self) -> pd.DataFrame:
-        """Returns the query results as a Pandas DataFrame."""
-        return self.data.to_pandas()
+    @classmethod
+    def create_partitioned(
+        cls,
+        using: Metabase,
+        database: int,
+        queries: Sequence[Union[Query, dict]],
+        max_parallelism: int = None,
+    ) -> Dataset:
+        """
+        Execute disjoint partitions of a query concurrently, e.g. from
+        Query.partition(), and return a single Dataset with their rows concatenated
+        in order. Each partition is subject to the row limit and timeout of
+        Dataset.create() on its own.
+
+        Concurrency adapts to how fast Metabase responds, see Metabase.map(), and is
+        further capped to `max_parallelism` partitions at a time if given.
+
+        Raises QueryError if a partition failed (e.g. timed out) or if its rows were
+        truncated to the row limit, in which case it should be split further.
+        """
+        if not queries:
+            raise ValueError("At least one query is required.")
+
+        queries = [q.compile() if isinstance(q, Query) else q for q in queries]
+        semaphore = threading.BoundedSemaphore(max_parallelism or len(queries))
+
+        def create(query):
+            with semaphore:
+                return cls.create(
+                    using=using, database=database, type="query", query=query
+                )
+
+        datasets = using.map(create, queries, return_exceptions=False)
+
+        for i, (query, dataset) in enumerate(zip(queries, datasets)):
+            partition = f"Partition {i + 1} of {len(queries)} ({query.get('filter')})"
+
+            if getattr(dataset, "status", None) != "completed":
+                raise QueryError(
+                    f"{partition} {getattr(dataset, 'status', 'failed')}: "
+                    f"{getattr(dataset, 'error', None)}"
+                )
+            if getattr(dataset.data, "rows_truncated", None):
+                raise QueryError(
+                    f"{partition} was truncated to {dataset.data.rows_truncated} "
+                    "rows, and should be split further."
+                )
+
+        # the first partition holds the metadata of the results
+        dataset = datasets[0]
+        dataset.data.rows = [row for d in datasets for row in d.data.rows]
+        dataset.row_count = sum(d.row_count for d in datasets)
+        dataset.running_time = max(d.running_time for d in datasets)
+        return dataset
+
+    @classmethod
+    def iter_rows(
+        cls,
+        using: Metabase,
+        database: int,
+        type: str,
+        query: dict,
+        batch_size: int = 1000,
+    ) -> Iterator[List[List[Any]]]:
+        """
+        Execute a query and yield the rows of its results in batches of up to
+        `batch_size` rows. The response is decoded incrementally, so that only the
+        current batch is held in memory.
+
+        Raises QueryError if the query failed (e.g. timed out).
+        """
+        response = using.post(
+            cls.ENDPOINT,
+            json={"database": database, "type": type, "query": query},
+            stream=True,
+        )
+        rows = iter_response(response, path=("data", "rows"))
+        try:
+            while True:
+                batch = list(islice(rows, batch_size))
+                if not batch:
+                    return
+                yield batch
+        finally:
+            rows.close()
+
+    @classmethod
+    def export(
+        cls,
+        using: Metabase,
+        database: int,
+        type: str,
+        query: dict,
+        where: Union[str, IO[bytes]],
+        format: str = "csv",
+    ) -> int:
+        """
+        Execute a query and write all of its results, without the row limit of
+        Dataset.create(), to a path or a binary file-like object in the given export
+        format (csv, json or xlsx). The results are written chunk by chunk as they
+        are received. Returns the number of bytes written.
+        """
+        response = cls._export(using, database, type, query, format)
+        return copy_response(response, where)
+
+    @classmethod
+    def export_batches(
+        cls,
+        using: Metabase,
+        database: int,
+        type: str,
+        query: dict,
+        batch_size: int = 10000,
+        **kwargs,
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Execute a query and yield all of its results, without the row limit of
+        Dataset.create(), as DataFrames of up to `batch_size` rows parsed from a CSV
+        export as it is received. Keyword arguments are passed to pandas.read_csv.
+        """
+        response = cls._export(using, database, type, query, "csv")
+        yield from iter_csv_frames(response, batch_size=batch_size, **kwargs)
+
+    @classmethod
+    def _export(
+        cls, using: Metabase, database: int, type: str, query: dict, format: str
+    ):
+        if format not in cls.EXPORT_FORMATS:
+            raise ValueError(f"Unsupported export format: {format}.")
+
+        # export endpoints expect the query as a JSON encoded form parameter
+        payload = {"database": database, "type": type, "query": query}
+        return using.post(
+            cls.ENDPOINT + f"/{format}",
+            data={"query": using.codec.dumps(payload).decode()},
+            stream=True,
+        )
+
+    def to_pandas(
+        self,
+        typed: bool = True,
+        categorical: bool = False,
+        categorical_threshold: float = 0.5,
+    ) -> pd.DataFrame:
+        """Returns the query results as a Pandas DataFrame, see Data.to_pandas()."""
+        return self.data.to_pandas(
+            typed=typed,
+            categorical=categorical,
+            categorical_threshold=categorical_threshold,
+        )
+
+    def to_arrow(self) -> pa.Table:
+        """Returns the query results as an Arrow Table, see Data.to_arrow()."""
+        return self.data.to_arrow()
+
+    def to_parquet(
+        self, where: Union[str, IO], row_group_size: int = 100000, **kwargs
+    ) -> None:
+        """Write the query results to a Parquet file, see Data.to_parquet()."""
+        return self.data.to_parquet(where, row_group_size=row_group_size, **kwargs)
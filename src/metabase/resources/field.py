@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional
 
 from metabase import Metabase
 from metabase.missing import MISSING
@@ -116,6 +116,14 @@ class Field(GetResource, UpdateResource):
         """Get Field with ID."""
         return super(Field, cls).get(id, using=using)
 
+    @classmethod
+    def get_many(cls, ids: Iterable[int], using: Metabase) -> List[Field]:
+        """
+        Get Fields with IDs, concurrently. Fields that could not be fetched are
+        replaced by the exception raised.
+        """
+        return super(Field, cls).get_many(ids, using=using)
+
     def update(
         self,
         display_name: str = MISSING,
@@ -146,9 +154,10 @@ class Field(GetResource, UpdateResource):
 
     def related(self) -> Dict[str, Any]:
         """Return related entities."""
-        return self._using.get(
+        response = self._using.get(
             self.ENDPOINT + f"/{getattr(self, self.PRIMARY_KEY)}" + "/related"
-        ).json()
+        )
+        return self._using.decode(response)
 
     def discard_values(self):
         """
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import List
+from typing import Iterator, List
 
 from requests import HTTPError
 
@@ -27,12 +27,16 @@ class PermissionMembership(ListResource, CreateResource, DeleteResource):
                      :group_id      <id>}]}.
         You must be a superuser to do this.
         """
-        response = using.get(cls.ENDPOINT)
-        all_memberships = [
-            item for sublist in response.json().values() for item in sublist
-        ]
-        records = [cls(_using=using, **record) for record in all_memberships]
-        return records
+        return super(PermissionMembership, cls).list(using=using)
+
+    @classmethod
+    def iter(cls, using: Metabase) -> Iterator[PermissionMembership]:
+        # memberships are grouped by user in a map, which is not streamed
+        yield from cls.list(using=using)
+
+    @classmethod
+    def _records(cls, payload) -> List[dict]:
+        return [item for sublist in payload.values() for item in sublist]
 
     @classmethod
     def create(
@@ -51,6 +55,8 @@ class PermissionMembership(ListResource, CreateResource, DeleteResource):
             raise HTTPError(response.content.decode())
 
         # metabase returns a list of all memberships for the given group_id
-        membership = next(filter(lambda x: x["user_id"] == user_id, response.json()))
+        membership = next(
+            filter(lambda x: x["user_id"] == user_id, using.decode(response))
+        )
 
-        return cls(_using=using, **membership)
+        return cls.from_payload(using, membership)
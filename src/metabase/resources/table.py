@@ -1,7 +1,8 @@
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterable, List
 
 from metabase import Metabase
 from metabase.missing import MISSING
@@ -46,8 +47,19 @@ class Table(ListResource, GetResource, UpdateResource):
     created_at: str
     updated_at: str
 
-    _metrics = None
-    _fields = None
+    # responses of query_metadata() and related(), memoized per instance
+    _query_metadata = None
+    _related = None
+
+    # relationships that can be loaded by Table.get(), and the endpoint they are read from
+    INCLUDES = {
+        "fields": "query_metadata",
+        "dimensions": "query_metadata",
+        "metrics": "related",
+        "segments": "related",
+        "query_metadata": "query_metadata",
+        "related": "related",
+    }
 
     class VisibilityType(str, Enum):
         cruft = "cruft"
@@ -60,15 +72,49 @@ class Table(ListResource, GetResource, UpdateResource):
         database = "database"
         smart = "smart"
 
+    @classmethod
+    def from_payload(cls, using: Metabase, payload: dict) -> Table:
+        """
+        Instantiate from a payload returned by Metabase. A Table already loaded in
+        the identity map is reloaded, so its memoized responses are discarded.
+        """
+        table = super(Table, cls).from_payload(using, payload)
+        table._invalidate()
+        return table
+
     @classmethod
     def list(cls, using: Metabase) -> List[Table]:
         """Get all Tables."""
         return super(Table, cls).list(using=using)
 
     @classmethod
-    def get(cls, id: int, using: Metabase) -> Table:
-        """Get Table with ID."""
-        return super(Table, cls).get(id, using=using)
+    def get(cls, id: int, using: Metabase, include: Iterable[str] = ()) -> Table:
+        """
+        Get Table with ID.
+
+        Relationships listed in `include` (fields, dimensions, metrics, segments) are
+        loaded concurrently with the Table, so that reading them later does not
+        require further requests.
+        """
+        unknown = set(include) - set(cls.INCLUDES)
+        if unknown:
+            raise ValueError(f"Cannot include {', '.join(sorted(unknown))}.")
+
+        endpoints = sorted({cls.INCLUDES[name] for name in include})
+        if not endpoints:
+            return super(Table, cls).get(id, using=using)
+
+        with ThreadPoolExecutor(max_workers=len(endpoints)) as executor:
+            responses = [
+                executor.submit(using.get, cls.ENDPOINT + f"/{id}/{endpoint}")
+                for endpoint in endpoints
+            ]
+            table = super(Table, cls).get(id, using=using)
+
+        for endpoint, response in zip(endpoints, responses):
+            setattr(table, f"_{endpoint}", using.decode(response.result()))
+
+        return table
 
     def update(
         self,
@@ -83,7 +129,7 @@ class Table(ListResource, GetResource, UpdateResource):
         **kwargs,
     ) -> None:
         """Update Table with ID."""
-        return super(Table, self).update(
+        super(Table, self).update(
             display_name=display_name,
             description=description,
             field_order=field_order,
@@ -93,12 +139,29 @@ class Table(ListResource, GetResource, UpdateResource):
             caveats=caveats,
             show_in_getting_started=show_in_getting_started,
         )
+        self._invalidate()
+
+    def refresh(self) -> None:
+        """
+        Reload the Table from Metabase, and discard its memoized metadata and
+        related entities.
+        """
+        response = self._using.get(
+            self.ENDPOINT + f"/{getattr(self, self.PRIMARY_KEY)}"
+        )
+        self.__dict__.update(self._using.decode(response))
+        self._invalidate()
+
+    def _invalidate(self) -> None:
+        self._query_metadata = None
+        self._related = None
 
     def fks(self) -> List[dict]:
         """Get all foreign keys whose destination is a Field that belongs to this Table."""
-        return self._using.get(
+        response = self._using.get(
             self.ENDPOINT + f"/{getattr(self, self.PRIMARY_KEY)}" + "/fks"
-        ).json()
+        )
+        return self._using.decode(response)
 
     def query_metadata(self) -> Dict[str, Any]:
         """
@@ -110,16 +173,30 @@ class Table(ListResource, GetResource, UpdateResource):
         Fields in the response. Defaults to false.
 
         These options are provided for use in the Admin Edit Metadata page.
+
+        The response is memoized; call refresh() to reload it.
         """
-        return self._using.get(
-            self.ENDPOINT + f"/{getattr(self, self.PRIMARY_KEY)}" + "/query_metadata"
-        ).json()
+        if self._query_metadata is None:
+            response = self._using.get(
+                self.ENDPOINT
+                + f"/{getattr(self, self.PRIMARY_KEY)}"
+                + "/query_metadata"
+            )
+            self._query_metadata = self._using.decode(response)
+        return self._query_metadata
 
     def related(self) -> Dict[str, Any]:
-        """Return related entities."""
-        return self._using.get(
-            self.ENDPOINT + f"/{getattr(self, self.PRIMARY_KEY)}" + "/related"
-        ).json()
+        """
+        Return related entities.
+
+        The response is memoized; call refresh() to reload it.
+        """
+        if self._related is None:
+            response = self._using.get(
+                self.ENDPOINT + f"/{getattr(self, self.PRIMARY_KEY)}" + "/related"
+            )
+            self._related = self._using.decode(response)
+        return self._related
 
     def discard_values(self):
         """
@@ -146,15 +223,17 @@ class Table(ListResource, GetResource, UpdateResource):
 
     def fields(self) -> List[Field]:
         """Get all Fields associated with this Table.."""
+        # payloads are copied, since they become the attributes of the Fields and
+        # the memoized response is reused
         return [
-            Field(_using=self._using, **field)
+            Field.from_payload(self._using, dict(field))
             for field in self.query_metadata().get("fields")
         ]
 
     def dimensions(self) -> List[Dimension]:
         """Get all Dimensions associated with this Table."""
         return [
-            Dimension(id=id, _using=self._using, **dimension)
+            Dimension.from_payload(self._using, {"id": id, **dimension})
             for id, dimension in self.query_metadata()
             .get("dimension_options", {})
             .items()
@@ -163,13 +242,13 @@ class Table(ListResource, GetResource, UpdateResource):
     def metrics(self) -> List[Metric]:
         """Get all Metrics associated with this Table."""
         return [
-            Metric(_using=self._using, **metric)
+            Metric.from_payload(self._using, dict(metric))
             for metric in self.related().get("metrics")
         ]
 
     def segments(self) -> List[Segment]:
         """Get all Segments associated with this Table."""
         return [
-            Segment(_using=self._using, **segment)
+            Segment.from_payload(self._using, dict(segment))
             for segment in self.related().get("segments")
         ]
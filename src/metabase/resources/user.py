@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterator, List
 
 from metabase import Metabase
 from metabase.missing import MISSING
@@ -16,6 +16,7 @@ from metabase.resource import (
 
 class User(ListResource, CreateResource, GetResource, UpdateResource, DeleteResource):
     ENDPOINT = "/api/user"
+    LIST_KEY = "data"
 
     id: int
     email: str
@@ -72,10 +73,46 @@ class User(ListResource, CreateResource, GetResource, UpdateResource, DeleteReso
             },
         )
         records = [
-            cls(_using=using, **user) for user in response.json().get("data", [])
+            cls.from_payload(using, user)
+            for user in cls._records(using.decode(response))
         ]
         return records
 
+    @classmethod
+    def iter(
+        cls,
+        using: Metabase,
+        status: str = None,
+        query: str = None,
+        group_id: int = None,
+        include_deactivated: bool = None,
+        page_size: int = 100,
+        prefetch: bool = True,
+    ) -> Iterator[User]:
+        """
+        Iterate over all Users matching the given filters (see User.list), fetching
+        page_size Users at a time. If prefetch is True, the next page is fetched in
+        the background while the current one is consumed.
+        """
+
+        def fetch_page(limit: int, offset: int):
+            response = using.get(
+                cls.ENDPOINT,
+                params={
+                    "status": status,
+                    "query": query,
+                    "group_id": group_id,
+                    "include_deactivated": include_deactivated,
+                    "limit": limit,
+                    "offset": offset,
+                },
+            )
+            payload = using.decode(response)
+            return cls._records(payload), payload.get("total")
+
+        for record in cls._paginate(fetch_page, page_size, prefetch):
+            yield cls.from_payload(using, record)
+
     @classmethod
     def create(
         cls,
@@ -0,0 +1,165 @@
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Iterable, Optional
+
+import requests
+
+from metabase.exceptions import CircuitOpenError
+
+
+class Retry:
+    """
+    Retry policy for requests sent to Metabase.
+
+    Failed requests are retried up to `total` times, waiting a jittered exponential
+    backoff (backoff_factor * 2 ** attempt, capped at backoff_max) between attempts,
+    or the delay requested by the Retry-After header of the response. Only
+    idempotent methods are retried by default.
+    """
+
+    IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+    def __init__(
+        self,
+        total: int = 3,
+        backoff_factor: float = 0.5,
+        backoff_max: float = 30,
+        jitter: bool = True,
+        status_forcelist: Iterable[int] = (429, 502, 503, 504),
+        allowed_methods: Iterable[str] = IDEMPOTENT_METHODS,
+        respect_retry_after: bool = True,
+    ):
+        self.total = total
+        self.backoff_factor = backoff_factor
+        self.backoff_max = backoff_max
+        self.jitter = jitter
+        self.status_forcelist = frozenset(status_forcelist)
+        self.allowed_methods = frozenset(m.upper() for m in allowed_methods)
+        self.respect_retry_after = respect_retry_after
+
+    def should_retry(
+        self,
+        method: str,
+        attempt: int,
+        response: requests.Response = None,
+        error: Exception = None,
+    ) -> bool:
+        """Whether a request should be retried after its `attempt`-th failure."""
+        if attempt >= self.total or method.upper() not in self.allowed_methods:
+            return False
+
+        if error is not None:
+            return isinstance(error, (requests.ConnectionError, requests.Timeout))
+
+        return response is not None and response.status_code in self.status_forcelist
+
+    def backoff(self, attempt: int, response: requests.Response = None) -> float:
+        """Number of seconds to wait before the next attempt."""
+        if self.respect_retry_after and response is not None:
+            retry_after = self.retry_after(response)
+            if retry_after is not None:
+                return min(retry_after, self.backoff_max)
+
+        delay = min(self.backoff_factor * 2**attempt, self.backoff_max)
+        if self.jitter:
+            delay = random.uniform(0, delay)
+        return delay
+
+    @staticmethod
+    def retry_after(response: requests.Response) -> Optional[float]:
+        """Parse the Retry-After header, given either in seconds or as a date."""
+        value = response.headers.get("Retry-After")
+        if value is None:
+            return None
+
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+
+class CircuitBreaker:
+    """
+    Stops sending requests to Metabase while it is unhealthy.
+
+    After `failure_threshold` consecutive failures (connection errors, timeouts or
+    5xx responses), the circuit opens and requests fail immediately with
+    CircuitOpenError. After `recovery_timeout` seconds, a single request is let
+    through: the circuit closes if it succeeds, or opens again if it fails.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+    def __init__(self, failure_threshold: int = 5, recovery_timeout: float = 30):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_lock"] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def before_request(self) -> None:
+        """Raise CircuitOpenError if the request should not be sent."""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return
+
+            if (
+                self.state == self.OPEN
+                and time.monotonic() - self.opened_at >= self.recovery_timeout
+            ):
+                # let a single trial request through
+                self.state = self.HALF_OPEN
+                return
+
+            raise CircuitOpenError(
+                f"Circuit is {self.state} after {self.failures} consecutive failures."
+            )
+
+    @staticmethod
+    def is_failure(response: requests.Response = None, error: Exception = None):
+        if error is not None:
+            return isinstance(error, (requests.ConnectionError, requests.Timeout))
+        return response.status_code >= 500
+
+    def record(self, response: requests.Response = None, error: Exception = None):
+        with self._lock:
+            if self.is_failure(response, error):
+                self.failures += 1
+                if (
+                    self.state == self.HALF_OPEN
+                    or self.failures >= self.failure_threshold
+                ):
+                    self.state = self.OPEN
+                    self.opened_at = time.monotonic()
+            else:
+                self.failures = 0
+                self.state = self.CLOSED
+
+    def abort(self) -> None:
+        """
+        End a request that raised an unexpected error, whose outcome is unknown. If
+        it was the trial request, the circuit opens again until the next one.
+        """
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
@@ -0,0 +1,57 @@
+import copy
+import threading
+from typing import Any, Callable, Hashable
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls sharing the same key: the first caller runs the
+    function, and callers arriving while it is in flight wait for its outcome
+    instead of running it again. Waiters receive a shallow copy of the result.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, func: Callable[[], Any]) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return copy.copy(call.result)
+
+        try:
+            call.result = func()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                if self._calls.get(key) is call:
+                    del self._calls[key]
+            call.done.set()
+
+    def forget(self, match: Callable[[Hashable], bool]) -> None:
+        """
+        Stop coalescing with the calls in flight whose key matches, so that later
+        calls run the function again. Callers already waiting still receive the
+        outcome of the call they joined.
+        """
+        with self._lock:
+            for key in [key for key in self._calls if match(key)]:
+                del self._calls[key]
@@ -0,0 +1,223 @@
+from __future__ import annotations
+
+import codecs
+import json
+import os
+from contextlib import ExitStack
+from typing import IO, TYPE_CHECKING, Any, Iterable, Iterator, Sequence, Union
+
+import requests
+from requests import HTTPError
+
+from metabase.exceptions import QueryError
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+_WHITESPACE = " \t\n\r"
+
+# consumed characters are dropped from the buffer once there are more than this many
+_COMPACT_THRESHOLD = 1024 * 1024
+
+
+class _Reader:
+    """Buffered reader of JSON text from an iterable of byte chunks."""
+
+    def __init__(self, chunks: Iterable[bytes]):
+        self._chunks = iter(chunks)
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._json = json.JSONDecoder()
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self) -> bool:
+        """Read the next chunk into the buffer. Returns False at the end of the stream."""
+        if self.eof:
+            return False
+
+        if self.pos > _COMPACT_THRESHOLD:
+            self.buffer = self.buffer[self.pos :]
+            self.pos = 0
+
+        for chunk in self._chunks:
+            text = self._decoder.decode(chunk)
+            if text:
+                self.buffer += text
+                return True
+
+        self.buffer += self._decoder.decode(b"", final=True)
+        self.eof = True
+        return False
+
+    def peek(self) -> str:
+        """Returns the next non-whitespace character, without consuming it."""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in _WHITESPACE:
+                self.pos += 1
+
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+
+            if not self.fill():
+                raise json.JSONDecodeError(
+                    "Unexpected end of stream", self.buffer, self.pos
+                )
+
+    def expect(self, char: str) -> None:
+        if self.peek() != char:
+            raise json.JSONDecodeError(f"Expected {char!r}", self.buffer, self.pos)
+        self.pos += 1
+
+    def value(self) -> Any:
+        """Decode the next JSON value, reading more chunks until it is complete."""
+        self.peek()
+        while True:
+            try:
+                value, end = self._json.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if self.fill():
+                    continue
+                raise
+
+            # a number at the end of the buffer may continue in the next chunk
+            if end == len(self.buffer) and self.fill():
+                continue
+
+            self.pos = end
+            return value
+
+
+def iter_json_array(chunks: Iterable[bytes], path: Sequence[str] = ()) -> Iterator[Any]:
+    """
+    Incrementally decode the JSON array found at `path` (a sequence of object keys,
+    empty for a top-level array) from an iterable of byte chunks, such as
+    response.iter_content(), yielding its items as they are read. Only one item
+    at a time is kept in memory, along with the values preceding the array.
+
+    Raises ValueError if there is no array at `path`, with the error reported by
+    Metabase if any, and QueryError if the top-level status is "failed" (e.g. a
+    query that timed out, whose results are empty).
+    """
+    reader = _Reader(chunks)
+    skipped = {}
+
+    def check_status():
+        if skipped.get("status") == "failed":
+            message = skipped.get("error") or skipped.get("message")
+            raise QueryError("Query failed" + (f": {message}" if message else "."))
+
+    for depth, key in enumerate(path):
+        reader.expect("{")
+
+        while True:
+            if reader.peek() == "}":
+                message = skipped.get("error") or skipped.get("message")
+                raise ValueError(
+                    f"{'.'.join(path[: depth + 1])} not found in response"
+                    + (f": {message}" if message else ".")
+                )
+
+            name = reader.value()
+            reader.expect(":")
+
+            if name == key:
+                break
+
+            value = reader.value()
+            if depth == 0:
+                skipped[name] = value
+
+            if reader.peek() == ",":
+                reader.pos += 1
+
+    check_status()
+
+    reader.expect("[")
+    if reader.peek() != "]":
+        while True:
+            yield reader.value()
+
+            if reader.peek() == "]":
+                break
+            reader.expect(",")
+    reader.pos += 1
+
+    # the status may follow the array, read the rest of the enclosing objects
+    for depth in reversed(range(len(path))):
+        while reader.peek() == ",":
+            reader.pos += 1
+            name = reader.value()
+            reader.expect(":")
+            value = reader.value()
+            if depth == 0:
+                skipped[name] = value
+        reader.expect("}")
+
+    check_status()
+
+
+def iter_response(
+    response: requests.Response, path: Sequence[str] = (), chunk_size: int = 65536
+) -> Iterator[Any]:
+    """
+    Yield the items of the JSON array at `path` in the body of a response sent with
+    stream=True, as they are read off the socket. The response is closed once the
+    items are consumed, or when the generator is closed.
+    """
+    try:
+        if not response.ok:
+            raise HTTPError(response.content.decode())
+
+        yield from iter_json_array(response.iter_content(chunk_size), path=path)
+    finally:
+        response.close()
+
+
+def copy_response(
+    response: requests.Response, where: Union[str, IO[bytes]], chunk_size: int = 65536
+) -> int:
+    """
+    Write the body of a response sent with stream=True to a path or a binary
+    file-like object, chunk by chunk. Returns the number of bytes written.
+    """
+    try:
+        if not response.ok:
+            raise HTTPError(response.content.decode())
+
+        with ExitStack() as stack:
+            file = (
+                stack.enter_context(open(where, "wb"))
+                if isinstance(where, (str, os.PathLike))
+                else where
+            )
+
+            written = 0
+            for chunk in response.iter_content(chunk_size):
+                file.write(chunk)
+                written += len(chunk)
+            return written
+    finally:
+        response.close()
+
+
+def iter_csv_frames(
+    response: requests.Response, batch_size: int = 10000, **kwargs
+) -> Iterator[pd.DataFrame]:
+    """
+    Yield DataFrames of up to `batch_size` rows parsed from the CSV body of a
+    response sent with stream=True, as it is read. Keyword arguments are passed
+    to pandas.read_csv.
+    """
+    import pandas as pd
+
+    try:
+        if not response.ok:
+            raise HTTPError(response.content.decode())
+
+        # the raw stream is read by pandas, decompressed if needed
+        response.raw.decode_content = True
+        with pd.read_csv(response.raw, chunksize=batch_size, **kwargs) as reader:
+            yield from reader
+    finally:
+        response.close()
@@ -0,0 +1,110 @@
+import json
+import os
+import tempfile
+import threading
+from typing import Dict, Optional
+
+
+class TokenStore:
+    """
+    Stores Metabase session tokens so that they can be reused across Metabase
+    instances and processes. Tokens are keyed by host and user.
+    """
+
+    def get(self, key: str) -> Optional[str]:
+        raise NotImplementedError
+
+    def set(self, key: str, token: str) -> None:
+        raise NotImplementedError
+
+    def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+
+class MemoryTokenStore(TokenStore):
+    """Shares session tokens between Metabase instances of the same process."""
+
+    def __init__(self):
+        self._tokens = {}
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_lock"] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            return self._tokens.get(key)
+
+    def set(self, key: str, token: str) -> None:
+        with self._lock:
+            self._tokens[key] = token
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._tokens.pop(key, None)
+
+
+class FileTokenStore(TokenStore):
+    """
+    Shares session tokens between processes through a JSON file, readable by the
+    current user only. Writes are atomic, so concurrent processes never read a
+    partially written file.
+    """
+
+    DEFAULT_PATH = os.path.join("~", ".metabase-python", "tokens.json")
+
+    def __init__(self, path: str = None):
+        self.path = os.path.expanduser(path or self.DEFAULT_PATH)
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_lock"] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def _read(self) -> Dict[str, str]:
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def _write(self, tokens: Dict[str, str]) -> None:
+        directory = os.path.dirname(self.path) or "."
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+
+        fd, tmp = tempfile.mkstemp(dir=directory, prefix=".tokens-")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(tokens, f)
+            os.chmod(tmp, 0o600)
+            os.replace(tmp, self.path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            return self._read().get(key)
+
+    def set(self, key: str, token: str) -> None:
+        with self._lock:
+            tokens = self._read()
+            tokens[key] = token
+            self._write(tokens)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            tokens = self._read()
+            if tokens.pop(key, None) is not None:
+                self._write(tokens)
@@ -1,6 +1,10 @@
+import io
+import json as jsonlib
 from unittest import TestCase
 
 import requests
+from requests.adapters import BaseAdapter
+from urllib3 import HTTPResponse
 
 from metabase.metabase import Metabase
 
@@ -42,3 +46,75 @@ class IntegrationTestCase(TestCase):
                     "token": token,
                 },
             )
+
+
+def make_response(
+    status_code: int = 200,
+    json=None,
+    content: bytes = None,
+    headers: dict = None,
+    stream: bool = False,
+) -> requests.Response:
+    """
+    Build a requests.Response without hitting the network. If stream is True, the
+    content is read from the raw stream of the response, as with stream=True.
+    """
+    response = requests.Response()
+    response.status_code = status_code
+    response.headers.update(headers or {})
+
+    if json is not None:
+        content = jsonlib.dumps(json).encode()
+        response.headers.setdefault("Content-Type", "application/json")
+
+    content = content if content is not None else b""
+    if stream:
+        response.raw = HTTPResponse(
+            body=io.BytesIO(content), status=status_code, preload_content=False
+        )
+    else:
+        response._content = content
+        response._content_consumed = True
+    return response
+
+
+class MockAdapter(BaseAdapter):
+    """
+    Transport adapter that answers requests with canned responses. Responses are
+    either popped from the queue given at initialization or produced by `handler`.
+    """
+
+    def __init__(self, *responses, handler=None):
+        super(MockAdapter, self).__init__()
+        self.responses = list(responses)
+        self.handler = handler
+        self.requests = []
+
+    def send(self, request, **kwargs):
+        self.requests.append(request)
+
+        if self.handler is not None:
+            response = self.handler(request)
+        else:
+            response = self.responses.pop(0)
+
+        if isinstance(response, Exception):
+            raise response
+
+        response.request = request
+        response.url = request.url
+        return response
+
+    def close(self):
+        pass
+
+
+def mock_metabase(*responses, handler=None, cls=Metabase, **kwargs) -> Metabase:
+    """Returns a Metabase instance whose requests are answered by a MockAdapter."""
+    kwargs.setdefault("token", "123")
+    metabase = cls(
+        host="http://example.com", user="user", password="password", **kwargs
+    )
+    metabase.adapter = MockAdapter(*responses, handler=handler)
+    metabase.session.mount("http://", metabase.adapter)
+    return metabase
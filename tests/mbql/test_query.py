@@ -1,10 +1,11 @@
+from datetime import date, datetime
 from unittest import TestCase
 
 from metabase import Metric
 from metabase.mbql.aggregations import Count, Max
 from metabase.mbql.filter import Equal
 from metabase.mbql.groupby import GroupBy
-from metabase.mbql.query import Query
+from metabase.mbql.query import Query, split_range
 from metabase.resources.metric import Metric
 
 
@@ -82,3 +83,58 @@ class QueryTests(TestCase):
             ["and", ["=", ["field", 5, None], 2], ["=", ["field", 6, None], 1]],
             query._filters,
         )
+
+    def test_partition(self):
+        """Ensure Query.partition() returns disjoint queries covering all values."""
+        query = Query(table_id=12, aggregations=[], filters=[Equal(6, 1)])
+        partitions = query.partition(5, [10, 20])
+
+        self.assertEqual(
+            [
+                ["and", ["=", ["field", 6, None], 1], ["<", ["field", 5, None], 10]],
+                [
+                    "and",
+                    ["=", ["field", 6, None], 1],
+                    [">=", ["field", 5, None], 10],
+                    ["<", ["field", 5, None], 20],
+                ],
+                ["and", ["=", ["field", 6, None], 1], [">=", ["field", 5, None], 20]],
+                ["and", ["=", ["field", 6, None], 1], ["is-null", ["field", 5, None]]],
+            ],
+            [partition._filters for partition in partitions],
+        )
+        # the original query is left unchanged
+        self.assertEqual(1, len(query.filters))
+
+    def test_partition_dates(self):
+        """Ensure Query.partition() compiles dates to ISO format."""
+        query = Query(table_id=12, aggregations=[])
+        partitions = query.partition(5, [date(2022, 1, 1)], include_nulls=False)
+
+        self.assertEqual(
+            [
+                ["<", ["field", 5, None], "2022-01-01"],
+                [">=", ["field", 5, None], "2022-01-01"],
+            ],
+            [partition._filters for partition in partitions],
+        )
+
+        self.assertEqual([query], query.partition(5, []))
+
+    def test_split_range(self):
+        """Ensure split_range() returns evenly spaced bounds."""
+        self.assertEqual([25, 50, 75], split_range(0, 100, 4))
+        self.assertEqual([1.25, 2.5, 3.75], split_range(0.0, 5.0, 4))
+        self.assertEqual([1, 2], split_range(0, 3, 10))
+        self.assertEqual([], split_range(0, 100, 1))
+        self.assertEqual(
+            [date(2022, 1, 16), date(2022, 1, 31)],
+            split_range(date(2022, 1, 1), date(2022, 2, 15), 3),
+        )
+        self.assertEqual(
+            [datetime(2022, 1, 1, 12)],
+            split_range(datetime(2022, 1, 1), datetime(2022, 1, 2), 2),
+        )
+
+        with self.assertRaises(ValueError):
+            split_range(0, 100, 0)
@@ -1,7 +1,22 @@
+import io
+import json
+import threading
+import time
+from unittest import TestCase, skipUnless
+
 import pandas as pd
+from requests import HTTPError
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover
+    pa = None
 
+from metabase.exceptions import QueryError
+from metabase.mbql.query import Query
 from metabase.resources.dataset import Data, Dataset
-from tests.helpers import IntegrationTestCase
+from tests.helpers import IntegrationTestCase, make_response, mock_metabase
 
 
 class DatasetTests(IntegrationTestCase):
@@ -41,3 +56,267 @@ class DatasetTests(IntegrationTestCase):
         df = dataset.to_pandas()
         self.assertIsInstance(df, pd.DataFrame)
         self.assertListEqual(["Created At", "Count"], df.columns.tolist())
+
+
+class DataTests(TestCase):
+    COLS = [
+        {"display_name": "ID", "base_type": "type/BigInteger"},
+        {"display_name": "Price", "base_type": "type/Float"},
+        {"display_name": "Active", "base_type": "type/Boolean"},
+        {"display_name": "Created At", "base_type": "type/DateTime"},
+        {"display_name": "Name", "base_type": "type/Text"},
+    ]
+    ROWS = [
+        [1, 1.5, True, "2022-01-01T00:00:00Z", "a"],
+        [2, None, None, "2022-01-02T00:00:00Z", None],
+    ]
+
+    def test_to_pandas_typed(self):
+        """Ensure Data.to_pandas() types columns from their metadata."""
+        data = Data(_using=None, rows=self.ROWS, cols=self.COLS)
+        df = data.to_pandas()
+
+        self.assertListEqual(
+            ["ID", "Price", "Active", "Created At", "Name"], df.columns.tolist()
+        )
+        self.assertEqual("int64", df["ID"].dtype)
+        self.assertEqual("float64", df["Price"].dtype)
+        self.assertEqual("boolean", df["Active"].dtype)
+        self.assertEqual("datetime64[ns, UTC]", df["Created At"].dtype)
+        self.assertEqual(object, df["Name"].dtype)
+        self.assertEqual(pd.Timestamp("2022-01-02", tz="UTC"), df["Created At"][1])
+
+    def test_to_pandas_timezone(self):
+        """Ensure temporal columns are converted to the timezone of the results."""
+        data = Data(
+            _using=None,
+            rows=self.ROWS,
+            cols=self.COLS,
+            results_timezone="America/Toronto",
+        )
+        df = data.to_pandas()
+
+        self.assertEqual("datetime64[ns, America/Toronto]", df["Created At"].dtype)
+
+    def test_to_pandas_untyped(self):
+        """Ensure Data.to_pandas(typed=False) does not convert columns."""
+        data = Data(_using=None, rows=self.ROWS, cols=self.COLS)
+        df = data.to_pandas(typed=False)
+
+        self.assertEqual(object, df["Created At"].dtype)
+        self.assertEqual(object, df["Active"].dtype)
+
+    def test_to_pandas_categorical(self):
+        """Ensure Data.to_pandas(categorical=True) converts category columns."""
+        cols = [
+            {
+                "display_name": "Category",
+                "base_type": "type/Text",
+                "source": "breakout",
+            },
+            {"display_name": "Count", "base_type": "type/BigInteger"},
+        ]
+        rows = [["a", 1], ["b", 2], ["a", 3], ["b", 4]]
+        data = Data(_using=None, rows=rows, cols=cols)
+
+        self.assertEqual("category", data.to_pandas(categorical=True)["Category"].dtype)
+        self.assertEqual(object, data.to_pandas()["Category"].dtype)
+        self.assertEqual(
+            object,
+            data.to_pandas(categorical=True, categorical_threshold=0.25)[
+                "Category"
+            ].dtype,
+        )
+
+    @skipUnless(pa, "requires pyarrow")
+    def test_to_arrow(self):
+        """Ensure Data.to_arrow() types columns from their metadata."""
+        data = Data(_using=None, rows=self.ROWS, cols=self.COLS)
+        table = data.to_arrow()
+
+        self.assertListEqual(
+            ["ID", "Price", "Active", "Created At", "Name"], table.column_names
+        )
+        self.assertEqual(pa.int64(), table.schema.field("ID").type)
+        self.assertEqual(pa.float64(), table.schema.field("Price").type)
+        self.assertEqual(pa.bool_(), table.schema.field("Active").type)
+        self.assertEqual(
+            pa.timestamp("us", tz="UTC"), table.schema.field("Created At").type
+        )
+        self.assertEqual(pa.string(), table.schema.field("Name").type)
+        self.assertEqual([True, None], table.column("Active").to_pylist())
+
+    @skipUnless(pa, "requires pyarrow")
+    def test_to_parquet(self):
+        """Ensure Data.to_parquet() writes the results in row groups."""
+        rows = self.ROWS * 3
+        data = Data(_using=None, rows=rows, cols=self.COLS)
+        buffer = io.BytesIO()
+
+        data.to_parquet(buffer, row_group_size=2)
+
+        buffer.seek(0)
+        parquet = pq.ParquetFile(buffer)
+        self.assertEqual(3, parquet.num_row_groups)
+        self.assertTrue(parquet.read().equals(data.to_arrow()))
+
+    @skipUnless(pa, "requires pyarrow")
+    def test_to_parquet_row_group_types(self):
+        """Ensure Data.to_parquet() does not take its schema from the first row group."""
+        cols = [
+            {"display_name": "Time", "base_type": "type/Time"},
+            {"display_name": "Quantity", "base_type": "type/Integer"},
+            {"display_name": "Name", "base_type": "type/Text"},
+            {"display_name": "Created At", "base_type": "type/DateTime"},
+        ]
+        rows = [
+            [None, 1, None, None],
+            [None, None, None, None],
+            ["10:00:00", 2.5, "a", "2022-01-01T00:00:00Z"],
+        ]
+        data = Data(_using=None, rows=rows, cols=cols)
+
+        buffer = io.BytesIO()
+        data.to_parquet(buffer, row_group_size=2)
+        buffer.seek(0)
+
+        table = pq.read_table(buffer)
+        self.assertEqual(
+            [pa.string(), pa.float64(), pa.string(), pa.timestamp("us", tz="UTC")],
+            table.schema.types,
+        )
+        self.assertEqual([None, None, "10:00:00"], table.column(0).to_pylist())
+        self.assertEqual([1.0, None, 2.5], table.column(1).to_pylist())
+
+    @skipUnless(pa, "requires pyarrow")
+    def test_to_parquet_mixed_offsets(self):
+        """Ensure temporals with and without offset in a row group are timestamps."""
+        cols = [{"display_name": "Created At", "base_type": "type/DateTime"}]
+        rows = [
+            ["2022-01-01T00:00:00Z"],
+            ["2022-01-01T00:00:00"],
+            ["2022-01-02T00:00:00+01:00"],
+        ]
+        data = Data(_using=None, rows=rows, cols=cols)
+        timestamp = pa.timestamp("us", tz="UTC")
+
+        table = data.to_arrow()
+        self.assertEqual(timestamp, table.schema.field("Created At").type)
+
+        buffer = io.BytesIO()
+        data.to_parquet(buffer, row_group_size=2)
+        buffer.seek(0)
+
+        parquet = pq.read_table(buffer)
+        self.assertEqual(timestamp, parquet.schema.field("Created At").type)
+        self.assertTrue(parquet.equals(table))
+
+    def test_to_pandas_empty(self):
+        """Ensure empty results have typed columns."""
+        df = Data(_using=None, rows=[], cols=self.COLS).to_pandas()
+
+        self.assertEqual(0, len(df))
+        self.assertEqual("int64", df["ID"].dtype)
+
+
+class PartitionedDatasetTests(TestCase):
+    COLS = [{"display_name": "ID", "base_type": "type/Integer"}]
+
+    def dataset(self, rows, running_time=10):
+        return {
+            "status": "completed",
+            "row_count": len(rows),
+            "running_time": running_time,
+            "data": {"rows": rows, "cols": self.COLS},
+        }
+
+    def test_create_partitioned(self):
+        """Ensure Dataset.create_partitioned() concatenates the results in order."""
+
+        def handler(request):
+            query = json.loads(request.body)["query"]
+            operator = query["filter"][0]
+            if operator == "<":
+                time.sleep(0.05)  # the first partition completes last
+                return make_response(json=self.dataset([[1], [2]], running_time=50))
+            if operator == ">=":
+                return make_response(json=self.dataset([[3]]))
+            return make_response(json=self.dataset([[None]]))
+
+        metabase = mock_metabase(handler=handler)
+        query = Query(table_id=1, aggregations=[])
+        dataset = Dataset.create_partitioned(
+            using=metabase, database=1, queries=query.partition(5, [3])
+        )
+
+        self.assertEqual(3, len(metabase.adapter.requests))
+        self.assertEqual([[1], [2], [3], [None]], dataset.data.rows)
+        self.assertEqual(4, dataset.row_count)
+        self.assertEqual(50, dataset.running_time)
+        self.assertEqual("Int64", str(dataset.to_pandas()["ID"].dtype))
+
+    def test_create_partitioned_max_parallelism(self):
+        """Ensure Dataset.create_partitioned() runs at most max_parallelism queries."""
+        lock = threading.Lock()
+        running = []
+        peak = []
+
+        def handler(request):
+            with lock:
+                running.append(request)
+                peak.append(len(running))
+            time.sleep(0.02)
+            with lock:
+                running.remove(request)
+            return make_response(json=self.dataset([[1]]))
+
+        metabase = mock_metabase(handler=handler)
+        queries = [{"source-table": 1}] * 6
+        dataset = Dataset.create_partitioned(
+            using=metabase, database=1, queries=queries, max_parallelism=2
+        )
+
+        self.assertEqual(6, dataset.row_count)
+        self.assertLessEqual(max(peak), 2)
+
+    def test_create_partitioned_errors(self):
+        """Ensure Dataset.create_partitioned() raises if a partition fails."""
+        with self.assertRaises(ValueError):
+            Dataset.create_partitioned(using=None, database=1, queries=[])
+
+        metabase = mock_metabase(handler=lambda request: make_response(status_code=500))
+        with self.assertRaises(HTTPError):
+            Dataset.create_partitioned(
+                using=metabase, database=1, queries=[{"source-table": 1}]
+            )
+
+    def test_create_partitioned_failed(self):
+        """Ensure Dataset.create_partitioned() raises if a partition failed or was truncated."""
+        failed = {
+            **self.dataset([]),
+            "status": "failed",
+            "error": "Query timed out",
+        }
+        truncated = self.dataset([[1]] * 2)
+        truncated["data"]["rows_truncated"] = 2
+        query = Query(table_id=1, aggregations=[])
+
+        for payload, message in (
+            (failed, "Partition 2 of 3 .* failed: Query timed out"),
+            (truncated, "Partition 2 of 3 .* was truncated to 2 rows"),
+        ):
+            responses = [self.dataset([[1]]), payload, self.dataset([[5]])]
+
+            def handler(request, responses=responses):
+                # partitions are sent concurrently: answered by their filter
+                operator = json.loads(request.body)["query"]["filter"][0]
+                index = {"<": 0, "and": 1, ">=": 2}[operator]
+                return make_response(202, json=responses[index])
+
+            metabase = mock_metabase(handler=handler)
+            with self.assertRaisesRegex(QueryError, message):
+                Dataset.create_partitioned(
+                    using=metabase,
+                    database=1,
+                    queries=query.partition(5, [3, 5], include_nulls=False),
+                )
@@ -19,6 +19,13 @@ class FieldTests(IntegrationTestCase):
         self.assertIsInstance(field, Field)
         self.assertEqual(1, field.id)
 
+    def test_get_many(self):
+        """Ensure Field.get_many() returns Field instances in the order of the given IDs."""
+        fields = Field.get_many([3, 1, 2], using=self.metabase)
+
+        self.assertTrue(all(isinstance(field, Field) for field in fields))
+        self.assertListEqual([3, 1, 2], [field.id for field in fields])
+
     def test_update(self):
         """Ensure Field.update() updates an existing Field in Metabase."""
         field = Field.get(1, using=self.metabase)
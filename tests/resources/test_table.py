@@ -1,8 +1,12 @@
+from unittest import TestCase
+from urllib.parse import urlparse
+
+from metabase.identity import IdentityMap
 from metabase.resources.field import Field
 from metabase.resources.metric import Metric
 from metabase.resources.segment import Segment
 from metabase.resources.table import Dimension, Table
-from tests.helpers import IntegrationTestCase
+from tests.helpers import IntegrationTestCase, make_response, mock_metabase
 
 
 class TableTests(IntegrationTestCase):
@@ -147,3 +151,96 @@ class TableTests(IntegrationTestCase):
 
         # teardown
         segment.archive()
+
+
+class TableMemoizationTests(TestCase):
+    @staticmethod
+    def handler(request):
+        path = urlparse(request.url).path
+        if path.endswith("/query_metadata"):
+            return make_response(json={"fields": [{"id": 1}], "dimension_options": {}})
+        if path.endswith("/related"):
+            return make_response(json={"metrics": [{"id": 2}], "segments": []})
+        return make_response(json={"id": 1, "display_name": "Table"})
+
+    def paths(self, metabase):
+        return [urlparse(request.url).path for request in metabase.adapter.requests]
+
+    def test_memoization(self):
+        """Ensure query_metadata() and related() are requested once per Table."""
+        metabase = mock_metabase(handler=self.handler, coalesce=False)
+        table = Table(_using=metabase, id=1)
+
+        self.assertListEqual([1], [field.id for field in table.fields()])
+        self.assertListEqual([], table.dimensions())
+        self.assertListEqual([2], [metric.id for metric in table.metrics()])
+        self.assertListEqual([], table.segments())
+        self.assertListEqual(
+            ["/api/table/1/query_metadata", "/api/table/1/related"],
+            self.paths(metabase),
+        )
+
+    def test_refresh(self):
+        """Ensure Table.refresh() reloads the Table and discards memoized responses."""
+        metabase = mock_metabase(handler=self.handler, coalesce=False)
+        table = Table(_using=metabase, id=1)
+        table.fields()
+
+        table.refresh()
+        table.fields()
+
+        self.assertEqual("Table", table.display_name)
+        self.assertListEqual(
+            [
+                "/api/table/1/query_metadata",
+                "/api/table/1",
+                "/api/table/1/query_metadata",
+            ],
+            self.paths(metabase),
+        )
+
+    def test_get_invalidates(self):
+        """Ensure Table.get() discards the memoized responses of a mapped Table."""
+        metabase = mock_metabase(
+            handler=self.handler, coalesce=False, identity_map=IdentityMap()
+        )
+        table = Table.get(1, using=metabase)
+        table.fields()
+
+        self.assertIs(table, Table.get(1, using=metabase))
+        table.fields()
+
+        self.assertListEqual(
+            [
+                "/api/table/1",
+                "/api/table/1/query_metadata",
+                "/api/table/1",
+                "/api/table/1/query_metadata",
+            ],
+            self.paths(metabase),
+        )
+
+    def test_update_invalidates(self):
+        """Ensure Table.update() discards memoized responses."""
+        metabase = mock_metabase(handler=self.handler, coalesce=False)
+        table = Table(_using=metabase, id=1)
+        table.fields()
+
+        table.update(display_name="New Name")
+
+        self.assertIsNone(table._query_metadata)
+
+    def test_get_include(self):
+        """Ensure Table.get() loads included relationships with the Table."""
+        metabase = mock_metabase(handler=self.handler, coalesce=False)
+        table = Table.get(1, using=metabase, include=["fields", "metrics", "segments"])
+        requests = len(metabase.adapter.requests)
+
+        table.fields()
+        table.segments()
+
+        self.assertEqual(3, requests)
+        self.assertEqual(3, len(metabase.adapter.requests))
+
+        with self.assertRaises(ValueError):
+            Table.get(1, using=metabase, include=["tables"])
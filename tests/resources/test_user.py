@@ -24,6 +24,27 @@ class UserTests(IntegrationTestCase):
 
         self.assertIsNotNone(User(_using=None))
 
+    def test_iter(self):
+        """Ensure User.iter() pages through all Users."""
+        users = [
+            User.create(
+                first_name="Test",
+                last_name="Test",
+                email=f"{randint(2, 10000)}@example.com",
+                password="example123",
+                using=self.metabase,
+            )
+            for _ in range(3)
+        ]
+
+        ids = [user.id for user in User.iter(using=self.metabase, page_size=2)]
+        self.assertListEqual([user.id for user in User.list(using=self.metabase)], ids)
+        self.assertTrue(all(user.id in ids for user in users))
+
+        # teardown
+        for user in users:
+            user.delete()
+
     def test_list(self):
         """Ensure User.list() returns a list of Users, and supports filter parameters."""
         users = User.list(using=self.metabase)
@@ -0,0 +1,105 @@
+import asyncio
+import threading
+import time
+from unittest import TestCase
+
+from metabase.async_metabase import AsyncMetabase
+from metabase.resource import GetResource, ListResource, UpdateResource
+from tests.helpers import make_response, mock_metabase
+
+
+class Card(ListResource, GetResource, UpdateResource):
+    ENDPOINT = "/api/card"
+
+
+class AsyncMetabaseTests(TestCase):
+    def test_aget(self):
+        """Ensure AsyncMetabase.aget() returns the response of a GET request."""
+        metabase = mock_metabase(make_response(json={"id": 1}), cls=AsyncMetabase)
+        response = asyncio.run(metabase.aget("/api/card/1"))
+
+        self.assertEqual({"id": 1}, response.json())
+        self.assertEqual("GET", metabase.adapter.requests[0].method)
+
+    def test_max_concurrency(self):
+        """Ensure AsyncMetabase never has more than max_concurrency requests in flight."""
+        lock = threading.Lock()
+        in_flight = []
+        peak = []
+
+        def handler(request):
+            with lock:
+                in_flight.append(request)
+                peak.append(len(in_flight))
+            time.sleep(0.01)
+            with lock:
+                in_flight.remove(request)
+            return make_response(json={})
+
+        metabase = mock_metabase(handler=handler, cls=AsyncMetabase, max_concurrency=3)
+
+        async def main():
+            await asyncio.gather(*[metabase.aget(f"/api/card/{i}") for i in range(20)])
+
+        asyncio.run(main())
+        self.assertEqual(20, len(metabase.adapter.requests))
+        self.assertLessEqual(max(peak), 3)
+
+    def test_close(self):
+        """Ensure AsyncMetabase.close() stops the worker threads."""
+        metabase = mock_metabase(make_response(json={}), cls=AsyncMetabase)
+        asyncio.run(metabase.aget("/api/card/1"))
+
+        metabase.close()
+        self.assertIsNone(metabase._executor)
+
+
+class AsyncResourceTests(TestCase):
+    def test_aget(self):
+        """Ensure GetResource.aget() returns an instance."""
+        metabase = mock_metabase(
+            make_response(json={"id": 1, "name": "Card"}), cls=AsyncMetabase
+        )
+        card = asyncio.run(Card.aget(1, using=metabase))
+
+        self.assertIsInstance(card, Card)
+        self.assertEqual("Card", card.name)
+
+    def test_aiter(self):
+        """Ensure ListResource.aiter() can be used with async for."""
+        metabase = mock_metabase(
+            make_response(json=[{"id": 1}, {"id": 2}]), cls=AsyncMetabase
+        )
+
+        async def main():
+            return [card.id async for card in Card.aiter(using=metabase)]
+
+        self.assertListEqual([1, 2], asyncio.run(main()))
+
+    def test_aiter_lazy(self):
+        """Ensure ListResource.aiter() yields instances as they are iterated."""
+        produced = []
+
+        class LazyCard(Card):
+            @classmethod
+            def iter(cls, using):
+                for id in (1, 2, 3):
+                    produced.append(id)
+                    yield cls(_using=using, id=id)
+
+        metabase = mock_metabase(cls=AsyncMetabase)
+
+        async def main():
+            async for card in LazyCard.aiter(using=metabase):
+                return card.id, list(produced)
+
+        self.assertEqual((1, [1]), asyncio.run(main()))
+
+    def test_aupdate(self):
+        """Ensure UpdateResource.aupdate() updates the instance."""
+        metabase = mock_metabase(make_response(json={}), cls=AsyncMetabase)
+        card = Card(_using=metabase, id=1, name="Card")
+        asyncio.run(card.aupdate(name="New Card"))
+
+        self.assertEqual("New Card", card.name)
+        self.assertEqual("PUT", metabase.adapter.requests[0].method)
@@ -0,0 +1,223 @@
+import json
+import os
+import tempfile
+from unittest import TestCase
+from unittest.mock import patch
+
+from metabase.cache import (
+    CacheEntry,
+    DiskCacheBackend,
+    MemoryCacheBackend,
+    ResponseCache,
+)
+from tests.helpers import make_response, mock_metabase
+
+
+def entry(content: bytes = b"{}", expires_at: float = 0) -> CacheEntry:
+    return CacheEntry(
+        status_code=200,
+        headers={},
+        content=content,
+        url="",
+        encoding=None,
+        expires_at=expires_at,
+    )
+
+
+class MemoryCacheBackendTests(TestCase):
+    def test_lru(self):
+        """Ensure the least recently used entries are evicted above max_bytes."""
+        backend = MemoryCacheBackend(max_bytes=10)
+        backend.set("a", "1", entry(b"aaaa"))
+        backend.set("a", "2", entry(b"bbbb"))
+        backend.get("a", "1")
+        backend.set("a", "3", entry(b"cccc"))
+
+        self.assertIsNotNone(backend.get("a", "1"))
+        self.assertIsNone(backend.get("a", "2"))
+        self.assertIsNotNone(backend.get("a", "3"))
+
+    def test_clear(self):
+        """Ensure clear() only drops entries of the given namespace."""
+        backend = MemoryCacheBackend()
+        backend.set("a", "1", entry())
+        backend.set("b", "1", entry())
+        backend.clear("a")
+
+        self.assertIsNone(backend.get("a", "1"))
+        self.assertIsNotNone(backend.get("b", "1"))
+
+
+class DiskCacheBackendTests(TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def test_get_set_clear(self):
+        """Ensure DiskCacheBackend persists entries across instances."""
+        DiskCacheBackend(self.directory.name).set("a", "1", entry(b"[1]"))
+        backend = DiskCacheBackend(self.directory.name)
+        self.assertEqual(b"[1]", backend.get("a", "1").content)
+
+        backend.clear("a")
+        self.assertIsNone(backend.get("a", "1"))
+
+    def test_evict(self):
+        """Ensure DiskCacheBackend evicts entries above max_bytes."""
+        backend = DiskCacheBackend(self.directory.name, max_bytes=1)
+        backend.set("a", "1", entry())
+        self.assertIsNone(backend.get("a", "1"))
+
+    def test_json(self):
+        """Ensure DiskCacheBackend stores entries as JSON, and ignores other files."""
+        backend = DiskCacheBackend(self.directory.name)
+        backend.set("a", "1", entry(b"\x00\xff", expires_at=1e12))
+
+        with open(backend._path("a", "1")) as f:
+            self.assertEqual(200, json.load(f)["status_code"])
+        self.assertEqual(b"\x00\xff", backend.get("a", "1").content)
+
+        with open(backend._path("a", "2"), "wb") as f:
+            f.write(b"\x80\x04not json")
+        self.assertIsNone(backend.get("a", "2"))
+
+    def test_concurrent_removal(self):
+        """Ensure files removed by another process are ignored."""
+        backend = DiskCacheBackend(self.directory.name, max_bytes=1)
+        backend.set("a", "1", entry())
+        path = backend._path("a", "2")
+        open(path, "w").close()
+
+        remove = os.remove
+
+        def remove_twice(path):
+            remove(path)
+            remove(path)
+
+        with patch("metabase.cache.os.remove", side_effect=remove_twice):
+            backend.set("a", "3", entry())
+            backend.clear()
+
+
+class ResponseCacheTests(TestCase):
+    def test_ttl_for(self):
+        """Ensure ResponseCache.ttl_for() uses the first matching pattern, else the default TTL."""
+        cache = ResponseCache(ttl=10, ttls={"/api/table/*/query_metadata": 100})
+
+        self.assertEqual(100, cache.ttl_for("/api/table/1/query_metadata"))
+        self.assertEqual(10, cache.ttl_for("/api/table/1"))
+
+    def test_key(self):
+        """Ensure ResponseCache.key() does not depend on the order of params."""
+        self.assertEqual(
+            ResponseCache.key("/api/user", {"b": 1, "a": 2, "c": None}),
+            ResponseCache.key("/api/user", {"a": 2, "b": 1}),
+        )
+
+    def test_namespace(self):
+        self.assertEqual("/api/table", ResponseCache.namespace("/api/table/1/fks"))
+        self.assertNotEqual(
+            ResponseCache.namespace("/api/table", "http://a", "admin"),
+            ResponseCache.namespace("/api/table", "http://a", "viewer"),
+        )
+
+
+class MetabaseCacheTests(TestCase):
+    def test_cached(self):
+        """Ensure fresh responses are served from the cache."""
+        metabase = mock_metabase(
+            make_response(json={"id": 1}), cache=ResponseCache(ttl=60)
+        )
+
+        self.assertEqual({"id": 1}, metabase.get("/api/table/1").json())
+        self.assertEqual({"id": 1}, metabase.get("/api/table/1").json())
+        self.assertEqual(1, len(metabase.adapter.requests))
+
+    def test_revalidate(self):
+        """Ensure expired responses with an ETag are revalidated."""
+        metabase = mock_metabase(
+            make_response(json={"id": 1}, headers={"ETag": '"abc"'}),
+            make_response(304),
+            cache=ResponseCache(ttl=60),
+        )
+        metabase.get("/api/table/1")
+
+        with patch("metabase.cache.time.monotonic", return_value=1e12):
+            response = metabase.get("/api/table/1")
+
+        self.assertEqual(200, response.status_code)
+        self.assertEqual({"id": 1}, response.json())
+        self.assertEqual('"abc"', metabase.adapter.requests[1].headers["If-None-Match"])
+
+    def test_invalidate(self):
+        """Ensure writes invalidate cached responses of the same resource type."""
+        metabase = mock_metabase(
+            make_response(json={"name": "a"}),
+            make_response(json={}),
+            make_response(json={"name": "b"}),
+            cache=ResponseCache(ttl=60),
+        )
+        metabase.get("/api/table/1/query_metadata")
+        metabase.put("/api/table/1", json={"name": "b"})
+
+        self.assertEqual(
+            {"name": "b"}, metabase.get("/api/table/1/query_metadata").json()
+        )
+
+    def test_invalidate_embedding(self):
+        """Ensure writes invalidate the responses of resource types embedding them."""
+        metabase = mock_metabase(
+            make_response(json={"fields": [{"name": "a"}]}),
+            make_response(json={}),
+            make_response(json={"fields": [{"name": "b"}]}),
+            cache=ResponseCache(ttl=60),
+        )
+        metabase.get("/api/table/1/query_metadata")
+        metabase.put("/api/field/1", json={"name": "b"})
+
+        self.assertEqual(
+            {"fields": [{"name": "b"}]},
+            metabase.get("/api/table/1/query_metadata").json(),
+        )
+
+    def test_read_only_post(self):
+        """Ensure POST requests running queries do not invalidate cached responses."""
+        metabase = mock_metabase(
+            make_response(json={"id": 1}),
+            make_response(json={}),
+            make_response(json={}),
+            cache=ResponseCache(ttl=60),
+        )
+        metabase.get("/api/card/1")
+        metabase.post("/api/card/1/query/csv")
+        metabase.post("/api/dataset", json={})
+
+        self.assertEqual({"id": 1}, metabase.get("/api/card/1").json())
+        self.assertEqual(3, len(metabase.adapter.requests))
+
+    def test_scope(self):
+        """Ensure responses are not shared by clients of other hosts or users."""
+        cache = ResponseCache(ttl=60)
+        admin = mock_metabase(make_response(json={"id": 1}), cache=cache)
+        admin.get("/api/card/1")
+
+        for host, user in (("http://b.example.com", "user"), (admin.host, "viewer")):
+            other = mock_metabase(make_response(json={}), cache=cache)
+            other.host, other.user = host, user
+
+            self.assertEqual({}, other.get("/api/card/1").json())
+            self.assertEqual(1, len(other.adapter.requests))
+
+    def test_disabled(self):
+        """Ensure endpoints with a TTL of 0 are not cached."""
+        metabase = mock_metabase(
+            make_response(json={}),
+            make_response(json={}),
+            cache=ResponseCache(ttl=0),
+        )
+        metabase.get("/api/user/current")
+        metabase.get("/api/user/current")
+
+        self.assertEqual(2, len(metabase.adapter.requests))
@@ -0,0 +1,186 @@
+import os
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+from urllib.parse import urlparse
+
+from metabase.catalog import Catalog
+from metabase.exceptions import NotFoundError
+from metabase.resources.database import Database
+from metabase.resources.field import Field
+from metabase.resources.table import Table
+from tests.helpers import make_response, mock_metabase
+
+
+def metadata():
+    return {
+        "id": 1,
+        "name": "Sample Database",
+        "tables": [
+            {
+                "id": 1,
+                "schema": "PUBLIC",
+                "name": "ORDERS",
+                "updated_at": "2022-01-01T00:00:00Z",
+                "fields": [
+                    {"id": 1, "table_id": 1, "name": "ID"},
+                    {
+                        "id": 2,
+                        "table_id": 1,
+                        "name": "USER_ID",
+                        "fk_target_field_id": 3,
+                    },
+                ],
+                "metrics": [{"id": 1, "table_id": 1, "name": "Revenue"}],
+                "segments": [],
+            },
+            {
+                "id": 2,
+                "schema": "PUBLIC",
+                "name": "PEOPLE",
+                "updated_at": "2022-01-01T00:00:00Z",
+                "fields": [{"id": 3, "table_id": 2, "name": "ID"}],
+                "metrics": [],
+                "segments": [{"id": 1, "table_id": 2, "name": "Active"}],
+            },
+        ],
+    }
+
+
+class CatalogTests(TestCase):
+    def test_load(self):
+        """Ensure Catalog.load() builds the catalog from a single request."""
+        metabase = mock_metabase(make_response(json=metadata()))
+        catalog = Catalog.load(metabase, 1)
+
+        self.assertEqual(1, len(metabase.adapter.requests))
+        self.assertTrue(
+            metabase.adapter.requests[0].url.startswith(
+                "http://example.com/api/database/1/metadata"
+            )
+        )
+        self.assertIsInstance(catalog.database, Database)
+        self.assertEqual("Sample Database", catalog.database.name)
+        self.assertEqual({1, 2}, set(catalog.tables))
+        self.assertEqual({1, 2, 3}, set(catalog.fields))
+        self.assertEqual({1}, set(catalog.metrics))
+        self.assertEqual({1}, set(catalog.segments))
+
+    def test_load_not_found(self):
+        """Ensure Catalog.load() raises NotFoundError for missing databases."""
+        metabase = mock_metabase(make_response(404, content=b"Not found."))
+
+        with self.assertRaises(NotFoundError):
+            Catalog.load(metabase, 1)
+
+    def test_lookups(self):
+        """Ensure Tables and Fields can be found by name."""
+        catalog = Catalog.from_metadata(None, metadata())
+
+        table = catalog.table("PUBLIC", "ORDERS")
+        self.assertIsInstance(table, Table)
+        self.assertEqual(1, table.id)
+
+        field = catalog.field("PUBLIC", "PEOPLE", "ID")
+        self.assertIsInstance(field, Field)
+        self.assertEqual(3, field.id)
+
+        self.assertListEqual([1, 2], [f.id for f in catalog.table_fields(1)])
+        self.assertListEqual([1], [m.id for m in catalog.table_metrics(1)])
+        self.assertListEqual([1], [s.id for s in catalog.table_segments(2)])
+
+        with self.assertRaises(NotFoundError):
+            catalog.table("PUBLIC", "MISSING")
+        with self.assertRaises(NotFoundError):
+            catalog.field("PUBLIC", "ORDERS", "MISSING")
+
+    def test_foreign_keys(self):
+        """Ensure foreign keys are resolved to their destination Fields."""
+        catalog = Catalog.from_metadata(None, metadata())
+
+        self.assertListEqual(
+            [(2, 3)], [(a.id, b.id) for a, b in catalog.foreign_keys()]
+        )
+
+    def test_add_remove_table(self):
+        """Ensure Tables can be replaced and removed, along with their Fields."""
+        catalog = Catalog.from_metadata(None, metadata())
+
+        catalog.add_table(
+            {
+                "id": 1,
+                "schema": "PUBLIC",
+                "name": "ORDERS",
+                "fields": [{"id": 4, "table_id": 1, "name": "TOTAL"}],
+            }
+        )
+        self.assertEqual({3, 4}, set(catalog.fields))
+        self.assertEqual(4, catalog.field("PUBLIC", "ORDERS", "TOTAL").id)
+        self.assertEqual({}, catalog.metrics)
+
+        catalog.remove_table(2)
+        self.assertEqual({1}, set(catalog.tables))
+        self.assertEqual({4}, set(catalog.fields))
+        with self.assertRaises(NotFoundError):
+            catalog.table("PUBLIC", "PEOPLE")
+
+    def test_save_open(self):
+        """Ensure a catalog can be saved to a snapshot and opened again."""
+        catalog = Catalog.from_metadata(None, metadata())
+
+        with TemporaryDirectory() as directory:
+            path = os.path.join(directory, "catalog.db")
+            catalog.save(path)
+            catalog.save(path)
+            snapshot = Catalog.open(None, path)
+
+        self.assertEqual("Sample Database", snapshot.database.name)
+        self.assertEqual({1, 2}, set(snapshot.tables))
+        self.assertEqual({1, 2, 3}, set(snapshot.fields))
+        self.assertEqual(3, snapshot.field("PUBLIC", "PEOPLE", "ID").id)
+        self.assertEqual({1}, set(snapshot.metrics))
+        self.assertEqual({1}, set(snapshot.segments))
+
+        with self.assertRaises(FileNotFoundError):
+            Catalog.open(None, path)
+
+    def test_refresh(self):
+        """Ensure Catalog.refresh() only reloads Tables whose updated_at changed."""
+
+        def handler(request):
+            path = urlparse(request.url).path
+            if path == "/api/database/1":
+                return make_response(
+                    json={
+                        "id": 1,
+                        "name": "Renamed",
+                        "tables": [
+                            {"id": 1, "updated_at": "2022-01-01T00:00:00Z"},
+                            {"id": 3, "updated_at": "2022-01-02T00:00:00Z"},
+                        ],
+                    }
+                )
+            if path == "/api/table/3/query_metadata":
+                self.assertEqual(
+                    "include_hidden_fields=true&include_sensitive_fields=true",
+                    urlparse(request.url).query,
+                )
+                return make_response(
+                    json={
+                        "id": 3,
+                        "schema": "PUBLIC",
+                        "name": "PRODUCTS",
+                        "updated_at": "2022-01-02T00:00:00Z",
+                        "fields": [{"id": 5, "table_id": 3, "name": "ID"}],
+                    }
+                )
+            return make_response(404)
+
+        metabase = mock_metabase(handler=handler)
+        catalog = Catalog.from_metadata(metabase, metadata())
+
+        self.assertListEqual([2, 3], catalog.refresh())
+        self.assertEqual(2, len(metabase.adapter.requests))
+        self.assertEqual("Renamed", catalog.database.name)
+        self.assertEqual({1, 3}, set(catalog.tables))
+        self.assertEqual({1, 2, 5}, set(catalog.fields))
+        self.assertEqual(5, catalog.field("PUBLIC", "PRODUCTS", "ID").id)
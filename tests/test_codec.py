@@ -0,0 +1,44 @@
+import json
+from unittest import TestCase
+
+from metabase.codec import OrjsonCodec, StdlibCodec, default_codec, orjson
+
+PAYLOAD = {
+    "name": "Card",
+    "dataset_query": {"database": 1, "type": "query", "query": {"source-table": 2}},
+    "rows": [[1, "é", 1.5, None, True]],
+}
+
+
+class CodecTests(TestCase):
+    def test_stdlib(self):
+        """Ensure StdlibCodec round-trips payloads."""
+        codec = StdlibCodec()
+        data = codec.dumps(PAYLOAD)
+
+        self.assertIsInstance(data, bytes)
+        self.assertEqual(PAYLOAD, json.loads(data))
+        self.assertEqual(PAYLOAD, codec.loads(data))
+        self.assertEqual(PAYLOAD, codec.loads(data.decode()))
+
+        with self.assertRaises(ValueError):
+            codec.dumps(float("nan"))
+
+    def test_orjson(self):
+        """Ensure OrjsonCodec round-trips payloads, or fails to initialize without orjson."""
+        if orjson is None:
+            with self.assertRaises(ImportError):
+                OrjsonCodec()
+            return
+
+        codec = OrjsonCodec()
+        data = codec.dumps(PAYLOAD)
+
+        self.assertEqual(PAYLOAD, json.loads(data))
+        self.assertEqual(PAYLOAD, codec.loads(data))
+        self.assertEqual({"1": 1}, codec.loads(codec.dumps({1: 1})))
+
+    def test_default_codec(self):
+        """Ensure default_codec() prefers orjson when installed."""
+        expected = StdlibCodec if orjson is None else OrjsonCodec
+        self.assertIsInstance(default_codec(), expected)
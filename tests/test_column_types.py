@@ -0,0 +1,155 @@
+from unittest import TestCase, skipUnless
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+except ImportError:  # pragma: no cover
+    pa = None
+
+from metabase.column_types import (
+    arrow_type,
+    column_kind,
+    to_arrow_array,
+    to_pandas_array,
+)
+
+
+class ColumnTypesTests(TestCase):
+    def test_column_kind(self):
+        """Ensure columns are classified by effective type, then base type."""
+        self.assertEqual("integer", column_kind({"base_type": "type/Integer"}))
+        self.assertEqual("float", column_kind({"base_type": "type/Decimal"}))
+        self.assertEqual("text", column_kind({"base_type": "type/Text"}))
+        self.assertEqual("other", column_kind({"base_type": "type/JSON"}))
+        self.assertEqual(
+            "datetime",
+            column_kind(
+                {"base_type": "type/Integer", "effective_type": "type/Instant"}
+            ),
+        )
+
+    def test_integer(self):
+        """Ensure integers are int64, or nullable Int64 if there are nulls."""
+        col = {"base_type": "type/Integer"}
+
+        self.assertEqual("int64", to_pandas_array([1, 2], col).dtype)
+        self.assertEqual("Int64", to_pandas_array([1, None], col).dtype)
+
+        # values that are not integers are not truncated
+        self.assertEqual(object, to_pandas_array([1.5], col).dtype)
+
+    def test_boolean(self):
+        """Ensure booleans are bool, or nullable boolean if there are nulls."""
+        col = {"base_type": "type/Boolean"}
+
+        self.assertEqual("bool", to_pandas_array([True, False], col).dtype)
+        self.assertEqual("boolean", to_pandas_array([True, None], col).dtype)
+
+    def test_datetime(self):
+        """Ensure temporals are timezone-aware datetimes."""
+        col = {"base_type": "type/DateTime"}
+
+        array = to_pandas_array(
+            ["2022-01-01T00:00:00+01:00", "2022-06-01T00:00:00+02:00", None],
+            col,
+            "Europe/Paris",
+        )
+        self.assertEqual("datetime64[ns, Europe/Paris]", array.dtype)
+        self.assertEqual(pd.Timestamp("2022-06-01", tz="Europe/Paris"), array[1])
+        self.assertTrue(pd.isna(array[2]))
+
+        # values without offset are in the timezone of the results
+        array = to_pandas_array(["2022-01-01"], col, "Europe/Paris")
+        self.assertEqual(pd.Timestamp("2022-01-01", tz="Europe/Paris"), array[0])
+
+        self.assertEqual(object, to_pandas_array(["not a date"], col).dtype)
+
+    def test_float(self):
+        """Ensure floats are float64, with NaN for nulls."""
+        array = to_pandas_array([1, None], {"base_type": "type/Float"})
+
+        self.assertEqual("float64", array.dtype)
+        self.assertTrue(np.isnan(array[1]))
+
+    def test_categorical(self):
+        """Ensure low-cardinality categorical columns become pandas Categoricals."""
+        values = ["a", "b", "a", "a", None, "b"]
+
+        for col in [
+            {"base_type": "type/Text", "source": "breakout"},
+            {"base_type": "type/Text", "semantic_type": "type/Category"},
+            {"base_type": "type/Text", "has_field_values": "list"},
+        ]:
+            array = to_pandas_array(values, col, categorical_threshold=0.5)
+            self.assertIsInstance(array, pd.Categorical)
+            self.assertListEqual(["a", "b"], array.categories.tolist())
+
+        # not a category, too many distinct values, or not requested
+        col = {"base_type": "type/Text", "source": "breakout"}
+        self.assertEqual(
+            object,
+            to_pandas_array(values, {"base_type": "type/Text"}, None, 0.5).dtype,
+        )
+        self.assertEqual(object, to_pandas_array(values, col, None, 0.1).dtype)
+        self.assertEqual(object, to_pandas_array(values, col).dtype)
+
+    @skipUnless(pa, "requires pyarrow")
+    def test_arrow_type(self):
+        """Ensure arrow_type() returns the types given by the metadata of columns."""
+        self.assertEqual(pa.float64(), arrow_type({"base_type": "type/Float"}))
+        self.assertEqual(
+            pa.timestamp("us", tz="Europe/Paris"),
+            arrow_type({"base_type": "type/DateTime"}, "Europe/Paris"),
+        )
+        self.assertIsNone(arrow_type({"base_type": "type/Integer"}))
+        self.assertIsNone(arrow_type({"base_type": "type/Time"}))
+
+    @skipUnless(pa, "requires pyarrow")
+    def test_to_arrow_array(self):
+        """Ensure values are converted to typed Arrow arrays."""
+        self.assertEqual(
+            pa.int64(), to_arrow_array([1, None], {"base_type": "type/Integer"}).type
+        )
+        self.assertEqual(
+            pa.float64(), to_arrow_array([1.5], {"base_type": "type/Integer"}).type
+        )
+        self.assertEqual(
+            pa.string(), to_arrow_array([[1], "a"], {"base_type": "type/JSON"}).type
+        )
+
+        array = to_arrow_array(
+            ["2022-01-01T00:00:00+01:00", None],
+            {"base_type": "type/DateTime"},
+            "Europe/Paris",
+        )
+        self.assertEqual(pa.timestamp("us", tz="Europe/Paris"), array.type)
+        self.assertEqual(
+            pd.Timestamp("2022-01-01", tz="Europe/Paris"),
+            pd.Timestamp(array[0].as_py()),
+        )
+
+        array = to_arrow_array(
+            ["2022-01-01"], {"base_type": "type/Date"}, "Europe/Paris"
+        )
+        self.assertEqual(
+            pd.Timestamp("2022-01-01", tz="Europe/Paris"),
+            pd.Timestamp(array[0].as_py()),
+        )
+
+        # values with an offset are in UTC, those without in the results timezone
+        array = to_arrow_array(
+            ["2022-01-01T00:00:00Z", "2022-01-01T00:00:00", None],
+            {"base_type": "type/DateTime"},
+            "Europe/Paris",
+        )
+        self.assertEqual(pa.timestamp("us", tz="Europe/Paris"), array.type)
+        self.assertListEqual(
+            [
+                pd.Timestamp("2022-01-01T01:00:00", tz="Europe/Paris"),
+                pd.Timestamp("2022-01-01T00:00:00", tz="Europe/Paris"),
+                None,
+            ],
+            [None if v is None else pd.Timestamp(v) for v in array.to_pylist()],
+        )
@@ -0,0 +1,130 @@
+import threading
+import time
+from unittest import TestCase
+from unittest.mock import patch
+
+import requests
+
+from metabase.concurrency import AdaptiveConcurrency
+from metabase.resource import DeleteResource, GetResource, UpdateResource
+from tests.helpers import make_response, mock_metabase
+
+
+class AdaptiveConcurrencyTests(TestCase):
+    def test_increase(self):
+        """Ensure the limit grows additively while latency stays flat."""
+        controller = AdaptiveConcurrency(initial=2, maximum=3)
+        for _ in range(3):
+            controller.record(0.1, make_response(200))
+        self.assertEqual(3, int(controller.limit))
+
+        for _ in range(10):
+            controller.record(0.1, make_response(200))
+        self.assertEqual(3, controller.limit)
+
+    def test_latency(self):
+        """Ensure the limit does not grow while latency is above its baseline."""
+        controller = AdaptiveConcurrency(initial=2, latency_tolerance=2)
+        controller.record(0.1, make_response(200))
+        limit = controller.limit
+
+        for _ in range(5):
+            controller.record(1.0, make_response(200))
+        self.assertEqual(limit, controller.limit)
+
+    def test_decrease(self):
+        """Ensure the limit backs off multiplicatively on overload, once per round-trip."""
+        controller = AdaptiveConcurrency(initial=16, backoff=0.5, minimum=2)
+        controller.record(10, make_response(200))
+
+        with patch("metabase.concurrency.time.monotonic", return_value=100):
+            controller.record(1, make_response(503))
+            controller.record(1, error=requests.Timeout())
+        self.assertEqual(8, int(controller.limit))
+
+        with patch("metabase.concurrency.time.monotonic", return_value=200):
+            controller.record(1, make_response(429))
+        self.assertEqual(4, int(controller.limit))
+
+        for t in (300, 400, 500):
+            with patch("metabase.concurrency.time.monotonic", return_value=t):
+                controller.record(1, error=requests.ConnectionError())
+        self.assertEqual(2, controller.limit)
+
+    def test_map(self):
+        """Ensure AdaptiveConcurrency.map() returns results in order within the limit."""
+        controller = AdaptiveConcurrency(initial=3)
+        lock = threading.Lock()
+        peak = []
+
+        def square(i):
+            with lock:
+                peak.append(controller.in_flight)
+            time.sleep(0.001 * (10 - i))
+            return i * i
+
+        self.assertEqual([i * i for i in range(10)], controller.map(square, range(10)))
+        self.assertLessEqual(max(peak), 3)
+        self.assertEqual(0, controller.in_flight)
+
+    def test_map_error(self):
+        """Ensure AdaptiveConcurrency.map() raises the first error."""
+        controller = AdaptiveConcurrency()
+
+        def fail(i):
+            raise ValueError(i)
+
+        with self.assertRaises(ValueError):
+            controller.map(fail, range(3))
+        self.assertEqual(0, controller.in_flight)
+
+
+class Card(GetResource, UpdateResource, DeleteResource):
+    ENDPOINT = "/api/card"
+
+
+class BulkResourceTests(TestCase):
+    def test_update_many(self):
+        """Ensure UpdateResource.update_many() updates every instance."""
+        metabase = mock_metabase(handler=lambda request: make_response(json={}))
+        cards = [Card(_using=metabase, id=i) for i in range(5)]
+        Card.update_many(cards, archived=True)
+
+        self.assertTrue(all(card.archived for card in cards))
+        self.assertEqual(
+            sorted(f"http://example.com/api/card/{i}" for i in range(5)),
+            sorted(request.url for request in metabase.adapter.requests),
+        )
+
+    def test_delete_many(self):
+        """Ensure DeleteResource.delete_many() deletes every instance."""
+        metabase = mock_metabase(handler=lambda request: make_response(204))
+        Card.delete_many([Card(_using=metabase, id=i) for i in range(5)])
+
+        self.assertEqual(5, len(metabase.adapter.requests))
+        self.assertTrue(all(r.method == "DELETE" for r in metabase.adapter.requests))
+
+    def test_nested_map(self):
+        """Ensure bulk methods can be called from Metabase.map() without deadlocking."""
+        metabase = mock_metabase(
+            handler=lambda request: make_response(
+                json={"id": int(request.url.rsplit("/", 1)[1])}
+            ),
+            concurrency=AdaptiveConcurrency(initial=2, maximum=2),
+        )
+        batches = [[1, 2], [3, 4], [5, 6], [7, 8], [9, 10]]
+        results = []
+
+        # run in a thread, so that a deadlock fails the test rather than hanging it
+        thread = threading.Thread(
+            target=lambda: results.extend(
+                metabase.map(lambda ids: Card.get_many(ids, using=metabase), batches)
+            ),
+            daemon=True,
+        )
+        thread.start()
+        thread.join(timeout=5)
+
+        self.assertFalse(thread.is_alive())
+        self.assertEqual([[card.id for card in cards] for cards in results], batches)
+        self.assertEqual(0, metabase.concurrency.in_flight)
@@ -0,0 +1,94 @@
+import json
+from unittest import TestCase
+
+from metabase.catalog import Catalog
+from metabase.drift import SchemaSnapshot, TableSnapshot
+
+
+def metadata(tables):
+    return {
+        "id": 1,
+        "tables": [
+            {
+                "id": id,
+                "schema": "PUBLIC",
+                "name": name,
+                "fields": [
+                    {"id": i, "name": field, "base_type": base_type}
+                    for i, (field, base_type) in enumerate(fields.items())
+                ],
+            }
+            for id, (name, fields) in tables.items()
+        ],
+    }
+
+
+TABLES = {
+    1: ("ORDERS", {"ID": "type/Integer", "TOTAL": "type/Float"}),
+    2: ("PEOPLE", {"ID": "type/Integer", "NAME": "type/Text"}),
+}
+
+
+def snapshot(tables):
+    return SchemaSnapshot.from_catalog(Catalog.from_metadata(None, metadata(tables)))
+
+
+class SchemaSnapshotTests(TestCase):
+    def test_unchanged(self):
+        """Ensure identical schemas have the same hash and an empty diff."""
+        self.assertEqual(snapshot(TABLES), snapshot(TABLES))
+        self.assertFalse(snapshot(TABLES).diff(snapshot(TABLES)))
+
+    def test_diff(self):
+        """Ensure added, removed and retyped fields and tables are reported."""
+        new = {
+            1: ("ORDERS", {"ID": "type/BigInteger", "QUANTITY": "type/Integer"}),
+            3: ("PRODUCTS", {"ID": "type/Integer"}),
+        }
+        diff = snapshot(TABLES).diff(snapshot(new))
+
+        self.assertTrue(diff)
+        self.assertListEqual([3], [t.id for t in diff.added_tables])
+        self.assertListEqual([2], [t.id for t in diff.removed_tables])
+        self.assertListEqual(["QUANTITY"], [c.name for c in diff.added_fields])
+        self.assertListEqual(["TOTAL"], [c.name for c in diff.removed_fields])
+
+        self.assertEqual(1, len(diff.retyped_fields))
+        retyped = diff.retyped_fields[0]
+        self.assertEqual(("ORDERS", "ID"), (retyped.table.name, retyped.name))
+        self.assertEqual("type/Integer", retyped.old_type[1])
+        self.assertEqual("type/BigInteger", retyped.new_type[1])
+
+        self.assertListEqual([1, 2, 3], diff.tables)
+
+    def test_rename(self):
+        """Ensure tables renamed or moved to another schema are reported."""
+        new = {1: ("SALES", TABLES[1][1]), 2: TABLES[2]}
+        diff = snapshot(TABLES).diff(snapshot(new))
+
+        self.assertTrue(diff)
+        self.assertEqual(1, len(diff.renamed_tables))
+        rename = diff.renamed_tables[0]
+        self.assertEqual(("ORDERS", "SALES"), (rename.old.name, rename.new.name))
+        self.assertFalse(diff.added_fields or diff.removed_fields)
+        self.assertListEqual([1], diff.tables)
+
+        moved = SchemaSnapshot.from_dict(snapshot(TABLES).to_dict())
+        table = moved.tables[2]
+        moved = SchemaSnapshot(
+            {
+                **moved.tables,
+                2: TableSnapshot.create(2, "OTHER", table.name, table.fields),
+            }
+        )
+        diff = snapshot(TABLES).diff(moved)
+        self.assertEqual("OTHER", diff.renamed_tables[0].new.schema)
+        self.assertListEqual([2], diff.tables)
+
+    def test_to_dict(self):
+        """Ensure snapshots can be serialized to JSON and loaded back."""
+        old = snapshot(TABLES)
+        new = SchemaSnapshot.from_dict(json.loads(json.dumps(old.to_dict())))
+
+        self.assertEqual(old, new)
+        self.assertFalse(old.diff(new))
@@ -0,0 +1,55 @@
+import gc
+import pickle
+from unittest import TestCase
+
+from metabase.identity import IdentityMap
+from metabase.resource import Resource
+from metabase.resources.field import Field
+
+
+class IdentityMapTests(TestCase):
+    def test_load(self):
+        """Ensure instances are created once per class and primary key."""
+        identity_map = IdentityMap()
+        field = identity_map.load(Field, {"id": 1}, lambda: Field(_using=None, id=1))
+
+        self.assertIs(field, identity_map.get(Field, 1))
+        self.assertIs(
+            field, identity_map.load(Field, {"id": 1, "name": "a"}, lambda: None)
+        )
+        self.assertEqual("a", field.name)
+
+        resource = identity_map.load(
+            Resource, {"id": 1}, lambda: Resource(_using=None, id=1)
+        )
+        self.assertIsNot(field, resource)
+        self.assertEqual(2, len(identity_map))
+
+    def test_weak_references(self):
+        """Ensure instances are forgotten once they are no longer referenced."""
+        identity_map = IdentityMap()
+        field = identity_map.load(Field, {"id": 1}, lambda: Field(_using=None, id=1))
+
+        del field
+        gc.collect()
+        self.assertIsNone(identity_map.get(Field, 1))
+
+    def test_discard(self):
+        """Ensure discarded instances are no longer mapped."""
+        identity_map = IdentityMap()
+        field = identity_map.load(Field, {"id": 1}, lambda: Field(_using=None, id=1))
+
+        identity_map.discard(Field(_using=None, id=1))
+        self.assertIs(field, identity_map.get(Field, 1))
+
+        identity_map.discard(field)
+        self.assertIsNone(identity_map.get(Field, 1))
+
+    def test_pickle(self):
+        """Ensure an identity map can be pickled, without its instances."""
+        identity_map = IdentityMap()
+        field = identity_map.load(Field, {"id": 1}, lambda: Field(_using=None, id=1))
+
+        copy = pickle.loads(pickle.dumps(identity_map))
+        self.assertEqual(0, len(copy))
+        self.assertIsNotNone(field)
@@ -0,0 +1,33 @@
+import os
+import subprocess
+import sys
+from unittest import TestCase
+
+import metabase
+
+
+class InitTests(TestCase):
+    def test_exports(self):
+        """Ensure every name in metabase.__all__ can be imported."""
+        for name in metabase.__all__:
+            self.assertIsNotNone(getattr(metabase, name))
+
+    def test_missing(self):
+        """Ensure accessing an unknown name raises AttributeError."""
+        with self.assertRaises(AttributeError):
+            metabase.Unknown
+
+    def test_lazy(self):
+        """Ensure importing metabase does not import its resources nor pandas."""
+        code = (
+            "import sys, metabase; "
+            "from metabase import User, PermissionGroup; "
+            "assert 'pandas' not in sys.modules; "
+            "assert 'metabase.resources.dataset' not in sys.modules; "
+            "from metabase import Dataset; "
+            "assert 'pandas' not in sys.modules"
+        )
+        subprocess.check_call(
+            [sys.executable, "-c", code],
+            env={**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)},
+        )
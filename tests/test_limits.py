@@ -0,0 +1,73 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest import TestCase
+from unittest.mock import patch
+
+from metabase.limits import Limit, RateLimiter, TokenBucket
+from tests.helpers import make_response, mock_metabase
+
+
+class TokenBucketTests(TestCase):
+    @patch("metabase.limits.time.sleep")
+    @patch("metabase.limits.time.monotonic", return_value=0)
+    def test_acquire(self, monotonic, sleep):
+        """Ensure TokenBucket allows bursts, then waits for tokens at the given rate."""
+        bucket = TokenBucket(rate=2, burst=2)
+        bucket.acquire()
+        bucket.acquire()
+        self.assertFalse(sleep.called)
+
+        bucket.acquire()
+        sleep.assert_called_with(0.5)
+        bucket.acquire()
+        sleep.assert_called_with(1.0)
+
+
+class LimitTests(TestCase):
+    def test_max_in_flight(self):
+        """Ensure Limit never lets more than max_in_flight callers in at once."""
+        limit = Limit(max_in_flight=2)
+        lock = threading.Lock()
+        in_flight = []
+        peak = []
+
+        def work(i):
+            with limit.acquire():
+                with lock:
+                    in_flight.append(i)
+                    peak.append(len(in_flight))
+                time.sleep(0.01)
+                with lock:
+                    in_flight.remove(i)
+
+        with ThreadPoolExecutor(8) as executor:
+            list(executor.map(work, range(16)))
+
+        self.assertEqual(2, max(peak))
+
+
+class RateLimiterTests(TestCase):
+    def test_limits_for(self):
+        """Ensure the first matching group applies, along with the global limit."""
+        default, dataset, fields = Limit(rate=10), Limit(rate=1), Limit(rate=2)
+        limiter = RateLimiter(
+            default, groups={"POST /api/dataset*": dataset, "/api/field/*": fields}
+        )
+
+        self.assertEqual([dataset, default], limiter.limits_for("POST", "/api/dataset"))
+        self.assertEqual([default], limiter.limits_for("GET", "/api/dataset"))
+        self.assertEqual([fields, default], limiter.limits_for("PUT", "/api/field/1"))
+        self.assertEqual([default], limiter.limits_for("GET", "/api/card/1"))
+
+    def test_metabase(self):
+        """Ensure Metabase acquires the limits of every request it sends."""
+        limit = Limit(max_in_flight=1)
+        metabase = mock_metabase(
+            make_response(json={}), rate_limiter=RateLimiter(groups={"/api/*": limit})
+        )
+
+        with patch.object(limit, "acquire", wraps=limit.acquire) as acquire:
+            metabase.get("/api/card/1")
+
+        self.assertTrue(acquire.called)
@@ -1,8 +1,23 @@
+import pickle
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from unittest import TestCase
+from unittest.mock import patch
 
+import requests
+
+from metabase.cache import DiskCacheBackend, ResponseCache
+from metabase.codec import StdlibCodec
 from metabase.exceptions import AuthenticationError
+from metabase.identity import IdentityMap
+from metabase.limits import Limit, RateLimiter
 from metabase.metabase import Metabase
-from tests.helpers import IntegrationTestCase
+from metabase.metrics import MetricsRegistry
+from metabase.retry import CircuitBreaker, Retry
+from metabase.token_store import FileTokenStore, MemoryTokenStore
+from tests.helpers import IntegrationTestCase, make_response, mock_metabase
 
 
 class MetabaseTests(TestCase):
@@ -21,7 +36,64 @@ class MetabaseTests(TestCase):
         metabase = Metabase(host="example.com", user="", password="", token="123")
         self.assertEqual(metabase.token, "123")
 
-        # TODO: add test case when token is None
+        metabase = mock_metabase(make_response(json={"id": "456"}), token=None)
+        self.assertEqual(metabase.token, "456")
+        self.assertEqual(metabase.token, "456")
+        self.assertEqual(1, len(metabase.adapter.requests))
+
+    def test_token_store(self):
+        """Ensure Metabase.token is read from and saved to the token store."""
+        store = MemoryTokenStore()
+        metabase = mock_metabase(
+            make_response(json={"id": "456"}), token=None, token_store=store
+        )
+        self.assertEqual("456", metabase.token)
+        self.assertEqual("456", store.get("user@http://example.com"))
+
+        # another instance reuses the stored token without logging in
+        metabase = mock_metabase(token=None, token_store=store)
+        self.assertEqual("456", metabase.token)
+        self.assertEqual(0, len(metabase.adapter.requests))
+
+    def test_token_expired(self):
+        """Ensure requests are retried once with a new token after a 401."""
+        store = MemoryTokenStore()
+        store.set("user@http://example.com", "expired")
+        metabase = mock_metabase(
+            make_response(401),
+            make_response(json={"id": "456"}),
+            make_response(json={}),
+            token=None,
+            token_store=store,
+        )
+
+        response = metabase.get("/api/user/current")
+        self.assertEqual(200, response.status_code)
+        self.assertEqual("456", store.get("user@http://example.com"))
+
+        requests = metabase.adapter.requests
+        self.assertEqual("expired", requests[0].headers["X-Metabase-Session"])
+        self.assertEqual("http://example.com/api/session", requests[1].url)
+        self.assertEqual("456", requests[2].headers["X-Metabase-Session"])
+
+    def test_token_concurrent_login(self):
+        """Ensure concurrent threads share a single login."""
+        lock = threading.Lock()
+        logins = []
+
+        def handler(request):
+            if request.url.endswith("/api/session"):
+                with lock:
+                    logins.append(request)
+                time.sleep(0.05)
+                return make_response(json={"id": "456"})
+            return make_response(json={})
+
+        metabase = mock_metabase(handler=handler, token=None)
+        with ThreadPoolExecutor(8) as executor:
+            list(executor.map(lambda _: metabase.get("/api/user/current"), range(8)))
+
+        self.assertEqual(1, len(logins))
 
     def test_token_invalid_auth(self):
         """Ensure Metabase.token raises AuthenticationException is the user or password is invalid."""
@@ -35,6 +107,118 @@ class MetabaseTests(TestCase):
         metabase = Metabase(host="example.com", user="", password="", token="123")
         self.assertDictEqual(metabase.headers, {"X-Metabase-Session": "123"})
 
+    def test_session(self):
+        """Ensure Metabase.session is created once and reused across requests."""
+        metabase = Metabase(host="example.com", user="", password="", pool_maxsize=25)
+        session = metabase.session
+
+        self.assertIs(session, metabase.session)
+        self.assertEqual(25, session.get_adapter("https://example.com")._pool_maxsize)
+
+    def test_session_after_fork(self):
+        """Ensure Metabase.session is recreated in a forked process."""
+        metabase = Metabase(host="example.com", user="", password="")
+        session = metabase.session
+
+        with patch("metabase.metabase.os.getpid", return_value=-1):
+            self.assertIsNot(session, metabase.session)
+
+    def test_pickle(self):
+        """Ensure Metabase can be pickled, along with all of its components."""
+        metabase = Metabase(host="example.com", user="user", password="", token="123")
+        metabase.session
+
+        copy = pickle.loads(pickle.dumps(metabase))
+        self.assertEqual("123", copy._token)
+        self.assertIsNone(copy._session)
+
+        with tempfile.TemporaryDirectory() as directory:
+            for cache, token_store in (
+                (ResponseCache(), MemoryTokenStore()),
+                (
+                    ResponseCache(backend=DiskCacheBackend(directory)),
+                    FileTokenStore(directory + "/tokens.json"),
+                ),
+            ):
+                metabase = Metabase(
+                    host="example.com",
+                    user="user",
+                    password="",
+                    token_store=token_store,
+                    cache=cache,
+                    metrics=MetricsRegistry(),
+                    retry=Retry(),
+                    circuit_breaker=CircuitBreaker(),
+                    rate_limiter=RateLimiter(Limit(rate=10, max_in_flight=2)),
+                    identity_map=IdentityMap(),
+                )
+                metabase.concurrency.acquire()
+
+                copy = pickle.loads(pickle.dumps(metabase))
+                self.assertEqual(0, copy.concurrency.in_flight)
+                with copy.rate_limiter.acquire("GET", "/api/card"):
+                    copy.metrics.observe("GET", "/api/card", 200, 0.1)
+                copy.circuit_breaker.before_request()
+                copy.token_store.set("key", "token")
+
+    def test_concurrency_pool_maxsize(self):
+        """Ensure the default concurrency never exceeds the connections kept in the pool."""
+        metabase = Metabase(host="example.com", user="", password="", pool_maxsize=3)
+        self.assertEqual(3, metabase.concurrency.maximum)
+        self.assertEqual(3, metabase.concurrency.limit)
+
+    def test_keep_alive(self):
+        """Ensure connections are closed after each request if keep_alive is False."""
+        metabase = Metabase(host="example.com", user="", password="", keep_alive=False)
+        self.assertEqual("close", metabase.session.headers["Connection"])
+
+    def test_close(self):
+        """Ensure Metabase.close() discards the session and its pooled connections."""
+        with Metabase(host="example.com", user="", password="") as metabase:
+            session = metabase.session
+
+        self.assertIsNone(metabase._session)
+        self.assertIsNot(session, metabase.session)
+
+    def test_request(self):
+        """Ensure Metabase.request() sends the session header through the pooled session."""
+        metabase = mock_metabase(make_response(200, json={"id": 1}))
+        response = metabase.request("GET", "/api/user/1", headers={"A": "a"})
+
+        self.assertEqual({"id": 1}, response.json())
+        request = metabase.adapter.requests[0]
+        self.assertEqual("http://example.com/api/user/1", request.url)
+        self.assertEqual("123", request.headers["X-Metabase-Session"])
+        self.assertEqual("a", request.headers["A"])
+
+    def test_request_codec(self):
+        """Ensure Metabase.request() encodes JSON bodies with the codec of the instance."""
+        metabase = mock_metabase(make_response(json={"id": 1}), codec=StdlibCodec())
+        response = metabase.post("/api/card", json={"name": "test"})
+
+        self.assertEqual({"id": 1}, metabase.decode(response))
+        request = metabase.adapter.requests[0]
+        self.assertEqual(b'{"name":"test"}', request.body)
+        self.assertEqual("application/json", request.headers["Content-Type"])
+
+    def test_map(self):
+        """Ensure Metabase.map() returns results in order, with errors in place of failed items."""
+
+        def handler(request):
+            if request.url.endswith("/2"):
+                return requests.ConnectionError()
+            return make_response(json={"url": request.url})
+
+        metabase = mock_metabase(handler=handler)
+        results = metabase.map(metabase.get, [f"/api/card/{i}" for i in range(4)])
+
+        self.assertEqual("http://example.com/api/card/0", results[0].json()["url"])
+        self.assertIsInstance(results[2], requests.ConnectionError)
+        self.assertEqual("http://example.com/api/card/3", results[3].json()["url"])
+
+        with self.assertRaises(requests.ConnectionError):
+            metabase.map(metabase.get, ["/api/card/2"], return_exceptions=False)
+
     def test_get(self):
         # TODO
         pass
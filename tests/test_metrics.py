@@ -0,0 +1,100 @@
+from unittest import TestCase
+
+import requests
+
+from metabase.metrics import EndpointStats, MetricsRegistry, normalize_endpoint
+from tests.helpers import make_response, mock_metabase
+
+
+class NormalizeEndpointTests(TestCase):
+    def test_normalize_endpoint(self):
+        """Ensure IDs and UUIDs are replaced by a placeholder."""
+        test_matrix = [
+            ("/api/card", "/api/card"),
+            ("/api/card/1", "/api/card/{id}"),
+            ("/api/table/12/query_metadata", "/api/table/{id}/query_metadata"),
+            ("/api/database/1/schema/public", "/api/database/{id}/schema/public"),
+            (
+                "/api/public/card/0b1f4a8c-3c1e-4bd2-9b7e-0f5b5a1b2c3d/query",
+                "/api/public/card/{id}/query",
+            ),
+            ("/api/user?limit=1", "/api/user"),
+        ]
+
+        for endpoint, expected in test_matrix:
+            self.assertEqual(expected, normalize_endpoint(endpoint))
+
+
+class EndpointStatsTests(TestCase):
+    def test_quantile(self):
+        """Ensure EndpointStats.quantile() interpolates within histogram buckets."""
+        stats = EndpointStats(buckets=(1, 2))
+        for latency in (0.5, 1.5, 1.5, 1.5):
+            stats.observe(latency, 0, 0, 0, False)
+
+        self.assertEqual([1, 3, 0], stats.bucket_counts)
+        self.assertEqual(1.0, stats.quantile(0.25))
+        self.assertEqual(2.0, stats.quantile(1))
+        self.assertEqual(1.25, stats.latency_mean)
+
+
+class MetricsRegistryTests(TestCase):
+    def test_observe(self):
+        """Ensure requests are grouped by method, normalized endpoint and status."""
+        registry = MetricsRegistry()
+        registry.observe("GET", "/api/card/1", 200, 0.1, response_bytes=10)
+        registry.observe("GET", "/api/card/2", 200, 0.3, response_bytes=20)
+        registry.observe("GET", "/api/card/3", None, 1.0)
+
+        summary = registry.summary()
+        self.assertEqual(2, len(summary))
+        self.assertEqual("error", summary[0]["status"])
+        self.assertEqual(1, summary[0]["errors"])
+        self.assertEqual("/api/card/{id}", summary[1]["endpoint"])
+        self.assertEqual(2, summary[1]["count"])
+        self.assertEqual(30, summary[1]["response_bytes"])
+
+    def test_to_prometheus(self):
+        """Ensure MetricsRegistry.to_prometheus() returns counters and histograms."""
+        registry = MetricsRegistry(buckets=(0.1, 1))
+        registry.observe("GET", "/api/card/1", 200, 0.5, retries=1)
+
+        text = registry.to_prometheus()
+        labels = 'method="GET",endpoint="/api/card/{id}",status="200"'
+        self.assertIn("# TYPE metabase_client_requests_total counter", text)
+        self.assertIn(f"metabase_client_requests_total{{{labels}}} 1", text)
+        self.assertIn(f"metabase_client_retries_total{{{labels}}} 1", text)
+        self.assertIn(
+            f'metabase_client_request_duration_seconds_bucket{{{labels},le="0.1"}} 0',
+            text,
+        )
+        self.assertIn(
+            f'metabase_client_request_duration_seconds_bucket{{{labels},le="1.0"}} 1',
+            text,
+        )
+        self.assertIn(
+            f'metabase_client_request_duration_seconds_bucket{{{labels},le="+Inf"}} 1',
+            text,
+        )
+
+
+class MetabaseMetricsTests(TestCase):
+    def test_metrics(self):
+        """Ensure Metabase records every request in its metrics registry."""
+        metabase = mock_metabase(
+            make_response(json={"id": 1}),
+            requests.ConnectionError(),
+            metrics=MetricsRegistry(),
+        )
+        metabase.post("/api/card", json={"name": "Card"})
+
+        with self.assertRaises(requests.ConnectionError):
+            metabase.get("/api/card/1")
+
+        summary = {(s["method"], s["status"]): s for s in metabase.metrics.summary()}
+        self.assertEqual(
+            len(metabase.codec.dumps({"name": "Card"})),
+            summary[("POST", "200")]["request_bytes"],
+        )
+        self.assertEqual(len(b'{"id": 1}'), summary[("POST", "200")]["response_bytes"])
+        self.assertEqual(1, summary[("GET", "error")]["errors"])
@@ -1,8 +1,11 @@
+import time
+from unittest import TestCase
 from unittest.mock import patch
 
 from requests import HTTPError
 
 from metabase.exceptions import NotFoundError
+from metabase.identity import IdentityMap
 from metabase.metabase import Metabase
 from metabase.missing import MISSING
 from metabase.resource import (
@@ -38,6 +41,73 @@ class ResourceTests(IntegrationTestCase):
         self.assertEqual("Resource(a=a, b=b, id=1)", resource.__repr__())
 
 
+class FromPayloadTests(TestCase):
+    def test_from_payload(self):
+        """Ensure Resource.from_payload() uses the payload as attributes without copying it."""
+        payload = {"id": 1, "a": "a"}
+        resource = Resource.from_payload(None, payload)
+
+        self.assertEqual(1, resource.id)
+        self.assertEqual("a", resource.a)
+        self.assertIs(payload, resource.__dict__)
+        self.assertListEqual(["id", "a"], resource._attributes)
+
+    def test_from_payload_identity_map(self):
+        """Ensure Resource.from_payload() refreshes and returns instances already loaded."""
+        metabase = Metabase(
+            host="example.com", user="", password="", identity_map=IdentityMap()
+        )
+        resource = Resource.from_payload(metabase, {"id": 1, "a": "a"})
+
+        self.assertIs(
+            resource, Resource.from_payload(metabase, {"id": 1, "a": "b", "c": "c"})
+        )
+        self.assertEqual("b", resource.a)
+        self.assertEqual("c", resource.c)
+        self.assertIsNot(resource, Resource.from_payload(metabase, {"id": 2}))
+        self.assertIsNot(resource, Resource.from_payload(None, {"id": 1}))
+
+
+class PaginateTests(TestCase):
+    def test_paginate(self):
+        """Ensure ListResource._paginate() yields records of all pages, in order."""
+        records = list(range(7))
+        calls = []
+
+        def fetch_page(limit, offset):
+            calls.append((limit, offset))
+            return records[offset : offset + limit], len(records)
+
+        for prefetch in (True, False):
+            calls.clear()
+            self.assertListEqual(
+                records, list(ListResource._paginate(fetch_page, 3, prefetch))
+            )
+            self.assertListEqual([(3, 0), (3, 3), (3, 6)], calls)
+
+    def test_paginate_prefetch(self):
+        """Ensure the next page is fetched while the current page is consumed."""
+        calls = []
+
+        def fetch_page(limit, offset):
+            calls.append(offset)
+            return list(range(offset, offset + limit)), None
+
+        iterator = ListResource._paginate(fetch_page, 2, prefetch=True)
+        self.assertEqual(0, next(iterator))
+        time.sleep(0.05)
+        self.assertListEqual([0, 2], calls)
+        iterator.close()
+
+    def test_paginate_unknown_total(self):
+        """Ensure pagination stops at the first incomplete page if the total is unknown."""
+        pages = {0: [1, 2], 2: [3]}
+        self.assertListEqual(
+            [1, 2, 3],
+            list(ListResource._paginate(lambda l, o: (pages[o], None), 2)),
+        )
+
+
 class ListResourceTests(IntegrationTestCase):
     def test_list(self):
         """Ensure ListResource.list() returns a list of objects from Metabase, if any."""
@@ -70,6 +140,16 @@ class GetResourceTests(IntegrationTestCase):
         with self.assertRaises(NotFoundError):
             user = User.get(1234, using=self.metabase)
 
+    def test_get_many(self):
+        """Ensure GetResource.get_many() returns instances in order, and errors in place of missing ones."""
+
+        class User(GetResource):
+            ENDPOINT = "/api/user"
+
+        users = User.get_many([1, 1234], using=self.metabase)
+        self.assertIsInstance(users[0], User)
+        self.assertIsInstance(users[1], NotFoundError)
+
 
 class CreateResourceTests(IntegrationTestCase):
     def test_create(self):
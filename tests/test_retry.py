@@ -0,0 +1,180 @@
+from unittest import TestCase
+from unittest.mock import patch
+
+import requests
+
+from metabase.exceptions import AuthenticationError, CircuitOpenError
+from metabase.metrics import MetricsRegistry
+from metabase.retry import CircuitBreaker, Retry
+from tests.helpers import make_response, mock_metabase
+
+
+class RetryTests(TestCase):
+    def test_should_retry(self):
+        """Ensure only idempotent methods are retried, on retryable failures."""
+        retry = Retry(total=2)
+        test_matrix = [
+            ("GET", 0, make_response(503), None, True),
+            ("GET", 0, make_response(429), None, True),
+            ("GET", 0, make_response(500), None, False),
+            ("GET", 0, make_response(200), None, False),
+            ("GET", 2, make_response(503), None, False),
+            ("POST", 0, make_response(503), None, False),
+            ("PUT", 0, None, requests.ConnectionError(), True),
+            ("GET", 0, None, ValueError(), False),
+        ]
+
+        for method, attempt, response, error, expected in test_matrix:
+            self.assertEqual(
+                expected, retry.should_retry(method, attempt, response, error)
+            )
+
+    def test_backoff(self):
+        """Ensure Retry.backoff() grows exponentially up to backoff_max."""
+        retry = Retry(backoff_factor=1, backoff_max=5, jitter=False)
+
+        self.assertEqual([1, 2, 4, 5], [retry.backoff(i) for i in range(4)])
+
+        retry = Retry(backoff_factor=1, jitter=True)
+        self.assertTrue(all(0 <= retry.backoff(3) <= 8 for _ in range(100)))
+
+    def test_retry_after(self):
+        """Ensure Retry-After is honoured, in seconds or as a date."""
+        retry = Retry(backoff_max=60)
+
+        self.assertEqual(
+            12, retry.backoff(0, make_response(503, headers={"Retry-After": "12"}))
+        )
+        self.assertEqual(
+            0,
+            retry.backoff(
+                0,
+                make_response(
+                    503, headers={"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"}
+                ),
+            ),
+        )
+
+
+class CircuitBreakerTests(TestCase):
+    def test_open(self):
+        """Ensure the circuit opens after failure_threshold consecutive failures."""
+        breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=30)
+        breaker.record(make_response(503))
+        breaker.before_request()
+        breaker.record(error=requests.ConnectionError())
+
+        with self.assertRaises(CircuitOpenError):
+            breaker.before_request()
+
+    def test_recover(self):
+        """Ensure a single trial request is let through after recovery_timeout."""
+        breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=30)
+        breaker.record(make_response(503))
+
+        with patch("metabase.retry.time.monotonic", return_value=1e12):
+            breaker.before_request()
+            self.assertEqual(CircuitBreaker.HALF_OPEN, breaker.state)
+
+            with self.assertRaises(CircuitOpenError):
+                breaker.before_request()
+
+        breaker.record(make_response(200))
+        self.assertEqual(CircuitBreaker.CLOSED, breaker.state)
+        breaker.before_request()
+
+    def test_abort(self):
+        """Ensure an aborted trial request opens the circuit again."""
+        breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=30)
+        breaker.record(make_response(503))
+
+        with patch("metabase.retry.time.monotonic", return_value=1e12):
+            breaker.before_request()
+            breaker.abort()
+            self.assertEqual(CircuitBreaker.OPEN, breaker.state)
+
+        with patch("metabase.retry.time.monotonic", return_value=2e12):
+            breaker.before_request()
+            self.assertEqual(CircuitBreaker.HALF_OPEN, breaker.state)
+
+
+class MetabaseRetryTests(TestCase):
+    @patch("metabase.metabase.time.sleep")
+    def test_retry(self, sleep):
+        """Ensure Metabase retries failed requests according to its retry policy."""
+        metabase = mock_metabase(
+            make_response(503, headers={"Retry-After": "2"}),
+            requests.ConnectionError(),
+            make_response(json={"id": 1}),
+            retry=Retry(total=3),
+            metrics=MetricsRegistry(),
+        )
+        response = metabase.get("/api/card/1")
+
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(3, len(metabase.adapter.requests))
+        self.assertEqual(2, sleep.call_args_list[0][0][0])
+        self.assertEqual(2, metabase.metrics.summary()[0]["retries"])
+
+    @patch("metabase.metabase.time.sleep")
+    def test_retry_exhausted(self, sleep):
+        """Ensure the last error is raised once retries are exhausted."""
+        metabase = mock_metabase(
+            requests.ConnectionError(),
+            requests.ConnectionError(),
+            retry=Retry(total=1),
+        )
+
+        with self.assertRaises(requests.ConnectionError):
+            metabase.get("/api/card/1")
+
+    @patch("metabase.metabase.time.sleep")
+    def test_retry_closes_streamed_responses(self, sleep):
+        """Ensure streamed responses are closed before they are retried."""
+        failed = make_response(503, stream=True)
+        metabase = mock_metabase(
+            failed, make_response(json={}, stream=True), retry=Retry(total=1)
+        )
+        metabase.get("/api/card/1", stream=True)
+
+        self.assertTrue(failed.raw.closed)
+
+    def test_circuit_breaker_login_error(self):
+        """Ensure a trial request failing to log in does not leave the circuit half-open."""
+        metabase = mock_metabase(
+            make_response(503),
+            make_response(503),
+            make_response(json={"id": "token"}),
+            make_response(json={"id": 1}),
+            token=None,
+            circuit_breaker=CircuitBreaker(failure_threshold=1, recovery_timeout=30),
+        )
+        metabase.circuit_breaker.record(make_response(503))
+
+        with patch("metabase.retry.time.monotonic", return_value=1e12):
+            with self.assertRaises(AuthenticationError):
+                metabase.get("/api/card/1")
+            with self.assertRaises(CircuitOpenError):
+                metabase.get("/api/card/1")
+
+        with patch("metabase.retry.time.monotonic", return_value=2e12):
+            with self.assertRaises(AuthenticationError):
+                metabase.get("/api/card/1")
+
+        with patch("metabase.retry.time.monotonic", return_value=3e12):
+            self.assertEqual({"id": 1}, metabase.get("/api/card/1").json())
+
+        self.assertEqual(CircuitBreaker.CLOSED, metabase.circuit_breaker.state)
+
+    def test_circuit_breaker(self):
+        """Ensure Metabase fails fast while the circuit is open."""
+        metabase = mock_metabase(
+            make_response(503),
+            circuit_breaker=CircuitBreaker(failure_threshold=1),
+        )
+        metabase.get("/api/card/1")
+
+        with self.assertRaises(CircuitOpenError):
+            metabase.get("/api/card/1")
+
+        self.assertEqual(1, len(metabase.adapter.requests))
@@ -0,0 +1,131 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest import TestCase
+
+from metabase.singleflight import SingleFlight
+from tests.helpers import make_response, mock_metabase
+
+
+class SingleFlightTests(TestCase):
+    def test_do(self):
+        """Ensure concurrent calls with the same key run the function once."""
+        single_flight = SingleFlight()
+        calls = []
+        started = threading.Event()
+
+        def func():
+            calls.append(1)
+            started.set()
+            time.sleep(0.05)
+            return [1]
+
+        with ThreadPoolExecutor(4) as executor:
+            leader = executor.submit(single_flight.do, "key", func)
+            started.wait()
+            followers = [
+                executor.submit(single_flight.do, "key", func) for _ in range(3)
+            ]
+
+        self.assertEqual(1, len(calls))
+        self.assertTrue(all(f.result() == [1] for f in followers + [leader]))
+
+        # the key is released once the call is done
+        single_flight.do("key", func)
+        self.assertEqual(2, len(calls))
+
+    def test_do_error(self):
+        """Ensure waiters receive the exception raised by the call."""
+        single_flight = SingleFlight()
+        started = threading.Event()
+
+        def func():
+            started.set()
+            time.sleep(0.05)
+            raise ValueError()
+
+        with ThreadPoolExecutor(2) as executor:
+            leader = executor.submit(single_flight.do, "key", func)
+            started.wait()
+            follower = executor.submit(single_flight.do, "key", func)
+
+        self.assertIsInstance(leader.exception(), ValueError)
+        self.assertIsInstance(follower.exception(), ValueError)
+
+    def test_forget(self):
+        """Ensure calls arriving after forget() do not join the calls in flight."""
+        single_flight = SingleFlight()
+        started = threading.Event()
+        release = threading.Event()
+
+        def func():
+            started.set()
+            release.wait()
+            return "old"
+
+        with ThreadPoolExecutor(1) as executor:
+            leader = executor.submit(single_flight.do, ("a", 1), func)
+            started.wait()
+
+            try:
+                single_flight.forget(lambda key: key[0] == "a")
+                self.assertEqual("new", single_flight.do(("a", 1), lambda: "new"))
+            finally:
+                release.set()
+
+        self.assertEqual("old", leader.result())
+
+
+class MetabaseCoalesceTests(TestCase):
+    def handler(self, request):
+        time.sleep(0.05)
+        return make_response(json={"id": 1})
+
+    def test_coalesce(self):
+        """Ensure identical GET requests in flight at the same time are sent once."""
+        metabase = mock_metabase(handler=self.handler)
+
+        with ThreadPoolExecutor(4) as executor:
+            responses = list(
+                executor.map(lambda _: metabase.get("/api/table/1"), range(4))
+            )
+
+        self.assertEqual(1, len(metabase.adapter.requests))
+        self.assertTrue(all(r.json() == {"id": 1} for r in responses))
+
+    def test_write(self):
+        """Ensure GET requests sent after a write do not join those sent before."""
+        started = threading.Event()
+        release = threading.Event()
+        names = iter(["old", "new"])
+
+        def handler(request):
+            if request.method != "GET":
+                return make_response(json={})
+
+            name = next(names)
+            if name == "old":
+                started.set()
+                release.wait()
+            return make_response(json={"name": name})
+
+        metabase = mock_metabase(handler=handler)
+
+        with ThreadPoolExecutor(1) as executor:
+            before = executor.submit(metabase.get, "/api/card/1")
+            started.wait()
+            threading.Timer(0.1, release.set).start()
+
+            metabase.put("/api/card/1", json={"name": "new"})
+            self.assertEqual({"name": "new"}, metabase.get("/api/card/1").json())
+
+        self.assertEqual({"name": "old"}, before.result().json())
+
+    def test_coalesce_disabled(self):
+        """Ensure requests are not coalesced if coalesce is False."""
+        metabase = mock_metabase(handler=self.handler, coalesce=False)
+
+        with ThreadPoolExecutor(4) as executor:
+            list(executor.map(lambda _: metabase.get("/api/table/1"), range(4)))
+
+        self.assertEqual(4, len(metabase.adapter.requests))
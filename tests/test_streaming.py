@@ -0,0 +1,201 @@
+import io
+import json
+import os
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+from urllib.parse import parse_qs
+
+from requests import HTTPError
+
+from metabase.exceptions import QueryError
+from metabase.resources.card import Card
+from metabase.resources.database import Database
+from metabase.resources.dataset import Dataset
+from metabase.streaming import (
+    copy_response,
+    iter_csv_frames,
+    iter_json_array,
+    iter_response,
+)
+from tests.helpers import make_response, mock_metabase
+
+
+def chunked(payload, size):
+    content = json.dumps(payload).encode()
+    return [content[i : i + size] for i in range(0, len(content), size)]
+
+
+class StreamingTests(TestCase):
+    def test_iter_json_array(self):
+        """Ensure a top-level array is decoded regardless of chunk boundaries."""
+        payload = [{"id": i, "name": "é" * i, "value": 12345.678} for i in range(20)]
+
+        for size in (1, 2, 3, 7, 64, 4096):
+            self.assertListEqual(payload, list(iter_json_array(chunked(payload, size))))
+
+    def test_iter_json_array_path(self):
+        """Ensure the array at a key path is decoded, skipping preceding values."""
+        payload = {
+            "status": "completed",
+            "json_query": {"query": {"source-table": 1}},
+            "data": {"cols": [{"name": "ID"}], "rows": [[1, None], [2, True]]},
+        }
+
+        for size in (1, 5, 4096):
+            self.assertListEqual(
+                [[1, None], [2, True]],
+                list(iter_json_array(chunked(payload, size), path=("data", "rows"))),
+            )
+
+        self.assertListEqual([], list(iter_json_array([b'{"data": [ ]}'], ("data",))))
+
+    def test_iter_json_array_lazy(self):
+        """Ensure items are yielded before the rest of the stream is read."""
+        read = []
+
+        def chunks():
+            for chunk in (b'[{"id": 1}, ', b'{"id": 2}', b"]"):
+                read.append(chunk)
+                yield chunk
+
+        iterator = iter_json_array(chunks())
+        self.assertEqual({"id": 1}, next(iterator))
+        self.assertEqual(1, len(read))
+
+    def test_iter_json_array_missing(self):
+        """Ensure a missing path raises ValueError with the error from Metabase."""
+        with self.assertRaisesRegex(ValueError, "data.rows not found.*Bad query"):
+            list(
+                iter_json_array(
+                    [b'{"error": "Bad query", "data": {"cols": []}}'],
+                    path=("data", "rows"),
+                )
+            )
+
+    def test_iter_json_array_truncated(self):
+        """Ensure a truncated stream raises JSONDecodeError."""
+        with self.assertRaises(json.JSONDecodeError):
+            list(iter_json_array([b'[{"id": 1}, {"id": 2'], path=()))
+
+    def test_iter_response(self):
+        """Ensure iter_response raises HTTPError on error responses and closes them."""
+        response = make_response(json=[1, 2, 3])
+        self.assertListEqual([1, 2, 3], list(iter_response(response)))
+
+        with self.assertRaises(HTTPError):
+            list(iter_response(make_response(403, content=b"Forbidden")))
+
+    def test_iter_fields(self):
+        """Ensure Database.iter_fields() streams the Fields of the Database."""
+        metabase = mock_metabase(make_response(json=[{"id": 1}, {"id": 2}]))
+        database = Database(_using=metabase, id=1)
+
+        fields = list(database.iter_fields())
+
+        self.assertListEqual([1, 2], [field.id for field in fields])
+        self.assertTrue(metabase.adapter.requests[0].url.endswith("/database/1/fields"))
+
+    def test_iter_rows(self):
+        """Ensure Dataset.iter_rows() yields batches of rows."""
+        metabase = mock_metabase(
+            make_response(202, json={"data": {"rows": [[i] for i in range(5)]}})
+        )
+
+        batches = list(
+            Dataset.iter_rows(
+                using=metabase,
+                database=1,
+                type="query",
+                query={"source-table": 1},
+                batch_size=2,
+            )
+        )
+
+        self.assertListEqual([[[0], [1]], [[2], [3]], [[4]]], batches)
+
+    def test_iter_rows_failed(self):
+        """Ensure Dataset.iter_rows() raises QueryError when the query failed."""
+        data = {"rows": [], "cols": []}
+        payloads = [
+            {"status": "failed", "error": "Query timed out", "data": data},
+            {"data": data, "status": "failed", "error": "Query timed out"},
+        ]
+
+        for payload in payloads:
+            metabase = mock_metabase(make_response(202, json=payload))
+
+            with self.assertRaisesRegex(QueryError, "Query timed out"):
+                list(
+                    Dataset.iter_rows(
+                        using=metabase,
+                        database=1,
+                        type="query",
+                        query={"source-table": 1},
+                    )
+                )
+
+    def test_copy_response(self):
+        """Ensure copy_response() writes the body to a file-like object or a path."""
+        content = b"a,b\n" + b"1,2\n" * 1000
+
+        buffer = io.BytesIO()
+        written = copy_response(make_response(content=content, stream=True), buffer)
+        self.assertEqual(len(content), written)
+        self.assertEqual(content, buffer.getvalue())
+
+        with TemporaryDirectory() as directory:
+            path = os.path.join(directory, "export.csv")
+            copy_response(make_response(content=content, stream=True), path)
+            with open(path, "rb") as f:
+                self.assertEqual(content, f.read())
+
+        with self.assertRaises(HTTPError):
+            copy_response(make_response(400, content=b"Bad query"), io.BytesIO())
+
+    def test_iter_csv_frames(self):
+        """Ensure iter_csv_frames() yields DataFrames of up to batch_size rows."""
+        content = b"ID,Name\n" + b"".join(b"%d,n%d\n" % (i, i) for i in range(5))
+        response = make_response(content=content, stream=True)
+
+        frames = list(iter_csv_frames(response, batch_size=2))
+
+        self.assertListEqual([2, 2, 1], [len(frame) for frame in frames])
+        self.assertListEqual(["ID", "Name"], frames[0].columns.tolist())
+        self.assertListEqual([4], frames[2]["ID"].tolist())
+
+    def test_export(self):
+        """Ensure Dataset.export() posts the query as a form parameter."""
+        metabase = mock_metabase(make_response(content=b"ID\n1\n", stream=True))
+        buffer = io.BytesIO()
+
+        Dataset.export(
+            using=metabase,
+            database=1,
+            type="query",
+            query={"source-table": 1},
+            where=buffer,
+        )
+
+        request = metabase.adapter.requests[0]
+        self.assertEqual("http://example.com/api/dataset/csv", request.url)
+        self.assertEqual(
+            {"database": 1, "type": "query", "query": {"source-table": 1}},
+            json.loads(parse_qs(request.body)["query"][0]),
+        )
+        self.assertEqual(b"ID\n1\n", buffer.getvalue())
+
+        with self.assertRaises(ValueError):
+            Dataset.export(metabase, 1, "query", {}, buffer, format="pdf")
+
+    def test_card_export_batches(self):
+        """Ensure Card.export_batches() yields DataFrames from the CSV export."""
+        metabase = mock_metabase(make_response(content=b"ID\n1\n2\n3\n", stream=True))
+        card = Card(_using=metabase, id=1)
+
+        frames = list(card.export_batches(batch_size=2))
+
+        self.assertEqual(
+            "http://example.com/api/card/1/query/csv",
+            metabase.adapter.requests[0].url,
+        )
+        self.assertListEqual([[1, 2], [3]], [frame["ID"].tolist() for frame in frames])
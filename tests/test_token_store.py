@@ -0,0 +1,48 @@
+import os
+import tempfile
+from unittest import TestCase
+
+from metabase.token_store import FileTokenStore, MemoryTokenStore
+
+
+class MemoryTokenStoreTests(TestCase):
+    def test_get_set_delete(self):
+        """Ensure MemoryTokenStore stores tokens by key."""
+        store = MemoryTokenStore()
+        self.assertIsNone(store.get("key"))
+
+        store.set("key", "123")
+        self.assertEqual("123", store.get("key"))
+
+        store.delete("key")
+        self.assertIsNone(store.get("key"))
+
+
+class FileTokenStoreTests(TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "metabase", "tokens.json")
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def test_get_set_delete(self):
+        """Ensure FileTokenStore persists tokens across instances."""
+        FileTokenStore(self.path).set("key", "123")
+        self.assertEqual("123", FileTokenStore(self.path).get("key"))
+
+        FileTokenStore(self.path).delete("key")
+        self.assertIsNone(FileTokenStore(self.path).get("key"))
+
+    def test_permissions(self):
+        """Ensure the token file is only readable by the current user."""
+        FileTokenStore(self.path).set("key", "123")
+        self.assertEqual(0o600, os.stat(self.path).st_mode & 0o777)
+
+    def test_corrupted_file(self):
+        """Ensure FileTokenStore ignores unreadable files."""
+        os.makedirs(os.path.dirname(self.path))
+        with open(self.path, "w") as f:
+            f.write("{")
+
+        self.assertIsNone(FileTokenStore(self.path).get("key"))